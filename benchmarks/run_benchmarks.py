@@ -0,0 +1,174 @@
+"""
+Time and memory-profile every MIS type and its Excel download on synthetic exports.
+
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --mis "Open Ticket MIS" "Jagan's MIS"
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/benchmark_20250101_120000.csv
+
+Each run writes one CSV to the output directory (rows, benchmark, seconds, peak MB),
+so runs from different revisions can be compared with --baseline.
+"""
+import argparse
+import datetime
+import gc
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import mis_bot
+from synthetic_export import generate_ticket_export
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+# Engines of the Excel downloads; the Request Ticket Closed MIS downloads as CSV instead
+EXCEL_ENGINES = ['xlsxwriter', 'openpyxl']
+CSV_MIS_TYPES = ["Request Ticket Closed MIS"]
+RESULT_COLUMNS = ['run_at', 'revision', 'rows', 'benchmark', 'seconds', 'peak_mb']
+# The SLA Trend MIS only reads the snapshot store, so there is nothing to benchmark on an export
+BENCHMARK_MIS_TYPES = [mis_type for mis_type in mis_bot.MIS_TYPES if mis_type != "SLA Trend MIS"]
+
+def process_function(mis_type):
+    """The process_* function generating a MIS type"""
+    return {
+        "Client MIS": mis_bot.process_client_mis,
+        "Open Ticket MIS": mis_bot.process_open_ticket_mis,
+        "Request Ticket Open MIS": mis_bot.process_request_ticket_open_mis,
+        "Request Ticket Closed MIS": mis_bot.process_request_ticket_closed_mis,
+        "Bug Ticket Closed MIS": mis_bot.process_bug_ticket_closed_mis,
+        "Jagan's MIS": mis_bot.process_jagan_mis,
+        "Recurring Issues MIS": mis_bot.process_recurring_issues_mis
+    }[mis_type]
+
+def git_revision():
+    """Short hash of the checked out revision, or '' outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+def measure(func, make_args, repeat=1, memory=True):
+    """
+    Best wall time of func(*make_args()) over repeat calls, and the peak traced memory of one more call.
+    Arguments are made fresh for every call, outside the timing.
+    Returns (seconds, peak MB or None, result of the last timed call).
+    """
+    best = None
+    for _ in range(repeat):
+        args = make_args()
+        gc.collect()
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak_mb = None
+    if memory:
+        args = make_args()
+        gc.collect()
+        # Traced separately, since tracing slows the call down; worker processes are not traced
+        tracemalloc.start()
+        try:
+            func(*args)
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+
+    return best, peak_mb, result
+
+def run_size(rows, mis_types, engines, repeat=1, memory=True, seed=0, duplicate_rate=0.6):
+    """Benchmark results for one export size, as a list of {benchmark, seconds, peak_mb}"""
+    results = []
+
+    def record(benchmark, seconds, peak_mb):
+        results.append({'rows': rows, 'benchmark': benchmark, 'seconds': seconds, 'peak_mb': peak_mb})
+        peak = f"{peak_mb:9.1f} MB" if peak_mb is not None else ''
+        print(f"{rows:>9} {benchmark:<56} {seconds:9.3f} s {peak}", flush=True)
+
+    # Uploads are compacted on load, so reports are benchmarked on the compacted frame
+    df = mis_bot.compact_dtypes(generate_ticket_export(rows, seed=seed, duplicate_rate=duplicate_rate))
+
+    for mis_type in mis_types:
+        func = process_function(mis_type)
+        seconds, peak_mb, report = measure(func, lambda: (df.copy(),), repeat, memory)
+        record(func.__name__, seconds, peak_mb)
+
+        for engine in (['csv'] if mis_type in CSV_MIS_TYPES else engines):
+            mis_bot.XLSX_ENGINE = None if engine == 'csv' else engine
+            try:
+                seconds, peak_mb, _ = measure(mis_bot.build_mis_download, lambda: (report, mis_type), repeat, memory)
+            finally:
+                mis_bot.XLSX_ENGINE = None
+            record(f"build_mis_download[{mis_type}, {engine}]", seconds, peak_mb)
+        del report
+
+    if len(mis_types) > 1:
+        seconds, peak_mb, _ = measure(mis_bot.process_all_mis, lambda: (df.copy(), mis_types), repeat, memory)
+        record('process_all_mis', seconds, peak_mb)
+
+    return results
+
+def compare_with_baseline(results, baseline_path):
+    """Print each benchmark's time and peak memory against a previous results file"""
+    baseline = pd.read_csv(baseline_path).set_index(['rows', 'benchmark'])
+    print(f"\nCompared with {baseline_path}:")
+    for row in results.itertuples():
+        key = (row.rows, row.benchmark)
+        if key not in baseline.index:
+            continue
+        before = baseline.loc[key]
+        speedup = before['seconds'] / row.seconds if row.seconds > 0 else float('inf')
+        line = f"{row.rows:>9} {row.benchmark:<56} {before['seconds']:9.3f} s -> {row.seconds:9.3f} s ({speedup:.2f}x)"
+        if pd.notna(before['peak_mb']) and pd.notna(row.peak_mb):
+            line += f"  {before['peak_mb']:.1f} MB -> {row.peak_mb:.1f} MB"
+        print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the MIS reports on synthetic ticket exports")
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                        help="Export sizes in rows (default: " + ' '.join(map(str, DEFAULT_SIZES)) + ")")
+    parser.add_argument('--mis', nargs='+', choices=BENCHMARK_MIS_TYPES, default=BENCHMARK_MIS_TYPES, metavar='MIS_TYPE',
+                        help="MIS types to benchmark (default: all). Choices: " + ', '.join(BENCHMARK_MIS_TYPES))
+    parser.add_argument('--engines', nargs='+', choices=EXCEL_ENGINES, default=None,
+                        help="Excel engines to benchmark the downloads with (default: all installed)")
+    parser.add_argument('--repeat', type=int, default=1, help="Timed calls per benchmark, the best one counts (default: 1)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the traced call measuring peak memory")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed of the synthetic exports (default: 0)")
+    parser.add_argument('--duplicate-rate', type=float, default=0.6,
+                        help="Share of subjects repeating a fixed text (default: 0.6)")
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'results'),
+                        help="Directory to write the results CSV to (default: benchmarks/results)")
+    parser.add_argument('--baseline', metavar='CSV', help="Earlier results file to compare with")
+    args = parser.parse_args(argv)
+
+    engines = args.engines or [engine for engine in EXCEL_ENGINES if engine != 'xlsxwriter' or mis_bot.xlsxwriter is not None]
+    run_at = datetime.datetime.now()
+
+    results = []
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for rows in args.sizes:
+            results.extend(run_size(rows, args.mis, engines, args.repeat, not args.no_memory, args.seed, args.duplicate_rate))
+
+    results = pd.DataFrame(results)
+    results.insert(0, 'revision', git_revision())
+    results.insert(0, 'run_at', run_at.isoformat(timespec='seconds'))
+    results = results[RESULT_COLUMNS]
+
+    os.makedirs(args.output, exist_ok=True)
+    output_path = os.path.join(args.output, f"benchmark_{run_at.strftime('%Y%m%d_%H%M%S')}.csv")
+    results.to_csv(output_path, index=False)
+    print(f"\n✅ Results: {output_path}")
+
+    if args.baseline:
+        compare_with_baseline(results, args.baseline)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Synthetic Desk-style ticket exports for benchmarking the MIS reports.
+
+    python benchmarks/synthetic_export.py --rows 10000 --output export_10k.xlsx
+
+Exports carry every column the MIS types read, with realistic value shapes
+(datetime cells, blank Gitlab due dates, booleans, reopen counts) and tunable
+row counts, cardinalities and subject duplication.
+"""
+import argparse
+import datetime
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Status (Ticket) values and how often they occur
+STATUS_WEIGHTS = {
+    'Assigned to Engineer!': 0.12,
+    'Reopened': 0.03,
+    'Waiting Information From user - 1': 0.05,
+    'Waiting Information From user - 2': 0.03,
+    'Waiting Information From user - 3': 0.02,
+    'Closed': 0.6,
+    'Closed due to lack of information': 0.1,
+    'Closed - Marked as request': 0.05
+}
+CLOSED_STATUSES = ['Closed', 'Closed due to lack of information', 'Closed - Marked as request']
+
+CLASSIFICATION_WEIGHTS = {'Bug': 0.35, 'Query': 0.25, 'Request Open': 0.15, 'Request Closed': 0.15, 'Request': 0.1}
+TICKET_GROUP_WEIGHTS = {'Client Support': 0.6, 'Client Escalations': 0.1, 'Internal Support': 0.3}
+PRIORITY_WEIGHTS = {'Low': 0.3, 'Medium': 0.45, 'High': 0.2, 'Urgent': 0.05}
+# Days to resolve by priority, for the Due Date column
+PRIORITY_SLA_DAYS = {'Low': 7, 'Medium': 5, 'High': 2, 'Urgent': 1}
+
+SUB_CATEGORIES = ['Login', 'Payments', 'Reports', 'Data Correction', 'Access', 'Integration', 'Performance', 'Notifications']
+MODULES = ['billing', 'inventory', 'payroll', 'crm', 'reports', 'auth', 'notifications', 'analytics']
+
+# Ticket subjects; placeholders get fixed values for duplicated subjects and random ones otherwise
+SUBJECT_TEMPLATES = [
+    'Login error for user {user}',
+    'Unable to access dashboard of {program}',
+    'Payment failed ref {reference}',
+    'Report not generating for {month}',
+    'API timeout when syncing {module} data',
+    'Password reset not working for {email}',
+    'Invoice amount ₹ {amount} is wrong',
+    'Database connection refused on server {server}',
+    'Cannot upload file of size {size} MB',
+    'Missing records in {module} export',
+    'Access denied to module {module}',
+    'Version {version} crash on startup',
+    'Request for new user creation in {program}',
+    'Need data correction for ticket {ticket}',
+    'Network issue at branch {branch}',
+    'Sync failed between {module} and {other_module}'
+]
+FIXED_SUBJECT_VALUES = {
+    'user': 'admin', 'program': 'Program 1', 'reference': 'TXN12345678', 'month': 'March',
+    'module': 'billing', 'other_module': 'crm', 'email': 'user@example.com', 'amount': '1500.00',
+    'server': 'db01', 'size': '25', 'version': '2.1', 'ticket': 'AB-1001', 'branch': 'Pune'
+}
+
+def weighted_choice(rng, weights, size):
+    """Draw size values from a {value: weight} mapping"""
+    values = list(weights)
+    probabilities = np.array(list(weights.values()), dtype=float)
+    return rng.choice(np.array(values, dtype=object), size=size, p=probabilities / probabilities.sum())
+
+def random_subject_values(rng, programs):
+    """Random placeholder values for one subject"""
+    return {
+        'user': f'user{rng.integers(1, 100000)}',
+        'program': f'Program {rng.integers(1, programs + 1)}',
+        'reference': f'TXN{rng.integers(10**7, 10**9)}',
+        'month': datetime.date(2024, int(rng.integers(1, 13)), 1).strftime('%B'),
+        'module': MODULES[rng.integers(len(MODULES))],
+        'other_module': MODULES[rng.integers(len(MODULES))],
+        'email': f'user{rng.integers(1, 100000)}@example.com',
+        'amount': f'{rng.integers(100, 100000)}.{rng.integers(0, 100):02d}',
+        'server': f'db{rng.integers(1, 50):02d}',
+        'size': str(rng.integers(1, 500)),
+        'version': f'{rng.integers(1, 5)}.{rng.integers(0, 10)}',
+        'ticket': f'AB-{rng.integers(1000, 99999)}',
+        'branch': f'Branch {rng.integers(1, 200)}'
+    }
+
+def generate_subjects(rng, rows, duplicate_rate, programs):
+    """Ticket subjects where about duplicate_rate of them repeat a fixed rendering of their template"""
+    templates = rng.integers(len(SUBJECT_TEMPLATES), size=rows)
+    duplicated = rng.random(rows) < duplicate_rate
+    fixed = [template.format(**FIXED_SUBJECT_VALUES) for template in SUBJECT_TEMPLATES]
+    return [
+        fixed[template] if duplicate else SUBJECT_TEMPLATES[template].format(**random_subject_values(rng, programs))
+        for template, duplicate in zip(templates, duplicated)
+    ]
+
+def generate_ticket_export(rows, seed=0, programs=25, engineers=40, solutions_engineers=8, module_leads=6,
+                           departments=5, duplicate_rate=0.6, days=365, today=None):
+    """
+    A synthetic ticket export of the given size as a DataFrame.
+    Tickets are created over the last `days` days; the same seed gives the same export.
+    """
+    rng = np.random.default_rng(seed)
+    today = today or datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    status = weighted_choice(rng, STATUS_WEIGHTS, rows)
+    closed = np.isin(status, CLOSED_STATUSES)
+    classification = weighted_choice(rng, CLASSIFICATION_WEIGHTS, rows)
+    priority = weighted_choice(rng, PRIORITY_WEIGHTS, rows)
+    program_number = rng.integers(1, programs + 1, size=rows)
+    engineer_number = rng.integers(1, engineers + 1, size=rows)
+
+    created = pd.Timestamp(today) - pd.to_timedelta(rng.integers(0, days * 24 * 60, size=rows), unit='min')
+    due = created.normalize() + pd.to_timedelta(pd.Series(priority).map(PRIORITY_SLA_DAYS).to_numpy(), unit='D')
+    closed_time = pd.Series(created + pd.to_timedelta(rng.integers(30, 30 * 24 * 60, size=rows), unit='min')).where(closed)
+
+    # Bugs and requests often carry a Gitlab issue with its own due date
+    has_gitlab = np.isin(classification, ['Bug', 'Request Open', 'Request Closed']) & (rng.random(rows) < 0.6)
+    gitlab_due = pd.Series(created.normalize() + pd.to_timedelta(rng.integers(-5, 30, size=rows), unit='D')).where(has_gitlab)
+    gitlab_link = pd.Series([f'https://gitlab.example.com/desk/issues/{number}' for number in range(1, rows + 1)]).where(has_gitlab)
+
+    is_overdue = np.where(closed, rng.random(rows) < 0.2, due < pd.Timestamp(today))
+    program = pd.Series(program_number).map(lambda number: f'Program {number}')
+    contact_number = rng.integers(1, max(rows // 20, 2), size=rows)
+    sub_category = rng.choice(np.array(SUB_CATEGORIES, dtype=object), size=rows)
+
+    return pd.DataFrame({
+        'Ticket Id': np.arange(100000, 100000 + rows),
+        'Status (Ticket)': status,
+        'Ticket Owner': pd.Series(engineer_number).map(lambda number: f'Engineer {number}'),
+        'Created Time (Ticket)': created,
+        'Created Tim': created,
+        'Due Date': due,
+        'Ticket Closed Time': closed_time,
+        'Email (Contact)': [f'contact{number}@client.example.com' for number in contact_number],
+        'Contact name': [f'Contact {number}' for number in contact_number],
+        'Account Name': program.map(lambda name: f'{name} Account'),
+        'Category Type': rng.choice(np.array(['Incident', 'Service Request'], dtype=object), size=rows),
+        'Priority (Ticket)': priority,
+        'Severity Classification': rng.choice(np.array(['S1', 'S2', 'S3', 'S4'], dtype=object), size=rows),
+        'Channel': rng.choice(np.array(['Email', 'Web', 'Phone'], dtype=object), size=rows),
+        'Total Time Spent': rng.integers(5, 600, size=rows),
+        'Crossed Due Date': np.where(is_overdue, 'Yes', 'No'),
+        'L1-Due Date': created + pd.Timedelta(days=1),
+        'Request Sub Category': pd.Series(sub_category).where(np.char.startswith(classification.astype(str), 'Request')),
+        'Ticket Sub Category': sub_category,
+        'Category Of Issue': sub_category,
+        'Gitlab Due date': gitlab_due,
+        'Gitlab Link': gitlab_link,
+        'Number of Reopen': rng.poisson(0.3, size=rows),
+        'Is Overdue': is_overdue,
+        'Support Plan Category': rng.choice(np.array(['Gold', 'Silver', 'Bronze'], dtype=object), size=rows),
+        'Classifications': classification,
+        'Ticket Group': weighted_choice(rng, TICKET_GROUP_WEIGHTS, rows),
+        'Solutions Engineer': pd.Series(rng.integers(1, solutions_engineers + 1, size=rows)).map(lambda number: f'Solutions Engineer {number}'),
+        'Select Engineer': pd.Series(engineer_number).map(lambda number: f'Engineer {number}'),
+        'Module Lead': pd.Series(rng.integers(1, module_leads + 1, size=rows)).map(lambda number: f'Module Lead {number}'),
+        'Program Name': program,
+        'Department Name': pd.Series(rng.integers(1, departments + 1, size=rows)).map(lambda number: f'Department {number}'),
+        'Product OR PS Ticket': rng.choice(np.array(['Product', 'PS'], dtype=object), size=rows),
+        'Subject': generate_subjects(rng, rows, duplicate_rate, programs)
+    })
+
+def write_export(df, path):
+    """Write an export as .xlsx or .csv, by file extension"""
+    if path.lower().endswith('.xlsx'):
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic Desk-style ticket export")
+    parser.add_argument('--rows', type=int, default=10000, help="Number of tickets (default: 10000)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument('--programs', type=int, default=25, help="Distinct Program Name values (default: 25)")
+    parser.add_argument('--engineers', type=int, default=40, help="Distinct Select Engineer values (default: 40)")
+    parser.add_argument('--duplicate-rate', type=float, default=0.6,
+                        help="Share of subjects repeating a fixed text (default: 0.6)")
+    parser.add_argument('--days', type=int, default=365, help="Tickets are created over this many past days (default: 365)")
+    parser.add_argument('--output', required=True, help="Export file to write (.xlsx or .csv)")
+    args = parser.parse_args(argv)
+
+    df = generate_ticket_export(args.rows, seed=args.seed, programs=args.programs, engineers=args.engineers,
+                                duplicate_rate=args.duplicate_rate, days=args.days)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    write_export(df, args.output)
+    print(f"✅ {len(df)} tickets: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,208 +1,1210 @@
-import streamlit as st
+import argparse
 import pandas as pd
+import numpy as np
 import io
+import os
+import sys
 import datetime
+import functools
+import hashlib
+import heapq
+import logging
+import math
+import pickle
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import zipfile
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import closing, contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from difflib import SequenceMatcher
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC, WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from pandas.io.parsers import TextParser
+
+try:
+    import xlsxwriter
+except ImportError:
+    # Optional faster Excel writer; downloads fall back to openpyxl's write-only mode
+    xlsxwriter = None
+
+try:
+    import pyarrow
+    import pyarrow.dataset as pyarrow_dataset
+    import pyarrow.parquet as pyarrow_parquet
+except ImportError:
+    # Optional; without it Parquet uploads aren't accepted and uploads aren't kept in the ticket store
+    pyarrow = None
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; stages are measured without peak memory there
+    resource = None
+
+MIS_TYPES = [
+    "Client MIS",
+    "Open Ticket MIS",
+    "Request Ticket Open MIS",
+    "Request Ticket Closed MIS",
+    "Bug Ticket Closed MIS",
+    "Jagan's MIS",
+    "Recurring Issues MIS",
+    "SLA Trend MIS"
+]
+
+# Raw data columns of the Client MIS ticket sheets
+CLIENT_RAW_DATA_COLUMNS = [
+    'Ticket Id', 'Status (Ticket)', 'Created Time (Ticket)', 'Due Date',
+    'Email (Contact)', 'Priority (Ticket)', 'Program Name', 'Crossed Due Date',
+    'Request Sub Category', 'Contact name'
+]
+
+# Raw data columns of the Request Ticket Open MIS, in output order
+REQUEST_OPEN_COLUMNS = [
+    'Ticket Id', 'Status (Ticket)', 'Ticket Owner', 'Created Tim',
+    'Due Date', 'Ticket Closed Time', 'Email (Contact)', 'Category Type',
+    'Priority (Ticket)', 'Severity Classification', 'Channel',
+    'Total Time Spent', 'Crossed Due Date', 'L1-Due Date',
+    'Request Sub Category', 'Contact name', 'Category Of Issue',
+    'Gitlab Due date', 'Gitlab Link', 'Number of Reopen',
+    'Is Overdue', 'Support Plan Category', 'Classifications', 'Ticket Group',
+    'Solutions Engineer', 'Select Engineer', 'Module Lead', 'Program Name',
+    'Department Name', 'Product OR PS Ticket', 'Subject',
+    'Todays Date', 'No of crossed days'
+]
+
+# Columns searched (in order) by the Recurring Issues MIS
+RESOLUTION_COLUMNS = ['Resolution', 'Solution', 'Fix', 'Root Cause', 'Closure Comments', 'Subject']
+SUBCATEGORY_COLUMNS = ['Ticket Sub Category', 'Request Sub Category', 'Category Of Issue', 'Category Type', 'Subject']
+CREATED_TIME_COLUMNS = ['Created Time (Ticket)', 'Created Tim']
+
+# Ticket statuses counted as open, and the waiting ones among them
+OPEN_STATUSES = [
+    'Assigned to Engineer!',
+    'Reopened',
+    'Waiting Information From user - 1',
+    'Waiting Information From user - 2',
+    'Waiting Information From user - 3'
+]
+WAITING_STATUSES = [
+    'Waiting Information From user - 1',
+    'Waiting Information From user - 2',
+    'Waiting Information From user - 3'
+]
+
+# Low-cardinality ticket columns stored as categoricals by compact_dtypes
+DIMENSION_COLUMNS = [
+    'Status (Ticket)', 'Priority (Ticket)', 'Program Name', 'Select Engineer',
+    'Solutions Engineer', 'Module Lead', 'Department Name', 'Ticket Group',
+    'Classifications', 'Product OR PS Ticket'
+]
+
+# Parsed copies of date columns, added by prepare_ticket_frame
+PARSED_DATE_COLUMNS = {
+    'Created Time (Ticket)': 'Created_Date',
+    'Created Tim': 'Created_Tim_Date',
+    'Gitlab Due date': 'Gitlab_Due_Date'
+}
+
+# Fill for report rows that have crossed SLA
+SLA_HIGHLIGHT_FILL = PatternFill(start_color='FFFF0000', end_color='FFFF0000', fill_type='solid')
+
+# SQLite file the UI keeps recurring issue clusters in between uploads
+RECURRING_CLUSTER_STORE = 'recurring_clusters.db'
+# SQLite file the UI keeps the daily SLA snapshots of the SLA Trend MIS in
+SLA_SNAPSHOT_STORE = 'sla_snapshots.db'
+
+# Open ticket dimensions whose daily Within/Crossed SLA counts are kept for the SLA Trend MIS
+SNAPSHOT_DIMENSIONS = ['Module Lead', 'Program Name', 'Select Engineer', 'Department Name', 'Priority (Ticket)']
+# MIS types whose runs record the day's SLA snapshot
+SNAPSHOT_MIS_TYPES = ["Open Ticket MIS", "Jagan's MIS", "SLA Trend MIS"]
+# Days of snapshots shown by the SLA Trend MIS
+SLA_TREND_DAYS = 31
+# Calendar months covered by the recurring issues monthly trend, unless the UI or CLI asks for another window
+RECURRING_TREND_MONTHS = 6
+
+# Folder the UI keeps uploads in as Parquet, partitioned by created month, so they are parsed only once
+TICKET_STORE = 'ticket_store'
+# Extra columns of the ticket store: the partition key and the row order of the upload
+TICKET_STORE_MONTH_COLUMN = 'created_month'
+TICKET_STORE_ROW_COLUMN = 'row_position'
+# Disk budget of the ticket store; the least recently used exports are removed beyond it
+TICKET_STORE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+# Excel writer used for downloads: 'xlsxwriter' or 'openpyxl' (None picks xlsxwriter when installed)
+XLSX_ENGINE = None
+# Number formats of date cells in downloads (the pandas ExcelWriter defaults)
+EXCEL_DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+EXCEL_DATE_FORMAT = 'YYYY-MM-DD'
+
+# Raw export columns read by each MIS type
+MIS_COLUMNS = {
+    "Client MIS": [
+        'Program Name', 'Ticket Group', 'Status (Ticket)', 'Is Overdue', 'Classifications',
+        'Created Tim', 'Account Name'
+    ] + CLIENT_RAW_DATA_COLUMNS,
+    "Open Ticket MIS": [
+        'Status (Ticket)', 'Classifications', 'Gitlab Due date', 'Is Overdue', 'Created Time (Ticket)',
+        'Module Lead', 'Program Name', 'Select Engineer'
+    ],
+    "Request Ticket Open MIS": REQUEST_OPEN_COLUMNS + ['Created Time (Ticket)', 'Account Name'],
+    "Request Ticket Closed MIS": ['Status (Ticket)', 'Select Engineer', 'Priority (Ticket)'],
+    "Bug Ticket Closed MIS": ['Status (Ticket)', 'Is Overdue', 'Module Lead', 'Program Name', 'Select Engineer'],
+    "Jagan's MIS": [
+        'Status (Ticket)', 'Classifications', 'Gitlab Due date', 'Is Overdue', 'Created Time (Ticket)',
+        'Department Name', 'Gitlab Link', 'Select Engineer', 'Module Lead', 'Ticket Group',
+        'Product OR PS Ticket', 'Program Name', 'Priority (Ticket)', 'Subject'
+    ],
+    "Recurring Issues MIS": RESOLUTION_COLUMNS + SUBCATEGORY_COLUMNS + CREATED_TIME_COLUMNS + [
+        'Number of Reopen', 'Program Name', 'Select Engineer', 'Status (Ticket)', 'Ticket Id'
+    ],
+    # Read by the day's SLA snapshot; the report itself only reads the snapshot store
+    "SLA Trend MIS": ['Status (Ticket)', 'Classifications', 'Gitlab Due date', 'Is Overdue'] + SNAPSHOT_DIMENSIONS
+}
+
+# Columns deciding which row of a ticket exported more than once is kept, most telling first
+TICKET_UPDATED_COLUMNS = ['Modified Time (Ticket)', 'Modified Time', 'Ticket Closed Time', 'Closed Time']
+TICKET_MERGE_COLUMNS = ['Ticket Id'] + TICKET_UPDATED_COLUMNS
+# Columns that make a workbook sheet a ticket sheet (rather than a pivot or notes sheet)
+TICKET_IDENTITY_COLUMNS = ['Ticket Id', 'Status (Ticket)']
+
+# Per-stage timings are logged here as key=value lines (enabled by run_cli --log-performance)
+PERFORMANCE_LOG = logging.getLogger('mis_bot.performance')
+# Stages measured in the current thread, see performance_stages
+STAGE_RECORDS = threading.local()
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far in MB, or None where it isn't available"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def row_count(value):
+    """Rows of a DataFrame, Series or array, summed over dicts of them; None for anything else"""
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(value)
+    if isinstance(value, dict):
+        counts = [row_count(item) for item in value.values()]
+        counts = [count for count in counts if count is not None]
+        return sum(counts) if counts else None
+    return None
+
+@contextmanager
+def performance_stages():
+    """Collect the stages measured in this thread while the block runs, as a list of dicts"""
+    stages = []
+    previous = getattr(STAGE_RECORDS, 'stages', None)
+    STAGE_RECORDS.stages = stages
+    try:
+        yield stages
+    finally:
+        STAGE_RECORDS.stages = previous
+
+@contextmanager
+def measure_stage(name, rows_in=None):
+    """
+    Measure wall time and peak RSS growth of the block as one stage.
+    Yields the stage's record, so the block can set record['rows_out'].
+    """
+    depth = getattr(STAGE_RECORDS, 'depth', 0)
+    record = {'stage': name, 'depth': depth, 'seconds': None, 'rows_in': rows_in, 'rows_out': None, 'peak_rss_delta_mb': None}
+    stages = getattr(STAGE_RECORDS, 'stages', None)
+    if stages is not None:
+        stages.append(record)
+
+    peak_before = peak_rss_mb()
+    STAGE_RECORDS.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = time.perf_counter() - start
+        STAGE_RECORDS.depth = depth
+        if peak_before is not None:
+            # The peak only grows, so this is how far the stage raised it
+            record['peak_rss_delta_mb'] = peak_rss_mb() - peak_before
+        if PERFORMANCE_LOG.isEnabledFor(logging.INFO):
+            PERFORMANCE_LOG.info(' '.join(f"{key}={format_stage_value(value)}" for key, value in record.items()))
+
+def format_stage_value(value):
+    """A stage record value as a log field"""
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    if isinstance(value, str) and (' ' in value or '"' in value or not value):
+        return '"' + value.replace('"', '\\"') + '"'
+    return '-' if value is None else str(value)
+
+def timed_stage(func):
+    """Decorator measuring every call as a stage named after the function, with rows in and out"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with measure_stage(func.__name__, row_count(args[0]) if args else None) as record:
+            result = func(*args, **kwargs)
+            record['rows_out'] = row_count(result)
+        return result
+    return wrapper
 
 def main():
+    # Streamlit is only needed by the UI, so batch runs don't pay for importing it
+    import streamlit as st
+    
     st.title("🤖 MIS Support Bot")
     
     # Greeting
     st.write("Hi team, how are you doing today? Please upload your raw Excel file to proceed.")
     
     # File uploader
-    uploaded_file = st.file_uploader(
-        "Choose your file", 
-        type=['xlsx', 'csv'],
-        help="Upload Excel (.xlsx) or CSV file"
+    uploaded_files = st.file_uploader(
+        "Choose your files", 
+        type=['xlsx', 'csv', 'parquet'],
+        accept_multiple_files=True,
+        help="Upload Excel (.xlsx), CSV or Parquet files; every sheet is read, and tickets exported in several files are merged"
     )
     
-    if uploaded_file is not None:
-        # Load data
-        try:
-            if uploaded_file.name.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_file)
-            else:
-                df = pd.read_csv(uploaded_file)
-            
-            st.success(f"✅ File uploaded successfully! ({len(df)} rows)")
-            
-            # Show data preview
-            with st.expander("📊 Data Preview"):
-                st.dataframe(df.head())
-            
-            # MIS Type Selection
-            st.subheader("Select MIS Type:")
-            
-            mis_options = [
-                "Client MIS",
-                "Open Ticket MIS", 
-                "Request Ticket Open MIS",
-                "Request Ticket Closed MIS",
-                "Bug Ticket Closed MIS",
-                "Jagan's MIS",
-                "Recurring Issues MIS"
-            ]
-            
-            selected_mis = st.radio("Choose MIS type:", mis_options)
-            
-            if st.button("Generate MIS", type="primary"):
-                # Process MIS (placeholder for your backend logic)
-                processed_df = process_mis(df, selected_mis)
-                
-                st.success(f"✅ {selected_mis} generated successfully!")
+    if uploaded_files:
+        # Every measured stage of this rerun, shown in the Performance expander
+        with performance_stages() as stages:
+            # Load data
+            try:
+                # Parsed uploads are cached across reruns and kept in the ticket store across sessions,
+                # and only the columns used by the MIS types are loaded
+                upload_cache = st.cache_resource(create_upload_cache)()
+                uploads = [(uploaded_file.getvalue(), uploaded_file.name) for uploaded_file in uploaded_files]
+                file_hash = uploads_content_hash(uploads)
+                df = load_cached_uploads(upload_cache, uploads, file_hash, TICKET_STORE)
                 
-                # Display results
-                st.subheader("📈 MIS Results:")
-                if selected_mis == "Client MIS" and isinstance(processed_df, dict) and len(processed_df) > 1:
-                    st.write(f"**Generated MIS for {len(processed_df)} programs:**")
-                    for program_name, program_data in processed_df.items():
-                        with st.expander(f"📊 {program_name} MIS"):
-                            if isinstance(program_data, dict):
-                                st.write("**MIS Report:**")
-                                st.dataframe(program_data['mis_report'])
-                                st.write("**Open Tickets:**")
-                                st.dataframe(program_data['open_data'])
-                                st.write("**Closed Tickets:**")
-                                st.dataframe(program_data['closed_data'])
-                                st.write("**Request Tickets:**")
-                                st.dataframe(program_data['request_data'])
-                            else:
-                                st.dataframe(program_data)
-                elif isinstance(processed_df, dict) and 'raw_data' in processed_df:
-                    st.write("**Raw Data:**")
-                    st.dataframe(processed_df['raw_data'])
-                    st.write("**MIS Summary:**")
-                    st.dataframe(processed_df['mis_summary'])
+                if len(uploads) > 1:
+                    st.success(f"✅ {len(uploads)} files uploaded and merged successfully! ({len(df)} tickets)")
                 else:
-                    st.dataframe(processed_df)
+                    st.success(f"✅ File uploaded successfully! ({len(df)} rows)")
                 
-                # Download button
-                excel_buffer = io.BytesIO()
+                # Show data preview
+                with st.expander("📊 Data Preview"):
+                    st.dataframe(df.head())
                 
-                if selected_mis == "Request Ticket Open MIS" and isinstance(processed_df, dict):
-                    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                        processed_df['raw_data'].to_excel(writer, index=False, sheet_name='Request Open Ticket')
-                        processed_df['mis_summary'].to_excel(writer, index=False, sheet_name='MIS')
-                    
-                    st.download_button(
-                        label="📥 Download MIS as Excel",
-                        data=excel_buffer.getvalue(),
-                        file_name=f"Request_open_ticket_{datetime.datetime.now().strftime('%d-%b')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                # MIS Type Selection
+                st.subheader("Select MIS Type:")
+                
+                selected_mis = st.radio("Choose MIS type:", MIS_TYPES)
+                
+                # Reports and their download files are reused for the same file, MIS type and day
+                result_cache = st.cache_resource(create_result_cache)()
+                
+                with st.expander("⚙️ Recurring Issues Clustering"):
+                    reuse_clusters = st.checkbox(
+                        "Reuse recurring issue clusters from earlier uploads", value=True,
+                        help="Only new and changed tickets are clustered; the rest keep their saved cluster"
                     )
-                    
-                elif selected_mis == "Client MIS":
-                    # Handle multiple program files
-                    if isinstance(processed_df, dict) and len(processed_df) > 1:
-                        # Create a zip file with multiple Excel files
-                        import zipfile
-                        zip_buffer = io.BytesIO()
-                        
-                        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                            for program_name, program_data in processed_df.items():
-                                excel_buffer = io.BytesIO()
-                                with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                                    # Write MIS report
-                                    program_data['mis_report'].to_excel(writer, index=False, sheet_name='Client_MIS', header=False)
-                                    # Write separate sheets for different ticket types
-                                    program_data['open_data'].to_excel(writer, index=False, sheet_name='Open_Tickets')
-                                    program_data['closed_data'].to_excel(writer, index=False, sheet_name='Closed_Tickets')
-                                    program_data['request_data'].to_excel(writer, index=False, sheet_name='Request_Tickets')
-                                
-                                safe_program_name = program_name.replace('/', '_').replace('\\', '_')
-                                zip_file.writestr(f"{safe_program_name}_client_mis_{datetime.datetime.now().strftime('%d-%b')}.xlsx", excel_buffer.getvalue())
-                        
-                        st.download_button(
-                            label="📥 Download All Program MIS as ZIP",
-                            data=zip_buffer.getvalue(),
-                            file_name=f"client_mis_all_programs_{datetime.datetime.now().strftime('%d-%b')}.zip",
-                            mime="application/zip"
-                        )
-                    else:
-                        # Single program or error case
-                        if isinstance(processed_df, dict):
-                            program_data = list(processed_df.values())[0]
-                            if isinstance(program_data, dict):
-                                excel_buffer = io.BytesIO()
-                                with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                                    # Write MIS report
-                                    program_data['mis_report'].to_excel(writer, index=False, sheet_name='Client_MIS', header=False)
-                                    # Write separate sheets for different ticket types
-                                    program_data['open_data'].to_excel(writer, index=False, sheet_name='Open_Tickets')
-                                    program_data['closed_data'].to_excel(writer, index=False, sheet_name='Closed_Tickets')
-                                    program_data['request_data'].to_excel(writer, index=False, sheet_name='Request_Tickets')
-                            else:
-                                excel_buffer = io.BytesIO()
-                                with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                                    program_data.to_excel(writer, index=False, sheet_name='Client_MIS', header=False)
-                        else:
-                            excel_buffer = io.BytesIO()
-                            with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                                processed_df.to_excel(writer, index=False, sheet_name='Client_MIS', header=False)
-                        
-                        st.download_button(
-                            label="📥 Download Client MIS as Excel",
-                            data=excel_buffer.getvalue(),
-                            file_name=f"client_mis_{datetime.datetime.now().strftime('%d-%b')}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
+                    trend_months = int(st.number_input(
+                        "Months in the monthly trend", min_value=1, value=RECURRING_TREND_MONTHS, step=1,
+                        help="Calendar months before the current one covered by the recurring issues monthly trend"
+                    ))
+                    if st.button("Rebuild saved clusters"):
+                        reset_cluster_store(RECURRING_CLUSTER_STORE)
+                        result_cache.discard(lambda key: key[3] is not None)
+                        st.success("✅ Saved clusters cleared; the next Recurring Issues MIS clusters every ticket from scratch")
+                cluster_store = RECURRING_CLUSTER_STORE if reuse_clusters else None
                 
-                elif selected_mis in ["Open Ticket MIS", "Bug Ticket Closed MIS", "Jagan's MIS", "Recurring Issues MIS"]:
-                    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                        processed_df.to_excel(writer, index=False, sheet_name=selected_mis.replace(' ', '_'), header=False)
-                        
-                        # Add red highlighting for crossed SLA tickets if applicable
-                        if selected_mis in ["Open Ticket MIS", "Jagan's MIS"]:
-                            from openpyxl.styles import PatternFill
-                            import re
-                            worksheet = writer.sheets[selected_mis.replace(' ', '_')]
-                            red_fill = PatternFill(start_color='FFFF0000', end_color='FFFF0000', fill_type='solid')
-                            
-                            # Highlight rows with any Crossed SLA percentage > 0%
-                            for row in worksheet.iter_rows():
-                                should_highlight = False
-                                for cell in row:
-                                    if cell.value:
-                                        cell_str = str(cell.value)
-                                        # Check for any percentage > 0% in Crossed SLA column
-                                        if re.match(r'^([1-9]\d*|[1-9])%$', cell_str.strip()):
-                                            # Check if this cell is in a Crossed SLA% column
-                                            col_header = worksheet.cell(row=1, column=cell.column).value
-                                            if col_header and 'Crossed SLA%' in str(col_header):
-                                                should_highlight = True
-                                                break
-                                        # Also highlight rows containing "Crossed SLA" text
-                                        elif 'Crossed SLA' in cell_str:
-                                            should_highlight = True
-                                            break
-                                
-                                if should_highlight:
-                                    for cell_in_row in row:
-                                        cell_in_row.fill = red_fill
+                if st.button("Generate MIS", type="primary"):
+                    processed_df, download = load_cached_result(result_cache, file_hash, df, selected_mis, cluster_store, SLA_SNAPSHOT_STORE, trend_months)
                     
-                    st.download_button(
-                        label="📥 Download MIS as Excel",
-                        data=excel_buffer.getvalue(),
-                        file_name=f"{selected_mis.replace(' ', '_').lower()}_{datetime.datetime.now().strftime('%d-%b')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
+                    st.success(f"✅ {selected_mis} generated successfully!")
                     
-                else:
-                    # For other MIS types, provide CSV download
-                    csv_buffer = io.StringIO()
-                    processed_df.to_csv(csv_buffer, index=False)
+                    # Display results
+                    st.subheader("📈 MIS Results:")
+                    show_mis_report(processed_df, selected_mis)
                     
-                    st.download_button(
-                        label="📥 Download MIS as CSV",
-                        data=csv_buffer.getvalue(),
-                        file_name=f"{selected_mis.replace(' ', '_').lower()}.csv",
-                        mime="text/csv"
-                    )
+                    # Download button
+                    st.download_button(**download)
                 
+                if st.button("Generate All MIS"):
+                    # All types from one shared preprocessed frame
+                    results = load_cached_results(result_cache, file_hash, df, MIS_TYPES, cluster_store, SLA_SNAPSHOT_STORE, trend_months)
+                    
+                    st.success(f"✅ All {len(results)} MIS types generated successfully!")
+                    
+                    for mis_type, (processed_df, download) in results.items():
+                        st.subheader(f"📈 {mis_type}:")
+                        show_mis_report(processed_df, mis_type)
+                        st.download_button(**download, key=f"download_{mis_type}")
+                    
+            except Exception as e:
+                st.error(f"❌ Error processing file: {str(e)}")
+        
+        show_performance(stages)
+
+@timed_stage
+def show_mis_report(processed_df, mis_type):
+    """Display a generated MIS in the Streamlit UI"""
+    import streamlit as st
+    
+    if mis_type == "Client MIS" and isinstance(processed_df, dict) and len(processed_df) > 1:
+        st.write(f"**Generated MIS for {len(processed_df)} programs:**")
+        for program_name, program_data in processed_df.items():
+            with st.expander(f"📊 {program_name} MIS"):
+                if isinstance(program_data, dict):
+                    st.write("**MIS Report:**")
+                    st.dataframe(program_data['mis_report'])
+                    st.write("**Open Tickets:**")
+                    st.dataframe(program_data['open_data'])
+                    st.write("**Closed Tickets:**")
+                    st.dataframe(program_data['closed_data'])
+                    st.write("**Request Tickets:**")
+                    st.dataframe(program_data['request_data'])
+                else:
+                    st.dataframe(program_data)
+    elif isinstance(processed_df, dict) and 'raw_data' in processed_df:
+        st.write("**Raw Data:**")
+        st.dataframe(processed_df['raw_data'])
+        st.write("**MIS Summary:**")
+        st.dataframe(processed_df['mis_summary'])
+    else:
+        st.dataframe(processed_df)
+
+def performance_table(stages):
+    """Measured stages as a table, with nested stages indented under the stage calling them"""
+    return pd.DataFrame({
+        'Stage': ['\u2003' * stage['depth'] + stage['stage'] for stage in stages],
+        'Seconds': [stage['seconds'] for stage in stages],
+        'Rows In': [stage['rows_in'] for stage in stages],
+        'Rows Out': [stage['rows_out'] for stage in stages],
+        'Peak RSS Δ (MB)': [stage['peak_rss_delta_mb'] for stage in stages]
+    })
+
+def show_performance(stages):
+    """Display the stages measured during this rerun in the Streamlit UI"""
+    import streamlit as st
+
+    if not stages:
+        return
+    with st.expander("⏱️ Performance"):
+        # Cached uploads and reports skip their stages, and the Recurring Issues MIS worker process isn't measured
+        st.caption("Wall time, rows in and out, and peak resident memory growth of each stage of this run")
+        st.dataframe(performance_table(stages), hide_index=True)
+
+def run_cli(argv=None):
+    """
+    Generate MIS reports without the Streamlit UI, e.g.
+    python mis_bot.py exports/ --mis "Open Ticket MIS" "Jagan's MIS" --output reports/
+    Writes the same files the download buttons offer.
+    """
+    parser = argparse.ArgumentParser(description="Generate MIS reports from raw ticket exports")
+    parser.add_argument('inputs', nargs='+', help="Export files (.xlsx, .csv or .parquet) or directories containing them")
+    parser.add_argument('--mis', nargs='+', choices=MIS_TYPES, metavar='MIS_TYPE',
+                        help="MIS types to generate (default: all, the SLA Trend MIS only with --snapshot-store). Choices: " + ', '.join(MIS_TYPES))
+    parser.add_argument('--output', default='.', help="Directory to write the reports to (default: current directory)")
+    parser.add_argument('--cluster-store', metavar='PATH',
+                        help="SQLite file keeping recurring issue clusters between runs (default: cluster every export from scratch)")
+    parser.add_argument('--recluster', action='store_true',
+                        help="Clear the cluster store first, so every ticket is clustered from scratch")
+    parser.add_argument('--trend-months', type=int, default=RECURRING_TREND_MONTHS, metavar='N',
+                        help=f"Calendar months covered by the recurring issues monthly trend (default: {RECURRING_TREND_MONTHS})")
+    parser.add_argument('--snapshot-store', metavar='PATH',
+                        help="SQLite file collecting the daily SLA snapshots the SLA Trend MIS is built from")
+    parser.add_argument('--ticket-store', metavar='DIR',
+                        help="Folder keeping parsed exports as Parquet, so later runs read them back instead of parsing them again")
+    parser.add_argument('--created-months', nargs='+', metavar='YYYY-MM',
+                        help="Only report tickets created in these months; with --ticket-store only their partitions are read")
+    parser.add_argument('--merge', action='store_true',
+                        help="Merge all exports into one set of reports, keeping the latest row of tickets exported more than once")
+    parser.add_argument('--log-performance', action='store_true',
+                        help="Log the wall time, rows in and out and peak memory growth of every stage to stderr")
+    args = parser.parse_args(argv)
+
+    if args.log_performance:
+        logging.basicConfig(stream=sys.stderr, format='%(asctime)s %(name)s %(message)s')
+        PERFORMANCE_LOG.setLevel(logging.INFO)
+
+    if args.recluster and not args.cluster_store:
+        parser.error("--recluster needs --cluster-store")
+    if args.trend_months < 1:
+        parser.error("--trend-months needs at least 1 month")
+    # The SLA Trend MIS is built from the snapshot store alone
+    if args.mis is None:
+        args.mis = [mis_type for mis_type in MIS_TYPES if mis_type != "SLA Trend MIS" or args.snapshot_store]
+    elif "SLA Trend MIS" in args.mis and not args.snapshot_store:
+        parser.error("the SLA Trend MIS needs --snapshot-store")
+    if args.created_months and not all(re.fullmatch(r'\d{4}-\d{2}', month) for month in args.created_months):
+        parser.error("--created-months takes months as YYYY-MM")
+    
+    export_files = find_ticket_exports(args.inputs)
+    if not export_files:
+        parser.error("no .xlsx, .csv or .parquet exports found")
+    
+    if args.recluster:
+        reset_cluster_store(args.cluster_store)
+    
+    if args.merge:
+        # One set of reports from all exports together
+        batches = [(export_files, args.output)]
+    elif len(export_files) > 1:
+        # Keep reports of different exports apart, since report file names only carry the date
+        batches = [([export_file], os.path.join(args.output, os.path.splitext(os.path.basename(export_file))[0]))
+                   for export_file in export_files]
+    else:
+        batches = [(export_files, args.output)]
+    
+    failed = False
+    loaded = []
+    for batch_files, output_dir in batches:
+        os.makedirs(output_dir, exist_ok=True)
+        
+        try:
+            sources = [(export_file, export_file) for export_file in batch_files]
+            if args.ticket_store:
+                sources_hash = uploads_content_hash([(read_file(export_file), export_file) for export_file in batch_files])
+                df = load_stored_exports(sources, sources_hash, args.ticket_store, args.mis, args.created_months)
+            else:
+                df = load_ticket_exports(sources)
+                if args.created_months:
+                    df = select_created_months(df, args.created_months)
         except Exception as e:
-            st.error(f"❌ Error processing file: {str(e)}")
+            print(f"❌ Error processing file {', '.join(batch_files)}: {str(e)}", file=sys.stderr)
+            failed = True
+            continue
+        loaded.append((df, output_dir))
+    
+    # One SLA snapshot per run, of all exports together, rather than one per export overwriting the last
+    if args.snapshot_store and loaded and any(mis_type in SNAPSHOT_MIS_TYPES for mis_type in args.mis):
+        record_sla_snapshot(merge_ticket_frames([df for df, _ in loaded]) if len(loaded) > 1 else loaded[0][0], args.snapshot_store)
+    
+    for df, output_dir in loaded:
+        for mis_type, processed_df in process_all_mis(df, args.mis, args.cluster_store, args.snapshot_store, record_snapshot=False,
+                                                      trend_months=args.trend_months).items():
+            download = build_mis_download(processed_df, mis_type)
+            output_path = os.path.join(output_dir, download['file_name'])
+            data = download['data']
+            with open(output_path, 'wb') as output_file:
+                output_file.write(data.encode('utf-8') if isinstance(data, str) else data)
+            print(f"✅ {mis_type}: {output_path}")
+    
+    return 1 if failed else 0
+
+def read_file(path):
+    """Contents of a file as bytes"""
+    with open(path, 'rb') as file:
+        return file.read()
+
+def find_ticket_exports(paths):
+    """Export files named on the command line, with directories expanded to the exports inside them"""
+    export_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                # Skip Excel lock files of open workbooks
+                if name.lower().endswith(('.xlsx', '.csv', '.parquet')) and not name.startswith('~$'):
+                    export_files.append(os.path.join(path, name))
+        else:
+            export_files.append(path)
+    return export_files
+
+@timed_stage
+def build_mis_download(processed_df, mis_type):
+    """
+    Serialize a generated MIS into the file offered for download.
+    Returns the keyword arguments for st.download_button.
+    """
+    if mis_type == "Request Ticket Open MIS" and isinstance(processed_df, dict):
+        return dict(
+            label="📥 Download MIS as Excel",
+            data=write_xlsx([
+                excel_sheet('Request Open Ticket', processed_df['raw_data']),
+                excel_sheet('MIS', processed_df['mis_summary'])
+            ]),
+            file_name=f"Request_open_ticket_{datetime.datetime.now().strftime('%d-%b')}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+        
+    elif mis_type == "Client MIS":
+        # Handle multiple program files
+        if isinstance(processed_df, dict) and len(processed_df) > 1:
+            # Create a zip file with multiple Excel files, adding each workbook as soon as it is written
+            zip_buffer = io.BytesIO()
+            
+            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                for program_name, workbook in write_client_program_workbooks(processed_df):
+                    safe_program_name = program_name.replace('/', '_').replace('\\', '_')
+                    zip_file.writestr(f"{safe_program_name}_client_mis_{datetime.datetime.now().strftime('%d-%b')}.xlsx", workbook)
+            
+            return dict(
+                label="📥 Download All Program MIS as ZIP",
+                data=zip_buffer.getvalue(),
+                file_name=f"client_mis_all_programs_{datetime.datetime.now().strftime('%d-%b')}.zip",
+                mime="application/zip"
+            )
+        else:
+            # Single program or error case
+            if isinstance(processed_df, dict):
+                program_data = list(processed_df.values())[0]
+                if isinstance(program_data, dict):
+                    workbook = write_client_program_workbook(program_data)
+                else:
+                    workbook = write_xlsx([excel_sheet('Client_MIS', program_data, header=False)])
+            else:
+                workbook = write_xlsx([excel_sheet('Client_MIS', processed_df, header=False)])
+            
+            return dict(
+                label="📥 Download Client MIS as Excel",
+                data=workbook,
+                file_name=f"client_mis_{datetime.datetime.now().strftime('%d-%b')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+    
+    elif mis_type in ["Open Ticket MIS", "Bug Ticket Closed MIS", "Jagan's MIS", "Recurring Issues MIS", "SLA Trend MIS"]:
+        # Add red highlighting for crossed SLA tickets if applicable
+        if mis_type in ["Open Ticket MIS", "Jagan's MIS"]:
+            highlight = crossed_sla_row_mask(processed_df)
+        else:
+            highlight = None
+        
+        return dict(
+            label="📥 Download MIS as Excel",
+            data=write_xlsx([excel_sheet(mis_type.replace(' ', '_'), processed_df, header=False, highlight=highlight)]),
+            file_name=f"{mis_type.replace(' ', '_').lower()}_{datetime.datetime.now().strftime('%d-%b')}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+        
+    else:
+        # For other MIS types, provide CSV download
+        csv_buffer = io.StringIO()
+        processed_df.to_csv(csv_buffer, index=False)
+        
+        return dict(
+            label="📥 Download MIS as CSV",
+            data=csv_buffer.getvalue(),
+            file_name=f"{mis_type.replace(' ', '_').lower()}.csv",
+            mime="text/csv"
+        )
+
+@timed_stage
+def crossed_sla_row_mask(report):
+    """
+    Rows of an exported report to highlight in red: rows mentioning 'Crossed SLA',
+    and rows with a percentage above 0% under a 'Crossed SLA%' heading in the first row.
+    """
+    row_mask = np.zeros(len(report), dtype=bool)
+    if report.empty:
+        return row_mask
+    
+    header = report.iloc[0]
+    for position in range(report.shape[1]):
+        column = report.iloc[:, position]
+        # Blank cells never match, and most report cells are blank
+        filled = column.notna().to_numpy()
+        if not filled.any():
+            continue
+        cells = column[filled].astype(str)
+        row_mask[filled] |= cells.str.contains('Crossed SLA', regex=False).to_numpy()
+        
+        heading = header.iloc[position]
+        if isinstance(heading, str) and 'Crossed SLA%' in heading:
+            row_mask[filled] |= cells.str.strip().str.match(r'^([1-9]\d*|[1-9])%$').to_numpy()
+    
+    return row_mask
+
+def highlight_ranges(row_mask, column_count, first_row=1):
+    """Cell ranges covering the whole width of the masked rows, with consecutive rows merged"""
+    rows = np.flatnonzero(row_mask) + first_row
+    if len(rows) == 0 or column_count == 0:
+        return []
+    
+    breaks = np.flatnonzero(np.diff(rows) != 1)
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]]))
+    last_column = get_column_letter(column_count)
+    return [f"A{start}:{last_column}{end}" for start, end in zip(starts, ends)]
+
+def excel_sheet(name, data, header=True, highlight=None):
+    """
+    Declare one worksheet of a download: the frame to write, whether its column
+    names form a header row, and an optional row mask of rows to fill red.
+    """
+    return {'name': name, 'data': data, 'header': header, 'highlight': highlight}
+
+def excel_rows(data):
+    """
+    Cell values of a frame as row lists, with blanks as None,
+    plus the number format of each column (dates and datetimes only).
+    """
+    rows = data.astype(object).where(data.notna(), None).values.tolist()
+    
+    number_formats = []
+    for _, column in data.items():
+        if pd.api.types.is_datetime64_any_dtype(column):
+            kind = 'datetime'
+        elif column.dtype == object:
+            kind = pd.api.types.infer_dtype(column, skipna=True)
+        else:
+            kind = None
+        
+        if kind in ('datetime64', 'datetime'):
+            number_formats.append(EXCEL_DATETIME_FORMAT)
+        elif kind == 'date':
+            number_formats.append(EXCEL_DATE_FORMAT)
+        else:
+            number_formats.append(None)
+    return rows, number_formats
+
+@timed_stage
+def write_xlsx(sheets, engine=None):
+    """
+    Write declared sheets (see excel_sheet) to xlsx bytes with a streaming writer.
+    Rows are written out as they are produced instead of building a workbook in memory.
+    """
+    engine = engine or XLSX_ENGINE or ('xlsxwriter' if xlsxwriter is not None else 'openpyxl')
+    if engine == 'xlsxwriter':
+        return write_xlsx_with_xlsxwriter(sheets)
+    elif engine == 'openpyxl':
+        return write_xlsx_with_openpyxl(sheets)
+    raise ValueError(f"Unknown Excel writer: {engine}")
+
+def write_xlsx_with_xlsxwriter(sheets):
+    """xlsxwriter backend of write_xlsx, in constant memory mode"""
+    excel_buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(excel_buffer, {
+        'constant_memory': True,
+        'default_date_format': EXCEL_DATETIME_FORMAT,
+        'strings_to_urls': False
+    })
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    highlight_format = workbook.add_format({'bg_color': '#FF0000'})
+    date_format = workbook.add_format({'num_format': EXCEL_DATE_FORMAT})
+    
+    for sheet in sheets:
+        data = sheet['data']
+        worksheet = workbook.add_worksheet(sheet['name'])
+        row_number = 0
+        if sheet['header']:
+            worksheet.write_row(row_number, 0, list(data.columns), header_format)
+            row_number += 1
+        
+        if sheet['highlight'] is not None:
+            cell_ranges = highlight_ranges(sheet['highlight'], data.shape[1], row_number + 1)
+            if cell_ranges:
+                worksheet.conditional_format(cell_ranges[0], {
+                    'type': 'formula',
+                    'criteria': 'TRUE',
+                    'format': highlight_format,
+                    'multi_range': ' '.join(cell_ranges)
+                })
+        
+        rows, number_formats = excel_rows(data)
+        date_positions = [position for position, number_format in enumerate(number_formats) if number_format == EXCEL_DATE_FORMAT]
+        for values in rows:
+            # Blank cells are skipped rather than written
+            for position, value in enumerate(values):
+                if value is not None:
+                    worksheet.write(row_number, position, value)
+            for position in date_positions:
+                if values[position] is not None:
+                    worksheet.write_datetime(row_number, position, values[position], date_format)
+            row_number += 1
+    
+    workbook.close()
+    return excel_buffer.getvalue()
+
+def write_xlsx_with_openpyxl(sheets):
+    """openpyxl backend of write_xlsx, using a write-only workbook"""
+    workbook = Workbook(write_only=True)
+    header_font = Font(bold=True)
+    header_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
+    header_alignment = Alignment(horizontal='center', vertical='top')
+    
+    for sheet in sheets:
+        data = sheet['data']
+        worksheet = workbook.create_sheet(sheet['name'])
+        first_row = 1
+        if sheet['header']:
+            header_row = []
+            for label in data.columns:
+                cell = WriteOnlyCell(worksheet, label)
+                cell.font = header_font
+                cell.border = header_border
+                cell.alignment = header_alignment
+                header_row.append(cell)
+            worksheet.append(header_row)
+            first_row += 1
+        
+        if sheet['highlight'] is not None:
+            cell_ranges = highlight_ranges(sheet['highlight'], data.shape[1], first_row)
+            if cell_ranges:
+                worksheet.conditional_formatting.add(' '.join(cell_ranges), FormulaRule(formula=['TRUE'], fill=SLA_HIGHLIGHT_FILL))
+        
+        rows, number_formats = excel_rows(data)
+        formatted_positions = [(position, number_format) for position, number_format in enumerate(number_formats) if number_format]
+        for values in rows:
+            if formatted_positions:
+                for position, number_format in formatted_positions:
+                    if values[position] is not None:
+                        cell = WriteOnlyCell(worksheet, values[position])
+                        cell.number_format = number_format
+                        values[position] = cell
+            worksheet.append(values)
+    
+    excel_buffer = io.BytesIO()
+    workbook.save(excel_buffer)
+    return excel_buffer.getvalue()
+
+def required_columns(mis_type=None):
+    """Raw export columns needed by one MIS type, or by all of them"""
+    mis_types = [mis_type] if mis_type else MIS_TYPES
+    return list(dict.fromkeys(col for name in mis_types for col in MIS_COLUMNS.get(name, [])))
 
-def process_mis(df, mis_type):
+def convert_excel_cell(cell):
+    """Convert an openpyxl cell the same way pd.read_excel does"""
+    if cell.value is None:
+        return ''
+    elif cell.data_type == TYPE_ERROR:
+        return np.nan
+    elif cell.data_type == TYPE_NUMERIC:
+        value = int(cell.value)
+        if value == cell.value:
+            return value
+        return float(cell.value)
+    return cell.value
+
+def read_sheet_header(sheet):
+    """Header row of one read-only worksheet, converted like pd.read_excel does"""
+    sheet.reset_dimensions()
+    return [convert_excel_cell(cell) for cell in next(sheet.iter_rows(max_row=1), ())]
+
+def read_sheet_columns(sheet, columns=None):
+    """
+    Stream one read-only worksheet, keeping only the given columns (all columns if None).
+    The result matches pd.read_excel for that sheet, restricted to the columns present,
+    but cells of the other columns are never kept in memory.
+    """
+    sheet.reset_dimensions()
+    rows = sheet.iter_rows()
+
+    header = [convert_excel_cell(cell) for cell in next(rows, ())]
+    if columns is None:
+        keep = list(range(len(header)))
+    else:
+        wanted = set(columns)
+        first_positions = {}
+        for position, name in enumerate(header):
+            if name in wanted and name not in first_positions:
+                first_positions[name] = position
+        keep = sorted(first_positions.values())
+
+    data = [[header[position] for position in keep]]
+    last_row_with_data = 0 if any(value != '' for value in header) else -1
+
+    for row_number, row in enumerate(rows, 1):
+        values = [convert_excel_cell(row[position]) if position < len(row) else '' for position in keep]
+        data.append(values)
+        # Blank rows at the end of the sheet are dropped, like pd.read_excel does
+        if any(value != '' for value in values) or any(cell.value is not None and cell.value != '' for cell in row):
+            last_row_with_data = row_number
+
+    data = data[:last_row_with_data + 1]
+    if not data:
+        return pd.DataFrame()
+    if not keep:
+        return pd.DataFrame(index=pd.RangeIndex(len(data) - 1))
+    return TextParser(data, header=0, skip_blank_lines=False).read()
+
+@timed_stage
+def read_excel_columns(source, columns=None):
+    """
+    Stream the first sheet of an .xlsx file in read-only mode, keeping only
+    the given columns (all columns if None).
+    The result matches pd.read_excel(source)[columns] for the columns present.
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        return read_sheet_columns(workbook.worksheets[0], columns)
+    finally:
+        workbook.close()
+
+@timed_stage
+def read_excel_sheets(source, columns=None):
+    """
+    Stream every ticket sheet of an .xlsx file like read_excel_columns.
+    Ticket sheets are those with a ticket identity column; without any, the first
+    sheet and the sheets with the same header are read. Other sheets (e.g. pivot or
+    notes sheets, even when they share a column such as Program Name) are skipped.
+    Returns a list of frames in sheet order.
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheets = workbook.worksheets
+        if not sheets:
+            return [pd.DataFrame()]
+        headers = [read_sheet_header(sheet) for sheet in sheets]
+        identity = [any(col in header for col in TICKET_IDENTITY_COLUMNS) for header in headers]
+        ticket_header = headers[identity.index(True)] if any(identity) else headers[0]
+        return [
+            read_sheet_columns(sheet, columns)
+            for sheet, header, has_identity in zip(sheets, headers, identity)
+            if has_identity or header == ticket_header
+        ]
+    finally:
+        workbook.close()
+
+@timed_stage
+def compact_dtypes(df):
+    """
+    Downcast integer columns to the smallest integer type that holds them and
+    store the dimension columns as categoricals (one code per ticket instead of
+    one string object), which also speeds up grouping and filtering on them.
+    """
+    for column in df.select_dtypes(include='integer').columns:
+        df[column] = pd.to_numeric(df[column], downcast='integer')
+    
+    for column in DIMENSION_COLUMNS:
+        if column not in df.columns or df[column].dtype != object:
+            continue
+        values = df[column]
+        # Only all-text columns with repeating values are worth encoding
+        if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+            continue
+        if values.nunique() * 2 > len(values):
+            continue
+        df[column] = values.astype('category')
+    return df
+
+def arrow_tickets_to_pandas(table):
+    """
+    A ticket frame from an Arrow table, with the dtypes of a parsed export:
+    sorted categories and NaN (rather than None) for missing text.
+    """
+    df = table.to_pandas()
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.cat.remove_unused_categories()
+            df[column] = values.cat.reorder_categories(sorted(values.cat.categories))
+        elif values.dtype == object and values.isna().any():
+            df[column] = values.where(values.notna(), np.nan)
+    return df
+
+def read_parquet_columns(source, columns=None):
+    """Read the given columns (all columns if None) of a Parquet file, skipping the ones it lacks"""
+    if pyarrow is None:
+        raise ValueError("Parquet files need the pyarrow package")
+    parquet_file = pyarrow_parquet.ParquetFile(source)
+    names = parquet_file.schema_arrow.names
+    if columns is not None:
+        wanted = set(columns)
+        names = [name for name in names if name in wanted]
+    return arrow_tickets_to_pandas(parquet_file.read(columns=names, use_pandas_metadata=False))
+
+def read_ticket_export(source, file_name, columns):
+    """Frames of one raw ticket export: one per ticket sheet of an .xlsx, one for a .csv or .parquet"""
+    if file_name.lower().endswith('.xlsx'):
+        return read_excel_sheets(source, columns)
+    if file_name.lower().endswith('.parquet'):
+        return [read_parquet_columns(source, columns)]
+    wanted = set(columns)
+    return [pd.read_csv(source, usecols=lambda column: column in wanted)]
+
+def read_ticket_exports(sources, columns):
+    """
+    Frames of several exports, given as (source, file_name) pairs, in the same order.
+    Workbook parsing is pure Python, so several files are parsed in worker processes.
+    """
+    workers = min(len(sources), os.cpu_count() or 1)
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(read_ticket_export, *zip(*sources), [columns] * len(sources)))
+        except (BrokenProcessPool, pickle.PicklingError, OSError):
+            # Workers unavailable: parse here
+            pass
+    return [read_ticket_export(source, file_name, columns) for source, file_name in sources]
+
+@timed_stage
+def merge_ticket_frames(frames):
+    """
+    One ticket frame from export chunks (files or sheets).
+    A ticket in several chunks keeps its latest row by modified time, else closed time,
+    and the row of the later chunk on ties; kept rows stay in chunk order.
+    """
+    filled = [frame for frame in frames if not frame.empty]
+    if len(filled) <= 1:
+        return filled[0] if filled else frames[0]
+    
+    df = pd.concat(filled, ignore_index=True)
+    if 'Ticket Id' not in df.columns:
+        return df
+    
+    updated = None
+    for col in TICKET_UPDATED_COLUMNS:
+        if col in df.columns:
+            parsed = parse_datetime_column(df[col])
+            updated = parsed if updated is None else updated.fillna(parsed)
+    order = df.index if updated is None else updated.sort_values(kind='stable', na_position='first').index
+    
+    keys = df['Ticket Id'].map(ticket_key).loc[order]
+    # Rows without a Ticket Id can't be matched, so they are all kept
+    latest = keys.isna() | (keys == '') | ~keys.duplicated(keep='last')
+    return df.loc[np.sort(order[latest.to_numpy()])].reset_index(drop=True)
+
+def ticket_columns(mis_types=None):
+    """Export columns loaded for the given MIS types (all types if None), with the ones the merge needs"""
+    columns = [col for mis_type in (mis_types or [None]) for col in required_columns(mis_type)]
+    return list(dict.fromkeys(columns + TICKET_MERGE_COLUMNS))
+
+@timed_stage
+def load_ticket_exports(sources, mis_type=None):
+    """
+    Load raw ticket exports (.xlsx, .csv or .parquet), given as (source, file_name) pairs, as one frame.
+    Every ticket sheet of a workbook is read, and tickets exported more than once are merged.
+    Only the columns used by the given MIS type (or by any MIS type) are read.
+    """
+    columns = ticket_columns([mis_type] if mis_type else None)
+    frames = [frame for export_frames in read_ticket_exports(sources, columns) for frame in export_frames]
+    return compact_dtypes(merge_ticket_frames(frames))
+
+def load_ticket_export(source, file_name, mis_type=None):
+    """Load a single raw ticket export (.xlsx, .csv or .parquet), see load_ticket_exports"""
+    return load_ticket_exports([(source, file_name)], mis_type)
+
+def ticket_store_path(store, sources_hash):
+    """
+    Folder of one set of exports in the ticket store.
+    The loaded columns are part of the key, so folders written by a version loading other columns aren't reused.
+    """
+    key = hashlib.sha256('\n'.join([sources_hash] + ticket_columns()).encode()).hexdigest()
+    return os.path.join(store, key)
+
+def created_months(df):
+    """Created month ('YYYY-MM') of each ticket, 'unknown' when missing"""
+    for col in CREATED_TIME_COLUMNS:
+        if col in df.columns:
+            return parse_datetime_column(df[col]).dt.strftime('%Y-%m').fillna('unknown')
+    return pd.Series('unknown', index=df.index)
+
+def select_created_months(df, months):
+    """Tickets created in the given months ('YYYY-MM'), in upload order"""
+    return df[created_months(df).isin(months).to_numpy()].reset_index(drop=True)
+
+@timed_stage
+def write_ticket_store(df, path):
+    """
+    Save a loaded ticket frame to the ticket store as Parquet, partitioned by created month.
+    Frames Parquet can't hold (columns mixing numbers and text) are not stored.
+    Returns whether the frame was stored.
+    """
+    if pyarrow is None or df.empty:
+        return False
+    
+    # Written next to the final folder first, so readers never see a partly written store
+    partial_path = f"{path}.{os.getpid()}.{threading.get_ident()}.partial"
+    try:
+        df.assign(**{
+            TICKET_STORE_ROW_COLUMN: np.arange(len(df)),
+            TICKET_STORE_MONTH_COLUMN: created_months(df).to_numpy()
+        }).to_parquet(partial_path, partition_cols=[TICKET_STORE_MONTH_COLUMN], index=False)
+        os.replace(partial_path, path)
+        return True
+    except (pyarrow.ArrowException, TypeError, ValueError, OSError):
+        return False
+    finally:
+        shutil.rmtree(partial_path, ignore_errors=True)
+
+@timed_stage
+def read_ticket_store(path, columns=None, months=None):
+    """
+    Read stored tickets back in upload order, with their loaded dtypes.
+    Only the given columns (all if None) and created months ('YYYY-MM', all if None) are read.
+    """
+    dataset = pyarrow_dataset.dataset(path, format='parquet', partitioning='hive')
+    names = [name for name in dataset.schema.names if name not in (TICKET_STORE_ROW_COLUMN, TICKET_STORE_MONTH_COLUMN)]
+    if columns is not None:
+        wanted = set(columns)
+        names = [name for name in names if name in wanted]
+    month_filter = pyarrow_dataset.field(TICKET_STORE_MONTH_COLUMN).isin(months) if months is not None else None
+    
+    df = arrow_tickets_to_pandas(dataset.to_table(columns=names + [TICKET_STORE_ROW_COLUMN], filter=month_filter))
+    order = np.argsort(df[TICKET_STORE_ROW_COLUMN].to_numpy(), kind='stable')
+    return df.take(order).drop(columns=TICKET_STORE_ROW_COLUMN).reset_index(drop=True)
+
+def load_stored_exports(sources, sources_hash, ticket_store, mis_types=None, months=None):
+    """
+    Load exports like load_ticket_exports, through the ticket store: exports stored before
+    are read back (only the columns of the given MIS types, and only the partitions of
+    the given created months if any), others are parsed and stored.
+    """
+    path = ticket_store_path(ticket_store, sources_hash)
+    if pyarrow is not None and os.path.isdir(path):
+        # Marks the export as recently used for prune_ticket_store
+        os.utime(path)
+        return read_ticket_store(path, ticket_columns(mis_types), months)
+    
+    df = load_ticket_exports(sources)
+    # Parquet uploads are quick to read already
+    if not all(file_name.lower().endswith('.parquet') for _, file_name in sources):
+        os.makedirs(ticket_store, exist_ok=True)
+        if write_ticket_store(df, path):
+            prune_ticket_store(ticket_store, keep=path)
+    return select_created_months(df, months) if months is not None else df
+
+def prune_ticket_store(store, keep=None, max_bytes=TICKET_STORE_MAX_BYTES):
+    """
+    Remove the least recently used exports (by folder modification time) while the
+    ticket store takes more than max_bytes. The folder keep is never removed.
+    """
+    folders = []
+    for name in os.listdir(store):
+        path = os.path.join(store, name)
+        # Folders still being written are left alone
+        if os.path.isdir(path) and not name.endswith('.partial'):
+            size = sum(os.path.getsize(os.path.join(root, file_name)) for root, _, file_names in os.walk(path) for file_name in file_names)
+            folders.append((os.path.getmtime(path), path, size))
+    
+    total = sum(size for _, _, size in folders)
+    for _, path, size in sorted(folders):
+        if total <= max_bytes:
+            break
+        if path != keep:
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+# Memory budget for parsed uploads kept across Streamlit reruns
+UPLOAD_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Memory budget for generated reports and download files
+RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+def estimate_nbytes(value):
+    """Approximate in-memory size of a cached value (DataFrames, bytes or dicts of them)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by the total size of its values"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                return default
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self, key, value):
+        size = estimate_nbytes(value)
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            if size > self.max_bytes:
+                # Never cache a value bigger than the whole budget
+                return value
+            while self.entries and self.total_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+        return value
+
+    def discard(self, predicate):
+        """Drop every entry whose key matches the predicate"""
+        with self.lock:
+            for key in [key for key in self.entries if predicate(key)]:
+                self.total_bytes -= self.entries.pop(key)[1]
+
+def create_upload_cache():
+    """Cache of parsed uploads keyed by file content hash"""
+    return LRUCache(UPLOAD_CACHE_MAX_BYTES)
+
+def file_content_hash(data):
+    """Content hash identifying an uploaded file"""
+    return hashlib.sha256(data).hexdigest()
+
+def load_cached_upload(cache, data, file_name, file_hash=None, ticket_store=None):
+    """Parse an upload unless the same file content was parsed before"""
+    return load_cached_uploads(cache, [(data, file_name)], file_hash, ticket_store)
+
+def uploads_content_hash(uploads):
+    """Content hash identifying a set of uploads, given as (data, file_name) pairs; a single upload keeps its file hash"""
+    if len(uploads) == 1:
+        return file_content_hash(uploads[0][0])
+    return hashlib.sha256(''.join(file_content_hash(data) for data, _ in uploads).encode()).hexdigest()
+
+def load_cached_uploads(cache, uploads, uploads_hash=None, ticket_store=None):
+    """
+    Parse and merge uploads, given as (data, file_name) pairs, unless the same files were merged before.
+    With a ticket store folder, uploads parsed in earlier sessions are read back from Parquet instead.
+    """
+    uploads_hash = uploads_hash or uploads_content_hash(uploads)
+    extensions = tuple(os.path.splitext(file_name)[1].lower() for _, file_name in uploads)
+    key = (uploads_hash, extensions[0] if len(extensions) == 1 else extensions)
+    df = cache.get(key)
+    if df is None:
+        sources = [(io.BytesIO(data), file_name) for data, file_name in uploads]
+        if ticket_store:
+            df = load_stored_exports(sources, uploads_hash, ticket_store)
+        else:
+            df = load_ticket_exports(sources)
+        df = cache.put(key, df)
+    return df
+
+def create_result_cache():
+    """Cache of generated reports and download files keyed by (file hash, MIS type, report date, cluster store)"""
+    return LRUCache(RESULT_CACHE_MAX_BYTES)
+
+def load_cached_result(cache, file_hash, df, mis_type, cluster_store=None, snapshot_store=None,
+                       trend_months=RECURRING_TREND_MONTHS):
+    """
+    Generate an MIS and its download file unless they were already generated today.
+    Returns (report, download keyword arguments).
+    """
+    return load_cached_results(cache, file_hash, df, [mis_type], cluster_store, snapshot_store, trend_months)[mis_type]
+
+def result_cache_key(file_hash, mis_type, report_date, cluster_store=None, trend_months=RECURRING_TREND_MONTHS):
+    """Result cache key; only the Recurring Issues MIS depends on the cluster store and the trend window"""
+    if mis_type != "Recurring Issues MIS":
+        cluster_store = trend_months = None
+    return (file_hash, mis_type, report_date, cluster_store, trend_months)
+
+def load_cached_results(cache, file_hash, df, mis_types, cluster_store=None, snapshot_store=None,
+                        trend_months=RECURRING_TREND_MONTHS):
+    """
+    Generate several MIS types and their download files, skipping the ones already generated today.
+    Returns {mis_type: (report, download keyword arguments)}.
+    """
+    report_date = get_today_date().date()
+    # SLA status and day counts depend on today's date, so earlier days' results are stale
+    cache.discard(lambda key: key[2] != report_date)
+    results = {
+        mis_type: cache.get(result_cache_key(file_hash, mis_type, report_date, cluster_store, trend_months))
+        for mis_type in mis_types
+    }
+    
+    missing = [mis_type for mis_type, result in results.items() if result is None]
+    if missing:
+        for mis_type, processed_df in process_all_mis(df, missing, cluster_store, snapshot_store, trend_months=trend_months).items():
+            result = {'report': processed_df, 'download': build_mis_download(processed_df, mis_type)}
+            results[mis_type] = cache.put(result_cache_key(file_hash, mis_type, report_date, cluster_store, trend_months), result)
+    
+    return {mis_type: (result['report'], result['download']) for mis_type, result in results.items()}
+
+@timed_stage
+def process_mis(df, mis_type, cluster_store=None, snapshot_store=None, trend_months=RECURRING_TREND_MONTHS):
     """
     Process MIS based on the selected type
     """
@@ -219,10 +1221,295 @@ def process_mis(df, mis_type):
     elif mis_type == "Jagan's MIS":
         return process_jagan_mis(df)
     elif mis_type == "Recurring Issues MIS":
-        return process_recurring_issues_mis(df)
+        return process_recurring_issues_mis(df, cluster_store, trend_months)
+    elif mis_type == "SLA Trend MIS":
+        return process_sla_trend_mis(snapshot_store)
     
     return df
 
+@timed_stage
+def process_all_mis(df, mis_types=MIS_TYPES, cluster_store=None, snapshot_store=None, record_snapshot=True,
+                    trend_months=RECURRING_TREND_MONTHS):
+    """
+    Generate several MIS types in one run, from one shared preprocessed frame.
+    The Recurring Issues MIS, by far the slowest, runs in a worker process meanwhile,
+    with a monthly trend over trend_months calendar months.
+    With a snapshot store (SQLite file), open ticket MIS types also record the day's SLA snapshot,
+    unless record_snapshot is False (callers recording it themselves).
+    Returns {mis_type: report} in the order of mis_types.
+    """
+    # A single MIS type has nothing to share
+    tickets = prepare_ticket_frame(df) if len(mis_types) > 1 else df
+    reports = {}
+    
+    # Recorded first, so the SLA Trend MIS of this run includes today
+    if snapshot_store and record_snapshot and any(mis_type in SNAPSHOT_MIS_TYPES for mis_type in mis_types):
+        record_sla_snapshot(tickets, snapshot_store)
+    
+    recurring = None
+    if "Recurring Issues MIS" in mis_types and len(mis_types) > 1 and (os.cpu_count() or 1) > 1:
+        try:
+            pool = ProcessPoolExecutor(max_workers=1)
+            # It doesn't use the shared columns, so the worker gets the raw frame
+            recurring = pool.submit(process_recurring_issues_mis, df, cluster_store, trend_months)
+            pool.shutdown(wait=False)
+        except (BrokenProcessPool, OSError):
+            recurring = None
+    
+    for mis_type in mis_types:
+        if mis_type != "Recurring Issues MIS" or recurring is None:
+            reports[mis_type] = process_mis(tickets, mis_type, cluster_store, snapshot_store, trend_months)
+    
+    if recurring is not None:
+        try:
+            reports["Recurring Issues MIS"] = recurring.result()
+        except (BrokenProcessPool, pickle.PicklingError, OSError):
+            # Worker unavailable: generate it here
+            reports["Recurring Issues MIS"] = process_mis(df, "Recurring Issues MIS", cluster_store, trend_months=trend_months)
+    
+    return {mis_type: reports[mis_type] for mis_type in mis_types}
+
+def get_today_date():
+    """Today's date at midnight, the reference point for SLA and day counts"""
+    return datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+def parse_datetime_column(values):
+    """
+    Parse a whole date column at once.
+    Gives the same result as pd.to_datetime(value, errors='coerce') on each cell,
+    with unparseable cells as NaT and timezones dropped (wall-clock time kept).
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        parsed = values
+    else:
+        try:
+            # Fast path for ISO formatted text and datetime cells
+            parsed = pd.to_datetime(values, errors='coerce', format='ISO8601')
+            retry = parsed.isna() & values.notna()
+            if retry.any():
+                parsed = parsed.copy()
+                parsed[retry] = pd.to_datetime(values[retry], errors='coerce', format='mixed')
+        except (TypeError, ValueError):
+            parsed = None
+
+        if parsed is None or not pd.api.types.is_datetime64_any_dtype(parsed):
+            # Mixed timezones or odd cell types: parse each distinct value on its own
+            def parse_cell(value):
+                parsed_value = pd.to_datetime(value, errors='coerce')
+                if isinstance(parsed_value, pd.Timestamp) and parsed_value.tzinfo is not None:
+                    return parsed_value.tz_localize(None)
+                return parsed_value
+
+            parsed = pd.to_datetime(values.map(parse_cell), errors='coerce')
+
+    if getattr(parsed.dt, 'tz', None) is not None:
+        parsed = parsed.dt.tz_localize(None)
+    return parsed
+
+def days_since(dates, today_date):
+    """
+    Whole days from each date (parsed with parse_datetime_column) to today.
+    Future, blank and unparseable dates count as 0.
+    """
+    elapsed = (today_date - dates).dt.days
+    return elapsed.fillna(0).clip(lower=0).astype(int)
+
+def calculate_sla_status(df, today_date, due_dates=None):
+    """
+    Calculate SLA status for every ticket at once.
+    Tickets with a due date (parsed with parse_datetime_column) have crossed SLA
+    when the due date is before today; the rest fall back to 'Is Overdue'.
+    """
+    if 'Is Overdue' in df.columns:
+        crossed = df['Is Overdue'].eq(True).fillna(False).astype(bool)
+    else:
+        crossed = pd.Series(False, index=df.index)
+
+    if due_dates is not None:
+        has_due_date = due_dates.notna()
+        crossed = crossed.where(~has_due_date, due_dates < today_date)
+
+    return pd.Series(np.where(crossed, 'Crossed SLA', 'Within SLA'), index=df.index, dtype=object)
+
+def ticket_dates(df, column):
+    """Parsed date column, reusing the copy made by prepare_ticket_frame when there is one"""
+    parsed_column = PARSED_DATE_COLUMNS.get(column)
+    if parsed_column in df.columns:
+        return df[parsed_column]
+    return parse_datetime_column(df[column])
+
+@timed_stage
+def ticket_sla_status(df, today_date, use_due_date=False):
+    """
+    SLA status of every ticket, from 'Is Overdue' alone or overridden by the GitLab due date.
+    Reuses the status derived by prepare_ticket_frame when there is one.
+    """
+    prepared_column = 'Due_SLA_Status' if use_due_date else 'Overdue_SLA_Status'
+    if prepared_column in df.columns:
+        return df[prepared_column]
+    
+    if use_due_date and 'Gitlab Due date' in df.columns:
+        due_dates = ticket_dates(df, 'Gitlab Due date')
+    else:
+        due_dates = None
+    return calculate_sla_status(df, today_date, due_dates)
+
+def text_flag(values, text):
+    """
+    Case-insensitive substring flag of a text column (missing values never match).
+    Categorical columns test each category once and spread the result by code.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        category_flags = pd.Series(values.cat.categories, dtype=object).str.lower().str.contains(text, na=False)
+        # Code -1 (missing) picks the trailing False
+        flags = np.append(category_flags.to_numpy(dtype=bool), False)[values.cat.codes.to_numpy()]
+        return pd.Series(flags, index=values.index)
+    return values.str.lower().str.contains(text, na=False)
+
+def client_ticket_mask(df):
+    """Tickets of a client ticket group"""
+    if 'Client_Ticket' in df.columns:
+        return df['Client_Ticket']
+    return text_flag(df['Ticket Group'], 'client')
+
+def request_open_ticket_mask(df):
+    """Tickets classified as 'request open'"""
+    if 'Request_Open_Ticket' in df.columns:
+        return df['Request_Open_Ticket']
+    return text_flag(df['Classifications'], 'request open')
+
+def open_ticket_mask(df):
+    """Open tickets, leaving out waiting tickets classified as 'request open'"""
+    if 'Open_Ticket' in df.columns:
+        return df['Open_Ticket']
+    
+    status = df['Status (Ticket)']
+    mask = status.isin(OPEN_STATUSES)
+    if 'Classifications' in df.columns:
+        mask &= ~(status.isin(WAITING_STATUSES) & request_open_ticket_mask(df))
+    return mask
+
+def request_ticket_mask(df):
+    """Tickets classified as a request"""
+    if 'Request_Ticket' in df.columns:
+        return df['Request_Ticket']
+    return text_flag(df['Classifications'], 'request')
+
+def ticket_rows(tickets, columns):
+    """Rows of the given columns for every ticket, with '' for columns the export doesn't have"""
+    return tickets.reindex(columns=columns, fill_value='').astype(object).values.tolist()
+
+@timed_stage
+def prepare_ticket_frame(df):
+    """
+    Derive what the MIS builders share in one pass over the export:
+    parsed dates, both SLA statuses and the client/open/request ticket flags.
+    The builders pick these columns up instead of recomputing them.
+    """
+    tickets = df.copy()
+    today_date = get_today_date()
+    
+    for column, parsed_column in PARSED_DATE_COLUMNS.items():
+        if column in tickets.columns:
+            tickets[parsed_column] = parse_datetime_column(tickets[column])
+    
+    tickets['Overdue_SLA_Status'] = ticket_sla_status(tickets, today_date)
+    tickets['Due_SLA_Status'] = ticket_sla_status(tickets, today_date, use_due_date=True)
+    if 'Ticket Group' in tickets.columns:
+        tickets['Client_Ticket'] = client_ticket_mask(tickets)
+    if 'Classifications' in tickets.columns:
+        tickets['Request_Ticket'] = request_ticket_mask(tickets)
+        tickets['Request_Open_Ticket'] = request_open_ticket_mask(tickets)
+    if 'Status (Ticket)' in tickets.columns:
+        tickets['Open_Ticket'] = open_ticket_mask(tickets)
+    return tickets
+
+# Column headers of the SLA breakdown tables (after the dimension label)
+SLA_BREAKDOWN_HEADERS = ['Within SLA', 'Crossed SLA', 'Grand Total', 'Within SLA%', 'Crossed SLA%']
+CLOSED_BUG_BREAKDOWN_HEADERS = ['Closed Bug Within SLA', 'Closed Bug Crossed SLA', 'Total Closed Bugs', 'Within SLA%', 'Crossed SLA%']
+
+@timed_stage
+def count_sla_by_dimensions(df, dimensions):
+    """
+    Within/Crossed SLA ticket counts for each value of every dimension column.
+    The SLA masks are built once and every dimension is counted with a single
+    bincount over its factorized codes (tickets with no value are skipped).
+    """
+    within = df['SLA_Status'].eq('Within SLA').to_numpy()
+    crossed = df['SLA_Status'].eq('Crossed SLA').to_numpy()
+
+    counts = {}
+    for dimension in dimensions:
+        codes, values = pd.factorize(df[dimension], sort=True)
+        valid = codes >= 0
+        counts[dimension] = pd.DataFrame({
+            'Within SLA': np.bincount(codes[valid & within], minlength=len(values)),
+            'Crossed SLA': np.bincount(codes[valid & crossed], minlength=len(values))
+        }, index=pd.Index(values, name=dimension))
+        counts[dimension] = counts[dimension][counts[dimension].sum(axis=1) > 0]
+
+    return counts
+
+def sla_percentages(within, crossed, balanced=True):
+    """
+    Whole-number Within/Crossed SLA percentages for arrays of ticket counts.
+    Balanced percentages are rounded and adjusted so they add up to 100%;
+    otherwise they are truncated.
+    """
+    within = np.asarray(within, dtype=np.int64)
+    crossed = np.asarray(crossed, dtype=np.int64)
+    total = within + crossed
+    has_tickets = total > 0
+    safe_total = np.where(has_tickets, total, 1)
+
+    if balanced:
+        within_pct = np.where(has_tickets, np.round(within * 100 / safe_total), 0).astype(np.int64)
+        crossed_pct = np.where(has_tickets, np.round(crossed * 100 / safe_total), 0).astype(np.int64)
+        # Ensure percentages add up to 100%
+        within_pct = np.where(has_tickets & (within_pct + crossed_pct != 100), 100 - crossed_pct, within_pct)
+    else:
+        within_pct = np.where(has_tickets, within * 100 / safe_total, 0).astype(np.int64)
+        crossed_pct = np.where(has_tickets, crossed * 100 / safe_total, 0).astype(np.int64)
+
+    return within_pct, crossed_pct
+
+def build_sla_breakdown(counts, label, headers=SLA_BREAKDOWN_HEADERS, balanced=True):
+    """
+    Build a Within/Crossed/Total/percentage table with a Grand Total row
+    from the counts of one dimension (see count_sla_by_dimensions).
+    Balanced tables are sorted by Crossed SLA% (descending).
+    """
+    within = counts['Within SLA'].to_numpy(dtype=np.int64)
+    crossed = counts['Crossed SLA'].to_numpy(dtype=np.int64)
+    within_pct, crossed_pct = sla_percentages(within, crossed, balanced)
+
+    order = np.argsort(-crossed_pct, kind='stable') if balanced else np.arange(len(counts))
+    rows = [
+        [value, within_sla, crossed_sla, within_sla + crossed_sla, f"{within_pct_num}%", f"{crossed_pct_num}%"]
+        for value, within_sla, crossed_sla, within_pct_num, crossed_pct_num in zip(
+            counts.index[order], within[order].tolist(), crossed[order].tolist(),
+            within_pct[order].tolist(), crossed_pct[order].tolist()
+        )
+    ]
+
+    # Grand total
+    total_within = int(within.sum())
+    total_crossed = int(crossed.sum())
+    grand_within_pct, grand_crossed_pct = sla_percentages([total_within], [total_crossed], balanced)
+    rows.append([
+        'Grand Total', total_within, total_crossed, total_within + total_crossed,
+        f"{grand_within_pct[0]}%", f"{grand_crossed_pct[0]}%"
+    ])
+
+    return pd.DataFrame(rows, columns=[label] + list(headers))
+
+@timed_stage
+def generate_sla_breakdown_report(tickets, dimension, label, headers=SLA_BREAKDOWN_HEADERS, balanced=True):
+    """Generate a dimension wise SLA report"""
+    counts = count_sla_by_dimensions(tickets, [dimension])[dimension]
+    return build_sla_breakdown(counts, label, headers, balanced)
+
+@timed_stage
 def process_client_mis(df):
     """Process Client MIS - Generate program wise MIS with 3 sections each"""
     if 'Program Name' not in df.columns:
@@ -230,127 +1517,152 @@ def process_client_mis(df):
     
     # Filter only client tickets (exclude internal tickets)
     if 'Ticket Group' in df.columns:
-        client_df = df[df['Ticket Group'].str.lower().str.contains('client', na=False)].copy()
+        client_df = df[client_ticket_mask(df)].copy()
     else:
         return pd.DataFrame({'Error': ['Ticket Group column not found']})
     
     if client_df.empty:
         return pd.DataFrame({'Error': ['No client tickets found']})
     
-    # Get unique programs from client tickets only
-    programs = client_df['Program Name'].unique()
     program_reports = {}
+    today_date = get_today_date()
     
-    for program in programs:
-        # Filter data for this program only (already filtered for client tickets) and exclude CRs
-        program_df = client_df[
-            (client_df['Program Name'] == program) & 
-            (client_df['Status (Ticket)'] != 'Closed - Marked as request')
-        ].copy()
+    # Partition client tickets by program once (in order of first appearance)
+    for program, program_df in client_df.groupby('Program Name', sort=False, observed=True):
+        # Exclude CRs
+        program_df = program_df[program_df['Status (Ticket)'] != 'Closed - Marked as request'].copy()
         
         if program_df.empty:
             continue
-            
-        # Calculate SLA status
-        if 'Is Overdue' in program_df.columns:
-            program_df['SLA_Status'] = program_df['Is Overdue'].apply(
-                lambda x: 'Crossed SLA' if x == True else 'Within SLA'
-            )
-        else:
-            program_df['SLA_Status'] = 'Within SLA'
-        
-        # Generate 3 sections for this program
-        final_report = []
-        
-        # 1. Closed Tickets Section
-        final_report.append([f'{program} - Closed Tickets:'])
-        final_report.append([''])
-        closed_tickets = program_df[program_df['Status (Ticket)'] == 'Closed']
-        
-        if not closed_tickets.empty:
-            closed_report = generate_client_closed_report(closed_tickets, program)
-            final_report.extend(closed_report.values.tolist())
-        else:
-            final_report.append(['Client Name', 'Closed Tickets Within SLA', 'Closed Tickets Crossed SLA', 'Total Closed Tickets', 'Within SLA%', 'Crossed SLA%'])
-            final_report.append([program, 0, 0, 0, '0%', '0%'])
         
-        final_report.append([''])
-        final_report.append([''])
-        
-        # 2. Open Tickets Section
-        final_report.append([f'{program} - Open Tickets:'])
-        final_report.append([''])
-        open_statuses = ['Assigned to Engineer!', 'Reopened', 'Waiting Information From user - 1', 'Waiting Information From user - 2', 'Waiting Information From user - 3']
-        open_tickets = program_df[program_df['Status (Ticket)'].isin(open_statuses)]
-        
-        if not open_tickets.empty:
-            open_report = generate_client_open_report(open_tickets, program)
-            final_report.extend(open_report.values.tolist())
-        else:
-            final_report.append(['Client Name', 'Open tickets within SLA', 'Open Tickets Crossed SLA', 'Total Open Tickets', 'Within SLA%', 'Crossed SLA%'])
-            final_report.append([program, 0, 0, 0, '0%', '0%'])
-        
-        final_report.append([''])
-        final_report.append([''])
-        
-        # 3. Request Tickets Section
-        final_report.append([f'{program} - Request Tickets:'])
-        final_report.append([''])
-        request_report = generate_client_request_report(program_df, program)
-        final_report.extend(request_report.values.tolist())
-        
-        # Prepare raw data with specified columns
-        raw_data_columns = [
-            'Ticket Id', 'Status (Ticket)', 'Created Time (Ticket)', 'Due Date', 
-            'Email (Contact)', 'Priority (Ticket)', 'Program Name', 'Crossed Due Date', 
-            'Request Sub Category', 'Contact name'
-        ]
-        
-        # Map column names if needed
-        column_mapping = {
-            'Created Tim': 'Created Time (Ticket)',
-            'Account Name': 'Contact name'
-        }
-        
-        program_df_mapped = program_df.copy()
-        for old_name, new_name in column_mapping.items():
-            if old_name in program_df_mapped.columns and new_name not in program_df_mapped.columns:
-                program_df_mapped = program_df_mapped.rename(columns={old_name: new_name})
-        
-        # Select only available columns from the specified list
-        available_raw_columns = [col for col in raw_data_columns if col in program_df_mapped.columns]
-        base_raw_data = program_df_mapped[available_raw_columns].copy()
-        
-        # Use Program Name as Client Name in raw data
-        if 'Program Name' in base_raw_data.columns:
-            base_raw_data = base_raw_data.rename(columns={'Program Name': 'Client Name'})
-        
-        # Separate data by ticket type
-        closed_data = base_raw_data[base_raw_data['Status (Ticket)'] == 'Closed'].copy()
-        
-        open_statuses = ['Assigned to Engineer!', 'Reopened', 'Waiting Information From user - 1', 'Waiting Information From user - 2', 'Waiting Information From user - 3']
-        open_data = base_raw_data[base_raw_data['Status (Ticket)'].isin(open_statuses)].copy()
-        
-        # Filter request tickets based on Classifications column, excluding only 'Closed - Marked as request'
-        if 'Classifications' in program_df_mapped.columns:
-            request_filter = (
-                program_df_mapped['Classifications'].str.lower().str.contains('request', na=False) &
-                (program_df_mapped['Status (Ticket)'] != 'Closed - Marked as request')
-            )
-            request_data = base_raw_data[request_filter].copy()
-        else:
-            # If no Classifications column, exclude only 'Closed - Marked as request'
-            request_data = base_raw_data[base_raw_data['Status (Ticket)'] != 'Closed - Marked as request'].copy()
-        
-        program_reports[program] = {
-            'mis_report': pd.DataFrame(final_report),
-            'open_data': open_data,
-            'closed_data': closed_data,
-            'request_data': request_data
-        }
+        program_reports[program] = build_client_program_report(program, program_df, today_date)
     
     return program_reports
 
+@timed_stage
+def build_client_program_report(program, program_df, today_date):
+    """Build the MIS report and raw data sheets of one program (CRs already excluded)"""
+    # Calculate SLA status
+    program_df['SLA_Status'] = ticket_sla_status(program_df, today_date)
+    
+    # Generate 3 sections for this program
+    final_report = []
+    
+    # 1. Closed Tickets Section
+    final_report.append([f'{program} - Closed Tickets:'])
+    final_report.append([''])
+    closed_tickets = program_df[program_df['Status (Ticket)'] == 'Closed']
+    
+    if not closed_tickets.empty:
+        closed_report = generate_client_closed_report(closed_tickets, program)
+        final_report.extend(closed_report.values.tolist())
+    else:
+        final_report.append(['Client Name', 'Closed Tickets Within SLA', 'Closed Tickets Crossed SLA', 'Total Closed Tickets', 'Within SLA%', 'Crossed SLA%'])
+        final_report.append([program, 0, 0, 0, '0%', '0%'])
+    
+    final_report.append([''])
+    final_report.append([''])
+    
+    # 2. Open Tickets Section
+    final_report.append([f'{program} - Open Tickets:'])
+    final_report.append([''])
+    open_tickets = program_df[program_df['Status (Ticket)'].isin(OPEN_STATUSES)]
+    
+    if not open_tickets.empty:
+        open_report = generate_client_open_report(open_tickets, program)
+        final_report.extend(open_report.values.tolist())
+    else:
+        final_report.append(['Client Name', 'Open tickets within SLA', 'Open Tickets Crossed SLA', 'Total Open Tickets', 'Within SLA%', 'Crossed SLA%'])
+        final_report.append([program, 0, 0, 0, '0%', '0%'])
+    
+    final_report.append([''])
+    final_report.append([''])
+    
+    # 3. Request Tickets Section
+    final_report.append([f'{program} - Request Tickets:'])
+    final_report.append([''])
+    request_report = generate_client_request_report(program_df, program)
+    final_report.extend(request_report.values.tolist())
+    
+    # Prepare raw data with specified columns
+    
+    # Map column names if needed
+    column_mapping = {
+        'Created Tim': 'Created Time (Ticket)',
+        'Account Name': 'Contact name'
+    }
+    
+    program_df_mapped = program_df.copy()
+    for old_name, new_name in column_mapping.items():
+        if old_name in program_df_mapped.columns and new_name not in program_df_mapped.columns:
+            program_df_mapped = program_df_mapped.rename(columns={old_name: new_name})
+    
+    # Select only available columns from the specified list
+    available_raw_columns = [col for col in CLIENT_RAW_DATA_COLUMNS if col in program_df_mapped.columns]
+    base_raw_data = program_df_mapped[available_raw_columns].copy()
+    
+    # Use Program Name as Client Name in raw data
+    if 'Program Name' in base_raw_data.columns:
+        base_raw_data = base_raw_data.rename(columns={'Program Name': 'Client Name'})
+    
+    # Separate data by ticket type
+    closed_data = base_raw_data[base_raw_data['Status (Ticket)'] == 'Closed'].copy()
+    
+    open_data = base_raw_data[base_raw_data['Status (Ticket)'].isin(OPEN_STATUSES)].copy()
+    
+    # Filter request tickets based on Classifications column, excluding only 'Closed - Marked as request'
+    if 'Classifications' in program_df_mapped.columns:
+        request_filter = (
+            request_ticket_mask(program_df_mapped) &
+            (program_df_mapped['Status (Ticket)'] != 'Closed - Marked as request')
+        )
+        request_data = base_raw_data[request_filter].copy()
+    else:
+        # If no Classifications column, exclude only 'Closed - Marked as request'
+        request_data = base_raw_data[base_raw_data['Status (Ticket)'] != 'Closed - Marked as request'].copy()
+    
+    return {
+        'mis_report': pd.DataFrame(final_report),
+        'open_data': open_data,
+        'closed_data': closed_data,
+        'request_data': request_data
+    }
+
+def write_client_program_workbook(program_data):
+    """Serialize one program's Client MIS into an Excel workbook"""
+    return write_xlsx([
+        # MIS report
+        excel_sheet('Client_MIS', program_data['mis_report'], header=False),
+        # Separate sheets for different ticket types
+        excel_sheet('Open_Tickets', program_data['open_data']),
+        excel_sheet('Closed_Tickets', program_data['closed_data']),
+        excel_sheet('Request_Tickets', program_data['request_data'])
+    ])
+
+def write_client_program_workbooks(program_reports):
+    """
+    Serialize every program's workbook, in a process pool sized to the CPU count.
+    Yields (program, workbook bytes) as each workbook finishes.
+    """
+    pending = dict(program_reports)
+    workers = min(os.cpu_count() or 1, len(pending))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(write_client_program_workbook, program_data): program for program, program_data in pending.items()}
+                for future in as_completed(futures):
+                    program = futures[future]
+                    workbook = future.result()
+                    del pending[program]
+                    yield program, workbook
+        except (BrokenProcessPool, pickle.PicklingError, OSError):
+            # Workers unavailable (e.g. no fork support): finish the remaining programs here
+            pass
+    
+    for program, program_data in pending.items():
+        yield program, write_client_program_workbook(program_data)
+
+@timed_stage
 def process_request_ticket_closed_mis(df):
     """Process Request Ticket Closed MIS"""
     if 'Status (Ticket)' not in df.columns:
@@ -361,10 +1673,11 @@ def process_request_ticket_closed_mis(df):
     if closed_tickets.empty:
         return pd.DataFrame({'Message': ['No closed request tickets found']})
     
-    summary = closed_tickets.groupby(['Select Engineer', 'Priority (Ticket)']).size().unstack(fill_value=0)
+    summary = closed_tickets.groupby(['Select Engineer', 'Priority (Ticket)'], observed=True).size().unstack(fill_value=0)
     summary['Total'] = summary.sum(axis=1)
     return summary.reset_index()
 
+@timed_stage
 def process_bug_ticket_closed_mis(df):
     """Process Bug Ticket Closed MIS - similar to Open Ticket MIS but for closed bug tickets"""
     # Debug: show available columns
@@ -382,14 +1695,8 @@ def process_bug_ticket_closed_mis(df):
     if closed_bug_tickets.empty:
         return pd.DataFrame({'Error': ['No closed bug tickets found']})
     
-    # Calculate SLA status (check if Is Overdue column exists)
-    if 'Is Overdue' in closed_bug_tickets.columns:
-        closed_bug_tickets['SLA_Status'] = closed_bug_tickets['Is Overdue'].apply(
-            lambda x: 'Crossed SLA' if x == True else 'Within SLA'
-        )
-    else:
-        # If no Is Overdue column, assume all are within SLA
-        closed_bug_tickets['SLA_Status'] = 'Within SLA'
+    # Calculate SLA status from Is Overdue (all within SLA if the column is missing)
+    closed_bug_tickets['SLA_Status'] = ticket_sla_status(closed_bug_tickets, get_today_date())
     
     # Generate all three reports
     module_lead_report = generate_bug_module_lead_report(closed_bug_tickets)
@@ -415,227 +1722,65 @@ def process_bug_ticket_closed_mis(df):
     
     return pd.DataFrame(final_report)
 
+@timed_stage
 def generate_bug_module_lead_report(closed_bug_tickets):
     """Generate Module Lead wise report for closed bug tickets"""
-    report = closed_bug_tickets.groupby(['Module Lead', 'SLA_Status']).size().unstack(fill_value=0)
-    
-    result = []
-    result.append(['Module Lead', 'Closed Bug Within SLA', 'Closed Bug Crossed SLA', 'Total Closed Bugs', 'Within SLA%', 'Crossed SLA%'])
-    
-    total_within = 0
-    total_crossed = 0
-    
-    for module_lead in report.index:
-        within_sla = report.loc[module_lead, 'Within SLA'] if 'Within SLA' in report.columns else 0
-        crossed_sla = report.loc[module_lead, 'Crossed SLA'] if 'Crossed SLA' in report.columns else 0
-        total = within_sla + crossed_sla
-        
-        within_pct = f"{int(within_sla * 100 / total)}%" if total > 0 else "0%"
-        crossed_pct = f"{int(crossed_sla * 100 / total)}%" if total > 0 else "0%"
-        
-        result.append([module_lead, within_sla, crossed_sla, total, within_pct, crossed_pct])
-        
-        total_within += within_sla
-        total_crossed += crossed_sla
-    
-    # Grand total
-    grand_total = total_within + total_crossed
-    within_pct = f"{int(total_within * 100 / grand_total)}%" if grand_total > 0 else "0%"
-    crossed_pct = f"{int(total_crossed * 100 / grand_total)}%" if grand_total > 0 else "0%"
-    result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-    
-    return pd.DataFrame(result[1:], columns=result[0])
+    return generate_sla_breakdown_report(closed_bug_tickets, 'Module Lead', 'Module Lead', CLOSED_BUG_BREAKDOWN_HEADERS, balanced=False)
 
+@timed_stage
 def generate_bug_client_report(closed_bug_tickets):
     """Generate Client wise report for closed bug tickets"""
     # Use Program Name as Client Name
-    report = closed_bug_tickets.groupby(['Program Name', 'SLA_Status']).size().unstack(fill_value=0)
-    
-    result = []
-    result.append(['Client Name', 'Closed Bug Within SLA', 'Closed Bug Crossed SLA', 'Total Closed Bugs', 'Within SLA%', 'Crossed SLA%'])
-    
-    total_within = 0
-    total_crossed = 0
-    
-    for client in report.index:
-        within_sla = report.loc[client, 'Within SLA'] if 'Within SLA' in report.columns else 0
-        crossed_sla = report.loc[client, 'Crossed SLA'] if 'Crossed SLA' in report.columns else 0
-        total = within_sla + crossed_sla
-        
-        within_pct = f"{int(within_sla * 100 / total)}%" if total > 0 else "0%"
-        crossed_pct = f"{int(crossed_sla * 100 / total)}%" if total > 0 else "0%"
-        
-        result.append([client, within_sla, crossed_sla, total, within_pct, crossed_pct])
-        
-        total_within += within_sla
-        total_crossed += crossed_sla
-    
-    # Grand total
-    grand_total = total_within + total_crossed
-    within_pct = f"{int(total_within * 100 / grand_total)}%" if grand_total > 0 else "0%"
-    crossed_pct = f"{int(total_crossed * 100 / grand_total)}%" if grand_total > 0 else "0%"
-    result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-    
-    return pd.DataFrame(result[1:], columns=result[0])
+    return generate_sla_breakdown_report(closed_bug_tickets, 'Program Name', 'Client Name', CLOSED_BUG_BREAKDOWN_HEADERS, balanced=False)
 
+@timed_stage
 def generate_bug_engineer_report(closed_bug_tickets):
     """Generate Engineer wise report for closed bug tickets"""
-    report = closed_bug_tickets.groupby(['Select Engineer', 'SLA_Status']).size().unstack(fill_value=0)
-    
-    result = []
-    result.append(['Engineer', 'Closed Bug Within SLA', 'Closed Bug Crossed SLA', 'Total Closed Bugs', 'Within SLA%', 'Crossed SLA%'])
-    
-    total_within = 0
-    total_crossed = 0
-    
-    for engineer in report.index:
-        within_sla = report.loc[engineer, 'Within SLA'] if 'Within SLA' in report.columns else 0
-        crossed_sla = report.loc[engineer, 'Crossed SLA'] if 'Crossed SLA' in report.columns else 0
-        total = within_sla + crossed_sla
-        
-        within_pct = f"{int(within_sla * 100 / total)}%" if total > 0 else "0%"
-        crossed_pct = f"{int(crossed_sla * 100 / total)}%" if total > 0 else "0%"
-        
-        result.append([engineer, within_sla, crossed_sla, total, within_pct, crossed_pct])
-        
-        total_within += within_sla
-        total_crossed += crossed_sla
-    
-    # Grand total
-    grand_total = total_within + total_crossed
-    within_pct = f"{int(total_within * 100 / grand_total)}%" if grand_total > 0 else "0%"
-    crossed_pct = f"{int(total_crossed * 100 / grand_total)}%" if grand_total > 0 else "0%"
-    result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-    
-    return pd.DataFrame(result[1:], columns=result[0])
+    return generate_sla_breakdown_report(closed_bug_tickets, 'Select Engineer', 'Engineer', CLOSED_BUG_BREAKDOWN_HEADERS, balanced=False)
 
+@timed_stage
 def process_jagan_mis(df):
     """Process Jagan's MIS with 4 specific sections"""
-    import datetime
-    
     # Check required columns
     if 'Status (Ticket)' not in df.columns:
         return pd.DataFrame({'Error': ['Status (Ticket) column not found']})
     
-    # Filter open tickets with all specified statuses
-    open_statuses = [
-        'Assigned to Engineer!',
-        'Reopened',
-        'Waiting Information From user - 1',
-        'Waiting Information From user - 2',
-        'Waiting Information From user - 3'
-    ]
-    open_tickets = df[df['Status (Ticket)'].isin(open_statuses)].copy()
-    
-    # Only exclude tickets that are in waiting status AND classified as 'request open'
-    waiting_statuses = [
-        'Waiting Information From user - 1',
-        'Waiting Information From user - 2',
-        'Waiting Information From user - 3'
-    ]
-    
-    if 'Classifications' in open_tickets.columns:
-        # Remove tickets that are both in waiting status AND classified as request open
-        exclude_condition = (
-            open_tickets['Status (Ticket)'].isin(waiting_statuses) & 
-            (open_tickets['Classifications'].str.lower().str.contains('request open', na=False))
-        )
-        open_tickets = open_tickets[~exclude_condition]
+    # Filter open tickets, excluding waiting tickets classified as 'request open'
+    open_tickets = df[open_ticket_mask(df)].copy()
     
     if open_tickets.empty:
         return pd.DataFrame({'Error': ['No open tickets found']})
     
     # Calculate days from creation
-    today_date = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_date = get_today_date()
     
     # Calculate SLA status based on Gitlab due date
-    def calculate_sla_status_jagan(row):
-        if 'Gitlab Due date' in open_tickets.columns and pd.notna(row.get('Gitlab Due date')):
-            try:
-                gitlab_due = pd.to_datetime(row['Gitlab Due date'], errors='coerce')
-                if pd.notna(gitlab_due):
-                    return 'Crossed SLA' if today_date.date() > gitlab_due.date() else 'Within SLA'
-            except:
-                pass
-        # Fallback to Is Overdue if Gitlab due date not available
-        if 'Is Overdue' in open_tickets.columns:
-            return 'Crossed SLA' if row.get('Is Overdue') == True else 'Within SLA'
-        return 'Within SLA'
-    
-    open_tickets['SLA_Status'] = open_tickets.apply(calculate_sla_status_jagan, axis=1)
+    open_tickets['SLA_Status'] = ticket_sla_status(open_tickets, today_date, use_due_date=True)
     
     # Sort by creation date (ascending) to show oldest tickets first
-    if 'Created Time (Ticket)' in open_tickets.columns:
-        open_tickets['Created_Date_Sort'] = pd.to_datetime(open_tickets['Created Time (Ticket)'], errors='coerce')
-        open_tickets = open_tickets.sort_values('Created_Date_Sort', ascending=True)
-        open_tickets = open_tickets.drop('Created_Date_Sort', axis=1)
-    
-    def calculate_days_diff(created_date):
-        try:
-            if pd.isna(created_date):
-                return 0
-            created_dt = pd.to_datetime(created_date, errors='coerce')
-            if pd.isna(created_dt):
-                return 0
-            return max(0, (today_date - created_dt).days)
-        except:
-            return 0
-    
     created_col = 'Created Time (Ticket)'
     if created_col in open_tickets.columns:
-        open_tickets['Days_Crossed'] = open_tickets[created_col].apply(calculate_days_diff)
+        # The sort parses the column with one inferred format (so day-first text dates stay day-first);
+        # the day counts parse each date on its own
+        open_tickets['Created_Date_Sort'] = pd.to_datetime(open_tickets[created_col], errors='coerce')
+        open_tickets = open_tickets.sort_values('Created_Date_Sort', ascending=True)
+        open_tickets['Days_Crossed'] = days_since(ticket_dates(open_tickets, created_col), today_date)
+        open_tickets = open_tickets.drop('Created_Date_Sort', axis=1)
     else:
         open_tickets['Days_Crossed'] = 0
     
     final_report = []
     
+    # Count Within/Crossed SLA for every dimension in one pass
+    dimensions = ['Department Name', 'Module Lead', 'Program Name', 'Select Engineer']
+    dimensions += [col for col in ['Product OR PS Ticket', 'Ticket Group', 'Priority (Ticket)'] if col in open_tickets.columns]
+    sla_counts = count_sla_by_dimensions(open_tickets, dimensions)
+    
     # 1. Department wise SLA status for open tickets
     final_report.append(['DEPARTMENT WISE SLA STATUS - OPEN TICKETS'])
-    dept_report = open_tickets.groupby(['Department Name', 'SLA_Status']).size().unstack(fill_value=0)
-    
-    result = []
-    result.append(['Department Name', 'Within SLA', 'Crossed SLA', 'Grand Total', 'Within SLA%', 'Crossed SLA%'])
-    
-    total_within = 0
-    total_crossed = 0
-    data_rows = []
-    
-    for dept in dept_report.index:
-        within_sla = dept_report.loc[dept, 'Within SLA'] if 'Within SLA' in dept_report.columns else 0
-        crossed_sla = dept_report.loc[dept, 'Crossed SLA'] if 'Crossed SLA' in dept_report.columns else 0
-        total = within_sla + crossed_sla
-        
-        within_pct_num = round(within_sla * 100 / total) if total > 0 else 0
-        crossed_pct_num = round(crossed_sla * 100 / total) if total > 0 else 0
-        # Ensure percentages add up to 100%
-        if total > 0 and within_pct_num + crossed_pct_num != 100:
-            within_pct_num = 100 - crossed_pct_num
-        within_pct = f"{within_pct_num}%"
-        crossed_pct = f"{crossed_pct_num}%"
-        
-        data_rows.append([dept, within_sla, crossed_sla, total, within_pct, crossed_pct, crossed_pct_num])
-        
-        total_within += within_sla
-        total_crossed += crossed_sla
-    
-    # Sort by crossed SLA percentage (descending)
-    data_rows.sort(key=lambda x: x[6], reverse=True)
-    
-    # Add sorted rows (without the sort key)
-    for row in data_rows:
-        result.append(row[:6])
-    
-    # Grand total
-    grand_total = total_within + total_crossed
-    within_pct_num = round(total_within * 100 / grand_total) if grand_total > 0 else 0
-    crossed_pct_num = round(total_crossed * 100 / grand_total) if grand_total > 0 else 0
-    if grand_total > 0 and within_pct_num + crossed_pct_num != 100:
-        within_pct_num = 100 - crossed_pct_num
-    within_pct = f"{within_pct_num}%"
-    crossed_pct = f"{crossed_pct_num}%"
-    result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-    
-    final_report.extend(result)
+    dept_report = build_sla_breakdown(sla_counts['Department Name'], 'Department Name')
+    final_report.append(dept_report.columns.tolist())
+    final_report.extend(dept_report.values.tolist())
     final_report.append([''])
     
     # 2. Tickets that crossed SLA with GitLab links
@@ -646,14 +1791,7 @@ def process_jagan_mis(df):
         header = ['Gitlab Link', 'Select Engineer', 'Program Name', 'Department Name']
         final_report.append(header)
         
-        for _, ticket in crossed_sla_tickets.iterrows():
-            row = [
-                ticket.get('Gitlab Link', ''),
-                ticket.get('Select Engineer', ''),
-                ticket.get('Program Name', ''),
-                ticket.get('Department Name', '')
-            ]
-            final_report.append(row)
+        final_report.extend(ticket_rows(crossed_sla_tickets, header))
     else:
         final_report.append(['No tickets crossed SLA'])
     
@@ -664,8 +1802,7 @@ def process_jagan_mis(df):
     
     # Check if Gitlab Due date column exists and filter tickets due today
     if 'Gitlab Due date' in open_tickets.columns:
-        today_str = today_date.strftime('%Y-%m-%d')
-        # Convert GitLab due date to datetime and compare with today
+        # Convert GitLab due date to datetime (one inferred format for the column) and compare with today
         due_today = open_tickets[
             pd.to_datetime(open_tickets['Gitlab Due date'], errors='coerce').dt.date == today_date.date()
         ]
@@ -674,14 +1811,7 @@ def process_jagan_mis(df):
             header = ['Gitlab Link', 'Select Engineer', 'Program Name', 'Department Name']
             final_report.append(header)
             
-            for _, ticket in due_today.iterrows():
-                row = [
-                    ticket.get('Gitlab Link', ''),
-                    ticket.get('Select Engineer', ''),
-                    ticket.get('Program Name', ''),
-                    ticket.get('Department Name', '')
-                ]
-                final_report.append(row)
+            final_report.extend(ticket_rows(due_today, header))
         else:
             final_report.append(['No tickets due today'])
     else:
@@ -710,70 +1840,28 @@ def process_jagan_mis(df):
     # Add existing Open Ticket MIS reports
     # 5. Module Lead wise report
     final_report.append(['MODULE LEAD WISE REPORT'])
-    module_lead_report = generate_module_lead_report(open_tickets)
+    module_lead_report = build_sla_breakdown(sla_counts['Module Lead'], 'Module Lead')
     final_report.extend(module_lead_report.values.tolist())
     final_report.append([''])
     
     # 6. Client wise report
     final_report.append(['CLIENT WISE REPORT'])
-    client_report = generate_client_report(open_tickets)
+    client_report = build_sla_breakdown(sla_counts['Program Name'], 'Client Name')
     final_report.extend(client_report.values.tolist())
     final_report.append([''])
     
     # 7. Engineer wise report
     final_report.append(['ENGINEER WISE REPORT'])
-    engineer_report = generate_engineer_report(open_tickets)
+    engineer_report = build_sla_breakdown(sla_counts['Select Engineer'], 'Engineer')
     final_report.extend(engineer_report.values.tolist())
     final_report.append([''])
     
     # 8. Product/PS wise report
     final_report.append(['PRODUCT/PS WISE REPORT'])
     if 'Product OR PS Ticket' in open_tickets.columns:
-        ps_report = open_tickets.groupby(['Product OR PS Ticket', 'SLA_Status']).size().unstack(fill_value=0)
-        
-        result = []
-        result.append(['Product OR PS Ticket', 'Within SLA', 'Crossed SLA', 'Grand Total', 'Within SLA%', 'Crossed SLA%'])
-        
-        total_within = 0
-        total_crossed = 0
-        data_rows = []
-        
-        for ps_type in ps_report.index:
-            within_sla = ps_report.loc[ps_type, 'Within SLA'] if 'Within SLA' in ps_report.columns else 0
-            crossed_sla = ps_report.loc[ps_type, 'Crossed SLA'] if 'Crossed SLA' in ps_report.columns else 0
-            total = within_sla + crossed_sla
-            
-            within_pct_num = round(within_sla * 100 / total) if total > 0 else 0
-            crossed_pct_num = round(crossed_sla * 100 / total) if total > 0 else 0
-            # Ensure percentages add up to 100%
-            if total > 0 and within_pct_num + crossed_pct_num != 100:
-                within_pct_num = 100 - crossed_pct_num
-            within_pct = f"{within_pct_num}%"
-            crossed_pct = f"{crossed_pct_num}%"
-            
-            data_rows.append([ps_type, within_sla, crossed_sla, total, within_pct, crossed_pct, crossed_pct_num])
-            
-            total_within += within_sla
-            total_crossed += crossed_sla
-        
-        # Sort by crossed SLA percentage (descending)
-        data_rows.sort(key=lambda x: x[6], reverse=True)
-        
-        # Add sorted rows (without the sort key)
-        for row in data_rows:
-            result.append(row[:6])
-        
-        # Grand total
-        grand_total = total_within + total_crossed
-        within_pct_num = round(total_within * 100 / grand_total) if grand_total > 0 else 0
-        crossed_pct_num = round(total_crossed * 100 / grand_total) if grand_total > 0 else 0
-        if grand_total > 0 and within_pct_num + crossed_pct_num != 100:
-            within_pct_num = 100 - crossed_pct_num
-        within_pct = f"{within_pct_num}%"
-        crossed_pct = f"{crossed_pct_num}%"
-        result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-        
-        final_report.extend(result)
+        ps_report = build_sla_breakdown(sla_counts['Product OR PS Ticket'], 'Product OR PS Ticket')
+        final_report.append(ps_report.columns.tolist())
+        final_report.extend(ps_report.values.tolist())
     else:
         final_report.append(['Product OR PS Ticket column not found'])
     
@@ -782,51 +1870,9 @@ def process_jagan_mis(df):
     # 9. Ticket Group wise report
     final_report.append(['TICKET GROUP WISE REPORT'])
     if 'Ticket Group' in open_tickets.columns:
-        tg_report = open_tickets.groupby(['Ticket Group', 'SLA_Status']).size().unstack(fill_value=0)
-        
-        result = []
-        result.append(['Ticket Group', 'Within SLA', 'Crossed SLA', 'Grand Total', 'Within SLA%', 'Crossed SLA%'])
-        
-        total_within = 0
-        total_crossed = 0
-        data_rows = []
-        
-        for group in tg_report.index:
-            within_sla = tg_report.loc[group, 'Within SLA'] if 'Within SLA' in tg_report.columns else 0
-            crossed_sla = tg_report.loc[group, 'Crossed SLA'] if 'Crossed SLA' in tg_report.columns else 0
-            total = within_sla + crossed_sla
-            
-            within_pct_num = round(within_sla * 100 / total) if total > 0 else 0
-            crossed_pct_num = round(crossed_sla * 100 / total) if total > 0 else 0
-            # Ensure percentages add up to 100%
-            if total > 0 and within_pct_num + crossed_pct_num != 100:
-                within_pct_num = 100 - crossed_pct_num
-            within_pct = f"{within_pct_num}%"
-            crossed_pct = f"{crossed_pct_num}%"
-            
-            data_rows.append([group, within_sla, crossed_sla, total, within_pct, crossed_pct, crossed_pct_num])
-            
-            total_within += within_sla
-            total_crossed += crossed_sla
-        
-        # Sort by crossed SLA percentage (descending)
-        data_rows.sort(key=lambda x: x[6], reverse=True)
-        
-        # Add sorted rows (without the sort key)
-        for row in data_rows:
-            result.append(row[:6])
-        
-        # Grand total
-        grand_total = total_within + total_crossed
-        within_pct_num = round(total_within * 100 / grand_total) if grand_total > 0 else 0
-        crossed_pct_num = round(total_crossed * 100 / grand_total) if grand_total > 0 else 0
-        if grand_total > 0 and within_pct_num + crossed_pct_num != 100:
-            within_pct_num = 100 - crossed_pct_num
-        within_pct = f"{within_pct_num}%"
-        crossed_pct = f"{crossed_pct_num}%"
-        result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-        
-        final_report.extend(result)
+        tg_report = build_sla_breakdown(sla_counts['Ticket Group'], 'Ticket Group')
+        final_report.append(tg_report.columns.tolist())
+        final_report.extend(tg_report.values.tolist())
     else:
         final_report.append(['Ticket Group column not found'])
     
@@ -835,51 +1881,9 @@ def process_jagan_mis(df):
     # 10. Priority wise report
     final_report.append(['PRIORITY WISE REPORT'])
     if 'Priority (Ticket)' in open_tickets.columns:
-        priority_report = open_tickets.groupby(['Priority (Ticket)', 'SLA_Status']).size().unstack(fill_value=0)
-        
-        result = []
-        result.append(['Priority (Ticket)', 'Within SLA', 'Crossed SLA', 'Grand Total', 'Within SLA%', 'Crossed SLA%'])
-        
-        total_within = 0
-        total_crossed = 0
-        data_rows = []
-        
-        for priority in priority_report.index:
-            within_sla = priority_report.loc[priority, 'Within SLA'] if 'Within SLA' in priority_report.columns else 0
-            crossed_sla = priority_report.loc[priority, 'Crossed SLA'] if 'Crossed SLA' in priority_report.columns else 0
-            total = within_sla + crossed_sla
-            
-            within_pct_num = round(within_sla * 100 / total) if total > 0 else 0
-            crossed_pct_num = round(crossed_sla * 100 / total) if total > 0 else 0
-            # Ensure percentages add up to 100%
-            if total > 0 and within_pct_num + crossed_pct_num != 100:
-                within_pct_num = 100 - crossed_pct_num
-            within_pct = f"{within_pct_num}%"
-            crossed_pct = f"{crossed_pct_num}%"
-            
-            data_rows.append([priority, within_sla, crossed_sla, total, within_pct, crossed_pct, crossed_pct_num])
-            
-            total_within += within_sla
-            total_crossed += crossed_sla
-        
-        # Sort by crossed SLA percentage (descending)
-        data_rows.sort(key=lambda x: x[6], reverse=True)
-        
-        # Add sorted rows (without the sort key)
-        for row in data_rows:
-            result.append(row[:6])
-        
-        # Grand total
-        grand_total = total_within + total_crossed
-        within_pct_num = round(total_within * 100 / grand_total) if grand_total > 0 else 0
-        crossed_pct_num = round(total_crossed * 100 / grand_total) if grand_total > 0 else 0
-        if grand_total > 0 and within_pct_num + crossed_pct_num != 100:
-            within_pct_num = 100 - crossed_pct_num
-        within_pct = f"{within_pct_num}%"
-        crossed_pct = f"{crossed_pct_num}%"
-        result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-        
-        final_report.extend(result)
+        priority_report = build_sla_breakdown(sla_counts['Priority (Ticket)'], 'Priority (Ticket)')
+        final_report.append(priority_report.columns.tolist())
+        final_report.extend(priority_report.values.tolist())
     else:
         final_report.append(['Priority (Ticket) column not found'])
     
@@ -893,31 +1897,487 @@ def process_jagan_mis(df):
     final_report.append(header)
     
     # Add all open tickets data
-    for _, ticket in open_tickets.iterrows():
-        row = [
-            ticket.get('Gitlab Link', ''),
-            ticket.get('Select Engineer', ''),
-            ticket.get('Module Lead', ''),
-            ticket.get('Ticket Group', ''),
-            ticket.get('Product OR PS Ticket', ''),
-            ticket.get('Program Name', ''),
-            ticket.get('Department Name', ''),
-            ticket.get('Subject', '')
+    final_report.extend(ticket_rows(open_tickets, header))
+    
+    return pd.DataFrame(final_report)
+
+# Number of clusters listed under TOP RECURRING ISSUES ANALYSIS
+RECURRING_TOP_ISSUES = 25
+# Recurring issue clustering thresholds
+BASE_SIMILARITY_THRESHOLD = 0.65  # Lower threshold for better recall
+SHORT_TEXT_SIMILARITY_THRESHOLD = 0.75  # Higher threshold for short texts
+SHORT_TEXT_LENGTH = 50
+SEQUENCE_WEIGHT = 0.6
+WORD_WEIGHT = 0.4
+
+# Variable parts of ticket texts replaced by placeholders, applied in this order
+TEXT_NORMALIZATIONS = [
+    (re.compile(r'\b[a-z]{2,4}-\d+\b'), '[ticket_id]'),  # Ticket IDs
+    (re.compile(r'\b[a-z0-9]{8,20}\b'), '[reference]'),  # Reference numbers
+    (re.compile(r'\b\d{10,12}\b'), '[phone]'),  # Phone numbers
+    (re.compile(r'\b[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}\b'), '[email]'),  # Emails
+    (re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'), '[date]'),  # Dates
+    (re.compile(r'[₹$€£]\s*\d+[.,]?\d*'), '[amount]'),  # Currency amounts
+    (re.compile(r'\b\d{4,}\b'), '[number]'),  # Large numbers
+    (re.compile(r'version\s*\d+\.\d+'), 'version [x.x]')  # Version numbers
+]
+WHITESPACE_RUN = re.compile(r'\s+')
+
+# Key error terms; the first one found is moved to the front of the text
+ERROR_PATTERNS = [
+    'error', 'failed', 'timeout', 'connection', 'unable', 'cannot',
+    'invalid', 'missing', 'not found', 'access denied', 'permission',
+    'server', 'database', 'network', 'api', 'sync', 'login', 'password'
+]
+
+def normalize_text(text):
+    """Enhanced text normalization with better pattern recognition"""
+    if pd.isna(text):
+        return ''
+    text = str(text).lower().strip()
+    
+    # Remove common variable data but preserve meaningful patterns
+    for pattern, placeholder in TEXT_NORMALIZATIONS:
+        text = pattern.sub(placeholder, text)
+    text = WHITESPACE_RUN.sub(' ', text).strip()
+    
+    # Preserve important technical terms
+    for pattern in ERROR_PATTERNS:
+        if pattern in text:
+            text = f"{pattern} {text}"
+            break
+            
+    return text[:200]  # Limit length for better matching
+
+def normalize_texts(values):
+    """normalize_text of every value in a Series, computed once per distinct value"""
+    codes, uniques = pd.factorize(values)
+    normalized = np.array([normalize_text(value) for value in uniques] + [''], dtype=object)
+    # Code -1 (missing) picks the trailing ''
+    return pd.Series(normalized[codes], index=values.index)
+
+def enhanced_similarity(a, b):
+    """Enhanced similarity function with weighted scoring"""
+    # Basic sequence similarity
+    seq_sim = SequenceMatcher(None, a, b).ratio()
+
+    # Word-based similarity for better semantic matching
+    words_a = set(a.split())
+    words_b = set(b.split())
+
+    if len(words_a) == 0 or len(words_b) == 0:
+        return seq_sim
+
+    word_sim = len(words_a.intersection(words_b)) / len(words_a.union(words_b))
+
+    # Weighted combination
+    return (seq_sim * SEQUENCE_WEIGHT) + (word_sim * WORD_WEIGHT)
+
+def similarity_threshold(text):
+    """Adaptive threshold based on text length"""
+    if len(text) < SHORT_TEXT_LENGTH:
+        return SHORT_TEXT_SIMILARITY_THRESHOLD
+    return BASE_SIMILARITY_THRESHOLD
+
+def min_word_similarity(threshold):
+    """
+    Lowest word (Jaccard) similarity that can still reach the threshold.
+    Sequence similarity is at most 1, so the word part has to make up the rest.
+    A small margin keeps the bound safe against float rounding.
+    """
+    return max(0.0, (threshold - SEQUENCE_WEIGHT) / WORD_WEIGHT - 1e-9)
+
+def word_prefix_length(size, min_similarity):
+    """Number of rarest words that must be indexed for prefix filtering"""
+    return max(1, min(size, size - math.ceil(min_similarity * size) + 1))
+
+def build_similarity_candidates(texts):
+    """
+    Build the candidate-generation index for a list of normalized texts.
+
+    Words are ordered from rarest to most common across all texts and each text
+    is indexed under its first few words only (prefix filtering). Two texts whose
+    word Jaccard similarity reaches t always share one of these prefix words, and
+    enhanced_similarity can only reach BASE_SIMILARITY_THRESHOLD when the Jaccard
+    similarity reaches min_word_similarity(BASE_SIMILARITY_THRESHOLD), so no
+    qualifying pair is ever missed.
+    """
+    word_sets = [frozenset(text.split()) for text in texts]
+    frequency = Counter(word for words in word_sets for word in words)
+
+    index_similarity = min_word_similarity(BASE_SIMILARITY_THRESHOLD)
+    ordered_words = []
+    index = defaultdict(list)
+    wordless = []  # Non-empty texts without words are compared by sequence only
+
+    for position, words in enumerate(word_sets):
+        ordered = sorted(words, key=lambda word: (frequency[word], word))
+        ordered_words.append(ordered)
+        if not ordered:
+            if texts[position]:
+                wordless.append(position)
+            continue
+        for word in ordered[:word_prefix_length(len(ordered), index_similarity)]:
+            index[word].append(position)
+
+    return {
+        'texts': texts,
+        'word_sets': word_sets,
+        'ordered_words': ordered_words,
+        'char_counts': [Counter(text) for text in texts],
+        'index': index,
+        'wordless': wordless
+    }
+
+def similarity_upper_bound(seq_bound, word_sim):
+    """Upper bound of enhanced_similarity given bounds on its two components"""
+    return (seq_bound * SEQUENCE_WEIGHT) + (word_sim * WORD_WEIGHT)
+
+def find_similar_texts(candidates, position, processed):
+    """
+    Positions of unprocessed texts that enhanced_similarity matches with the text
+    at the given position, in ascending order.
+
+    Candidates come from the prefix index and are pruned with cheap upper bounds
+    (length ratio, word overlap, character overlap) before the exact similarity
+    is computed, so the result is the same as comparing against every text.
+    """
+    texts = candidates['texts']
+    text = texts[position]
+    threshold = similarity_threshold(text)
+    words = candidates['word_sets'][position]
+
+    if not words:
+        # Wordless texts fall back to plain sequence similarity against every text
+        return [
+            other for other in range(len(texts))
+            if other != position and not processed[other] and enhanced_similarity(text, texts[other]) >= threshold
         ]
-        final_report.append(row)
-    
-    return pd.DataFrame(final_report)
 
-def process_recurring_issues_mis(df):
-    """Process Advanced Recurring Issues MIS with intelligent pattern matching and comprehensive analysis"""
-    import re
-    from difflib import SequenceMatcher
-    import datetime
-    
+    index = candidates['index']
+    ordered = candidates['ordered_words'][position]
+    probe_words = ordered[:word_prefix_length(len(ordered), min_word_similarity(threshold))]
+
+    seen = set()
+    for word in probe_words:
+        # Drop processed tickets from the posting list as we go
+        postings = [other for other in index[word] if not processed[other]]
+        index[word] = postings
+        seen.update(postings)
+    seen.update(other for other in candidates['wordless'] if not processed[other])
+    seen.discard(position)
+
+    word_sets = candidates['word_sets']
+    char_counts = candidates['char_counts'][position]
+    matches = []
+
+    for other in sorted(seen):
+        other_text = texts[other]
+        other_words = word_sets[other]
+        total_length = len(text) + len(other_text)
+
+        if other_words:
+            # Length-only bound: sequence ratio and Jaccard are capped by the size ratio
+            seq_bound = 2.0 * min(len(text), len(other_text)) / total_length
+            size_bound = min(len(words), len(other_words)) / max(len(words), len(other_words))
+            if similarity_upper_bound(seq_bound, size_bound) < threshold:
+                continue
+
+            word_sim = len(words.intersection(other_words)) / len(words.union(other_words))
+            if similarity_upper_bound(seq_bound, word_sim) < threshold:
+                continue
+
+            # Matching characters can never exceed the shared character counts
+            other_counts = candidates['char_counts'][other]
+            shared = sum(min(count, other_counts[char]) for char, count in char_counts.items() if char in other_counts)
+            if similarity_upper_bound(2.0 * shared / total_length, word_sim) < threshold:
+                continue
+
+        if enhanced_similarity(text, other_text) >= threshold:
+            matches.append(other)
+
+    return matches
+
+def greedy_clusters(texts, seed_count=0):
+    """
+    Group texts greedily: every text not yet grouped (in the given order) starts
+    a group and pulls in every remaining text similar to it.
+    The first seed_count texts are patterns of existing clusters; they only pull
+    in the other texts and never join each other.
+    Yields the positions of every group, starting text first, as soon as it is
+    formed, so callers don't have to hold on to the many single-text groups.
+
+    Only distinct texts are compared; their copies are expanded afterwards.
+    Copies join the group of their first copy when the text matches itself,
+    which is checked once per distinct text rather than assumed (SequenceMatcher
+    ratios are heuristic); otherwise they stay ungrouped as they would when
+    compared one by one.
+    """
+    # Entries: the seeds, then every distinct other text with the positions of its copies
+    entry_texts = list(texts[:seed_count])
+    copies = [[position] for position in range(seed_count)]
+    entry_of = {}
+    for position in range(seed_count, len(texts)):
+        entry = entry_of.get(texts[position])
+        if entry is None:
+            entry = entry_of[texts[position]] = len(entry_texts)
+            entry_texts.append(texts[position])
+            copies.append([])
+        copies[entry].append(position)
+
+    candidates = build_similarity_candidates(entry_texts)
+    # An entry is processed once none of its copies is left
+    processed = bytearray(len(entry_texts))
+    processed[:seed_count] = b'\x01' * seed_count
+    next_copy = [0] * len(entry_texts)
+    grouped = bytearray(len(texts))
+
+    for position in range(len(texts)):
+        if grouped[position]:
+            continue
+        grouped[position] = 1
+        group = [position]
+
+        if position >= seed_count:
+            entry = entry_of[texts[position]]
+            text = entry_texts[entry]
+            next_copy[entry] += 1
+            if next_copy[entry] < len(copies[entry]) and enhanced_similarity(text, text) >= similarity_threshold(text):
+                group.extend(copies[entry][next_copy[entry]:])
+                next_copy[entry] = len(copies[entry])
+            if next_copy[entry] == len(copies[entry]):
+                processed[entry] = 1
+        else:
+            entry = position
+
+        for other in find_similar_texts(candidates, entry, processed):
+            group.extend(copies[other][next_copy[other]:])
+            next_copy[other] = len(copies[other])
+            processed[other] = 1
+
+        for other in group:
+            grouped[other] = 1
+        group[1:] = sorted(group[1:])
+        yield group
+
+def set_cluster_columns(df_clean, cluster_ids, sequence):
+    """
+    Set the cluster_id column of df_clean (position of the ticket's cluster, -1 for none)
+    and cluster_rank, the ticket's position when recurring tickets are listed cluster by
+    cluster, in sequence order within a cluster (-1 for none).
+    """
+    recurring_positions = np.flatnonzero(cluster_ids >= 0)
+    ranked = recurring_positions[np.lexsort((sequence[recurring_positions], cluster_ids[recurring_positions]))]
+    ranks = np.full(len(cluster_ids), -1, dtype=np.int64)
+    ranks[ranked] = np.arange(len(ranked))
+    df_clean['cluster_id'] = cluster_ids
+    df_clean['cluster_rank'] = ranks
+
+@timed_stage
+def create_advanced_clusters(df_clean):
+    """
+    Advanced clustering with multiple similarity thresholds.
+
+    Tickets are visited longest text first; each unclustered ticket starts a cluster
+    and pulls in every remaining ticket similar to it. Only pairs sharing a rare
+    word are scored (see build_similarity_candidates), which keeps the run close
+    to linear in the number of tickets.
+
+    Returns the clusters as pattern, original_subject, category and size; their
+    tickets are marked by the cluster_id and cluster_rank columns of df_clean
+    (see set_cluster_columns), so no ticket lists are kept.
+    """
+    clusters = []
+
+    # Positions by normalized text length, longest first
+    order = df_clean['text_length'].reset_index(drop=True).sort_values(ascending=False).index.to_numpy()
+    texts = df_clean['normalized_text'].to_numpy()[order].tolist()
+    subjects = df_clean['Subject'] if 'Subject' in df_clean.columns else None
+    categories = df_clean['subcategory'] if 'subcategory' in df_clean.columns else None
+
+    cluster_ids = np.full(len(df_clean), -1, dtype=np.int64)
+    sequence = np.full(len(df_clean), -1, dtype=np.int64)
+    for group in greedy_clusters(texts):
+        # Only keep clusters with 2+ tickets
+        if len(group) >= 2:
+            members = order[group]
+            cluster_ids[members] = len(clusters)
+            sequence[members] = np.arange(len(group))
+            clusters.append({
+                'pattern': texts[group[0]],
+                'original_subject': subjects.iat[members[0]] if subjects is not None else '',
+                'category': categories.iat[members[0]] if categories is not None else '',
+                'size': len(group)
+            })
+
+    set_cluster_columns(df_clean, cluster_ids, sequence)
+    return clusters
+
+def open_cluster_store(path):
+    """Open the SQLite store of recurring issue clusters, creating its tables if needed"""
+    connection = sqlite3.connect(path, timeout=30)
+    connection.executescript("""
+        CREATE TABLE IF NOT EXISTS clusters (
+            cluster_id INTEGER PRIMARY KEY,
+            pattern TEXT NOT NULL,
+            original_subject TEXT,
+            category TEXT
+        );
+        CREATE TABLE IF NOT EXISTS tickets (
+            ticket_id TEXT PRIMARY KEY,
+            signature TEXT NOT NULL,
+            normalized_text TEXT NOT NULL,
+            cluster_id INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS tickets_cluster ON tickets (cluster_id);
+    """)
+    return connection
+
+def reset_cluster_store(path):
+    """Forget every stored cluster, so the next run clusters all tickets from scratch"""
+    with closing(open_cluster_store(path)) as connection, connection:
+        connection.execute('DELETE FROM tickets')
+        connection.execute('DELETE FROM clusters')
+
+def ticket_key(ticket_id):
+    """Store key of a Ticket Id (None when missing); 1234.0 and 1234 are the same ticket"""
+    if pd.isna(ticket_id):
+        return None
+    if isinstance(ticket_id, float) and ticket_id.is_integer():
+        return str(int(ticket_id))
+    return str(ticket_id)
+
+def text_signature(text):
+    """Fingerprint of a ticket's combined text, to tell changed tickets apart"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def optional_text(value):
+    """Value as stored in a TEXT column (missing values become NULL)"""
+    return None if pd.isna(value) else str(value)
+
+@timed_stage
+def update_cluster_store(df_clean, path):
+    """
+    Recurring issue clusters of df_clean, kept up to date in the cluster store at path.
+
+    Tickets stored with the same combined text keep their cluster and normalized
+    text. Only new and changed tickets are normalized; they are matched against
+    the stored cluster patterns first and then clustered among themselves the way
+    create_advanced_clusters does, so a run on an empty store gives its result.
+    Only clusters of 2+ tickets are stored, so one-off tickets don't pile up as
+    patterns every later run is matched against; they are clustered again next run.
+    Returns the clusters like create_advanced_clusters, and sets its columns of df_clean
+    along with normalized_text and text_length.
+    """
+    keys = df_clean['Ticket Id'].map(ticket_key)
+    # A Ticket Id listed twice is stored from its last row; earlier rows are clustered every run
+    keys = keys.where(~keys.duplicated(keep='last'))
+    signatures = df_clean['combined_text'].map(text_signature)
+
+    with closing(open_cluster_store(path)) as connection, connection:
+        connection.execute('CREATE TEMP TABLE upload (ticket_id TEXT PRIMARY KEY)')
+        connection.executemany('INSERT OR IGNORE INTO upload VALUES (?)', ((key,) for key in keys.dropna()))
+        stored = pd.read_sql_query(
+            'SELECT ticket_id, signature, normalized_text, cluster_id FROM tickets JOIN upload USING (ticket_id)',
+            connection, index_col='ticket_id'
+        )
+        stored_clusters = pd.read_sql_query(
+            'SELECT cluster_id, pattern, original_subject, category FROM clusters ORDER BY cluster_id',
+            connection, index_col='cluster_id'
+        )
+
+        known = keys.map(stored['signature']).eq(signatures).to_numpy()
+        normalized = keys.map(stored['normalized_text']).astype(object)
+        normalized[~known] = normalize_texts(df_clean['combined_text'][~known])
+        df_clean['normalized_text'] = normalized
+        df_clean['text_length'] = normalized.str.len()
+
+        cluster_info = {
+            int(cluster_id): (pattern, subject, category)
+            for cluster_id, pattern, subject, category in stored_clusters.itertuples()
+        }
+        # Stored cluster id of each ticket; tickets of a cluster are listed longest text
+        # first, the way create_advanced_clusters lists them
+        store_ids = np.full(len(df_clean), -1, dtype=np.int64)
+        store_ids[known] = keys[known].map(stored['cluster_id']).to_numpy()
+        length_order = df_clean['text_length'].reset_index(drop=True).sort_values(ascending=False).index.to_numpy()
+        sequence = np.empty(len(df_clean), dtype=np.int64)
+        sequence[length_order] = np.arange(len(length_order))
+
+        new_positions = length_order[~known[length_order]]
+        if len(new_positions):
+            texts = normalized.iloc[new_positions].tolist()
+            subjects = df_clean['Subject'] if 'Subject' in df_clean.columns else None
+            categories = df_clean['subcategory'] if 'subcategory' in df_clean.columns else None
+            seed_count = len(stored_clusters)
+            # Clusters that may have been left with less than 2 stored tickets
+            pruned_clusters = set(keys[~known].map(stored['cluster_id']).dropna().astype(int))
+
+            for group in greedy_clusters(stored_clusters['pattern'].tolist() + texts, seed_count):
+                if group[0] < seed_count:
+                    cluster_id = int(stored_clusters.index[group[0]])
+                    group = group[1:]
+                elif len(group) >= 2:
+                    first = new_positions[group[0] - seed_count]
+                    subject = subjects.iat[first] if subjects is not None else ''
+                    category = categories.iat[first] if categories is not None else ''
+                    cluster_id = connection.execute(
+                        'INSERT INTO clusters (pattern, original_subject, category) VALUES (?, ?, ?)',
+                        (texts[group[0] - seed_count], optional_text(subject), optional_text(category))
+                    ).lastrowid
+                    cluster_info[cluster_id] = (texts[group[0] - seed_count], subject, category)
+                    pruned_clusters.add(cluster_id)
+                else:
+                    # A new ticket matching nothing is not stored
+                    continue
+                store_ids[new_positions[np.array(group, dtype=np.int64) - seed_count]] = cluster_id
+
+            saved_positions = new_positions[store_ids[new_positions] >= 0]
+            saved = pd.DataFrame({
+                'ticket_id': keys.iloc[saved_positions].to_numpy(),
+                'signature': signatures.iloc[saved_positions].to_numpy(),
+                'normalized_text': normalized.iloc[saved_positions].to_numpy(),
+                'cluster_id': store_ids[saved_positions]
+            }).dropna(subset=['ticket_id'])
+            connection.executemany(
+                'INSERT OR REPLACE INTO tickets VALUES (?, ?, ?, ?)',
+                saved.astype(object).itertuples(index=False, name=None)
+            )
+            
+            # Drop clusters that changed tickets left (or Ticket Id-less ones never filled) with less than 2
+            for cluster_id in pruned_clusters:
+                if connection.execute('SELECT COUNT(*) FROM tickets WHERE cluster_id = ?', (cluster_id,)).fetchone()[0] < 2:
+                    connection.execute('DELETE FROM tickets WHERE cluster_id = ?', (cluster_id,))
+                    connection.execute('DELETE FROM clusters WHERE cluster_id = ?', (cluster_id,))
+
+    # Only keep clusters with 2+ tickets in this upload, by stored cluster id
+    sizes = pd.Series(store_ids[store_ids >= 0]).value_counts().sort_index()
+    sizes = sizes[sizes >= 2]
+    positions = pd.Series(np.arange(len(sizes)), index=sizes.index)
+    set_cluster_columns(df_clean, pd.Series(store_ids).map(positions).fillna(-1).to_numpy(dtype=np.int64), sequence)
+
+    clusters = []
+    for cluster_id, size in sizes.items():
+        pattern, subject, category = cluster_info[cluster_id]
+        clusters.append({
+            'pattern': pattern,
+            'original_subject': subject,
+            'category': category,
+            'size': int(size)
+        })
+
+    return clusters
+
+@timed_stage
+def process_recurring_issues_mis(df, cluster_store=None, trend_months=RECURRING_TREND_MONTHS):
+    """
+    Process Advanced Recurring Issues MIS with intelligent pattern matching and comprehensive analysis.
+    With a cluster store (SQLite file) only new and changed tickets are clustered, see update_cluster_store.
+    The monthly trend covers the trend_months calendar months before the current one.
+    """
     # Check for required columns
-    resolution_cols = ['Resolution', 'Solution', 'Fix', 'Root Cause', 'Closure Comments', 'Subject']
     resolution_col = None
-    for col in resolution_cols:
+    for col in RESOLUTION_COLUMNS:
         if col in df.columns:
             resolution_col = col
             break
@@ -925,107 +2385,12 @@ def process_recurring_issues_mis(df):
     if resolution_col is None:
         return pd.DataFrame({'Error': ['Resolution/Subject column not found. Expected: Resolution, Solution, Fix, Root Cause, Closure Comments, or Subject']})
     
-    # Enhanced text normalization with better pattern recognition
-    def normalize_text(text):
-        if pd.isna(text):
-            return ''
-        text = str(text).lower().strip()
-        
-        # Remove common variable data but preserve meaningful patterns
-        text = re.sub(r'\b[a-z]{2,4}-\d+\b', '[ticket_id]', text)  # Ticket IDs
-        text = re.sub(r'\b[a-z0-9]{8,20}\b', '[reference]', text)  # Reference numbers
-        text = re.sub(r'\b\d{10,12}\b', '[phone]', text)  # Phone numbers
-        text = re.sub(r'\b[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}\b', '[email]', text)  # Emails
-        text = re.sub(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', '[date]', text)  # Dates
-        text = re.sub(r'[₹$€£]\s*\d+[.,]?\d*', '[amount]', text)  # Currency amounts
-        text = re.sub(r'\b\d{4,}\b', '[number]', text)  # Large numbers
-        text = re.sub(r'version\s*\d+\.\d+', 'version [x.x]', text)  # Version numbers
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Extract key error patterns
-        error_patterns = [
-            'error', 'failed', 'timeout', 'connection', 'unable', 'cannot', 
-            'invalid', 'missing', 'not found', 'access denied', 'permission',
-            'server', 'database', 'network', 'api', 'sync', 'login', 'password'
-        ]
-        
-        # Preserve important technical terms
-        for pattern in error_patterns:
-            if pattern in text:
-                text = f"{pattern} {text}"
-                break
-                
-        return text[:200]  # Limit length for better matching
-    
-    # Enhanced similarity function with weighted scoring
-    def enhanced_similarity(a, b):
-        # Basic sequence similarity
-        seq_sim = SequenceMatcher(None, a, b).ratio()
-        
-        # Word-based similarity for better semantic matching
-        words_a = set(a.split())
-        words_b = set(b.split())
-        
-        if len(words_a) == 0 or len(words_b) == 0:
-            return seq_sim
-            
-        word_sim = len(words_a.intersection(words_b)) / len(words_a.union(words_b))
-        
-        # Weighted combination
-        return (seq_sim * 0.6) + (word_sim * 0.4)
-    
-    # Advanced clustering with multiple similarity thresholds
-    def create_advanced_clusters(df_clean):
-        clusters = []
-        processed = set()
-        
-        # Sort by normalized text length for better clustering
-        df_sorted = df_clean.sort_values('text_length', ascending=False)
-        
-        for idx, row in df_sorted.iterrows():
-            if idx in processed:
-                continue
-            
-            # Create new cluster
-            cluster = {
-                'tickets': [idx], 
-                'pattern': row['normalized_text'],
-                'original_subject': row.get('Subject', ''),
-                'category': row.get('subcategory', '')
-            }
-            processed.add(idx)
-            
-            # Find similar tickets with adaptive threshold
-            base_threshold = 0.65  # Lower threshold for better recall
-            
-            for idx2, row2 in df_sorted.iterrows():
-                if idx2 in processed:
-                    continue
-                
-                # Calculate similarity
-                sim_score = enhanced_similarity(row['normalized_text'], row2['normalized_text'])
-                
-                # Adaptive threshold based on text length
-                adaptive_threshold = base_threshold
-                if len(row['normalized_text']) < 50:
-                    adaptive_threshold = 0.75  # Higher threshold for short texts
-                
-                if sim_score >= adaptive_threshold:
-                    cluster['tickets'].append(idx2)
-                    processed.add(idx2)
-            
-            # Only keep clusters with 2+ tickets
-            if len(cluster['tickets']) >= 2:
-                clusters.append(cluster)
-        
-        return clusters
-    
     # Prepare enhanced data
     df_clean = df.copy()
     
     # Find best available columns for analysis
     subcategory_col = None
-    for col in ['Ticket Sub Category', 'Request Sub Category', 'Category Of Issue', 'Category Type', 'Subject']:
+    for col in SUBCATEGORY_COLUMNS:
         if col in df.columns:
             subcategory_col = col
             break
@@ -1044,11 +2409,13 @@ def process_recurring_issues_mis(df):
         df_clean['resolution'].astype(str)
     )
     
-    df_clean['normalized_text'] = df_clean['combined_text'].apply(normalize_text)
-    df_clean['text_length'] = df_clean['normalized_text'].str.len()
-    
     # Create advanced clusters
-    clusters = create_advanced_clusters(df_clean)
+    if cluster_store and 'Ticket Id' in df_clean.columns:
+        clusters = update_cluster_store(df_clean, cluster_store)
+    else:
+        df_clean['normalized_text'] = normalize_texts(df_clean['combined_text'])
+        df_clean['text_length'] = df_clean['normalized_text'].str.len()
+        clusters = create_advanced_clusters(df_clean)
     
     final_report = []
     
@@ -1057,7 +2424,7 @@ def process_recurring_issues_mis(df):
     final_report.append([''])
     
     total_tickets = len(df_clean)
-    recurring_tickets = sum(len(cluster['tickets']) for cluster in clusters)
+    recurring_tickets = sum(cluster['size'] for cluster in clusters)
     recurring_percentage = round((recurring_tickets / total_tickets) * 100, 1) if total_tickets > 0 else 0
     
     summary_data = [
@@ -1066,14 +2433,34 @@ def process_recurring_issues_mis(df):
         ['Recurring Issue Patterns Found', len(clusters)],
         ['Tickets in Recurring Patterns', recurring_tickets],
         ['Recurring Issues Percentage', f'{recurring_percentage}%'],
-        ['High Impact Issues (5+ occurrences)', len([c for c in clusters if len(c['tickets']) >= 5])],
-        ['Critical Issues (10+ occurrences)', len([c for c in clusters if len(c['tickets']) >= 10])]
+        ['High Impact Issues (5+ occurrences)', len([c for c in clusters if c['size'] >= 5])],
+        ['Critical Issues (10+ occurrences)', len([c for c in clusters if c['size'] >= 10])]
     ]
     
     final_report.extend(summary_data)
     final_report.append([''])
     final_report.append([''])
     
+    # The sections below aggregate recurring tickets by their cluster_id column instead of slicing per cluster
+    cluster_sizes = [cluster['size'] for cluster in clusters]
+    
+    date_col = None
+    for col in CREATED_TIME_COLUMNS:
+        if col in df.columns:
+            date_col = col
+            break
+    
+    # Only the columns the sections use
+    analysis_columns = ['cluster_id', 'cluster_rank', 'Program Name', 'Select Engineer', 'Status (Ticket)', 'Number of Reopen', date_col, subcategory_col]
+    recurring = df_clean.loc[df_clean['cluster_id'].to_numpy() >= 0, [col for col in dict.fromkeys(analysis_columns) if col in df_clean.columns]]
+    
+    if 'Number of Reopen' in df.columns:
+        recurring_reopens = pd.to_numeric(recurring['Number of Reopen'], errors='coerce').fillna(0)
+    if 'Status (Ticket)' in df.columns:
+        recurring_closed = recurring['Status (Ticket)'] == 'Closed'
+    if date_col:
+        recurring_dates = parse_datetime_column(recurring[date_col])
+    
     # 2. TOP RECURRING ISSUES ANALYSIS
     final_report.append(['TOP RECURRING ISSUES ANALYSIS'])
     final_report.append([''])
@@ -1082,57 +2469,63 @@ def process_recurring_issues_mis(df):
         result = []
         result.append(['Rank', 'Issue Pattern', 'Occurrences', 'Programs Affected', 'Engineers Involved', 'Resolution Rate', 'Avg Reopens', 'First Occurrence', 'Last Occurrence', 'Impact Level', 'Recommended Action'])
         
-        # Sort clusters by impact (occurrences * reopens)
-        def calculate_impact(cluster):
-            cluster_tickets = df_clean.loc[cluster['tickets']]
-            occurrences = len(cluster_tickets)
-            if 'Number of Reopen' in df.columns:
-                reopens = pd.to_numeric(cluster_tickets['Number of Reopen'], errors='coerce').fillna(0).sum()
-                return occurrences + (reopens * 2)  # Weight reopens more heavily
-            return occurrences
-        
-        sorted_clusters = sorted(clusters, key=calculate_impact, reverse=True)[:25]
-        
-        for rank, cluster in enumerate(sorted_clusters, 1):
-            cluster_tickets = df_clean.loc[cluster['tickets']]
-            occurrences = len(cluster_tickets)
+        # Rank clusters by impact (occurrences * reopens) from per-cluster counters,
+        # keeping only the top ones in a bounded heap (same order and ties as a full sort)
+        if 'Number of Reopen' in df.columns:
+            reopen_sums = np.bincount(recurring['cluster_id'], weights=recurring_reopens, minlength=len(clusters))
+            # Weight reopens more heavily
+            impact = lambda cluster_id: cluster_sizes[cluster_id] + (reopen_sums[cluster_id] * 2)
+        else:
+            impact = cluster_sizes.__getitem__
+        
+        sorted_clusters = heapq.nlargest(RECURRING_TOP_ISSUES, range(len(clusters)), key=impact)
+        
+        # Ticket level detail only for the listed clusters
+        in_top = recurring['cluster_id'].isin(sorted_clusters)
+        top_cluster_ids = recurring['cluster_id'][in_top]
+        by_cluster = recurring[in_top].groupby('cluster_id')
+        if 'Program Name' in df.columns:
+            program_counts = by_cluster['Program Name'].nunique()
+        if 'Select Engineer' in df.columns:
+            engineer_counts = by_cluster['Select Engineer'].nunique()
+        if 'Status (Ticket)' in df.columns:
+            closed_counts = recurring_closed[in_top].groupby(top_cluster_ids).sum()
+        if 'Number of Reopen' in df.columns:
+            reopen_means = recurring_reopens[in_top].groupby(top_cluster_ids).mean()
+        if date_col:
+            first_dates = recurring_dates[in_top].groupby(top_cluster_ids).min()
+            last_dates = recurring_dates[in_top].groupby(top_cluster_ids).max()
+        
+        for rank, cluster_id in enumerate(sorted_clusters, 1):
+            cluster = clusters[cluster_id]
+            occurrences = cluster_sizes[cluster_id]
             
             # Programs affected
-            programs_affected = cluster_tickets['Program Name'].nunique() if 'Program Name' in df.columns else 'Unknown'
+            programs_affected = int(program_counts[cluster_id]) if 'Program Name' in df.columns else 'Unknown'
             
             # Engineers involved
             if 'Select Engineer' in df.columns:
-                engineers = cluster_tickets['Select Engineer'].dropna().nunique()
+                engineers = int(engineer_counts[cluster_id])
             else:
                 engineers = 'Unknown'
             
             # Resolution rate
             if 'Status (Ticket)' in df.columns:
-                closed_count = len(cluster_tickets[cluster_tickets['Status (Ticket)'] == 'Closed'])
+                closed_count = int(closed_counts[cluster_id])
                 resolution_rate = f"{round((closed_count/occurrences)*100)}%"
             else:
                 resolution_rate = 'Unknown'
             
             # Average reopens
             if 'Number of Reopen' in df.columns:
-                avg_reopens = round(pd.to_numeric(cluster_tickets['Number of Reopen'], errors='coerce').fillna(0).mean(), 1)
+                avg_reopens = round(reopen_means[cluster_id], 1)
             else:
                 avg_reopens = 0
             
             # Date analysis
-            date_col = None
-            for col in ['Created Time (Ticket)', 'Created Tim']:
-                if col in df.columns:
-                    date_col = col
-                    break
-            
-            if date_col:
-                dates = pd.to_datetime(cluster_tickets[date_col], errors='coerce').dropna()
-                if not dates.empty:
-                    first_date = dates.min().strftime('%Y-%m-%d')
-                    last_date = dates.max().strftime('%Y-%m-%d')
-                else:
-                    first_date = last_date = 'Unknown'
+            if date_col and not pd.isna(first_dates[cluster_id]):
+                first_date = first_dates[cluster_id].strftime('%Y-%m-%d')
+                last_date = last_dates[cluster_id].strftime('%Y-%m-%d')
             else:
                 first_date = last_date = 'Unknown'
             
@@ -1188,21 +2581,25 @@ def process_recurring_issues_mis(df):
     final_report.append([''])
     
     if clusters and subcategory_col:
-        category_analysis = {}
-        for cluster in clusters:
-            cluster_tickets = df_clean.loc[cluster['tickets']]
-            for category in cluster_tickets[subcategory_col].dropna().unique():
-                if category not in category_analysis:
-                    category_analysis[category] = {'clusters': 0, 'tickets': 0}
-                category_analysis[category]['clusters'] += 1
-                category_analysis[category]['tickets'] += len(cluster_tickets[cluster_tickets[subcategory_col] == category])
+        # Categories in the order they first come up, cluster by cluster
+        categorized = recurring[recurring[subcategory_col].notna()]
+        by_category = categorized.groupby(subcategory_col, sort=False, observed=True)
+        category_counts = pd.DataFrame({
+            'patterns': by_category['cluster_id'].nunique(),
+            'tickets': by_category.size(),
+            'first_rank': by_category['cluster_rank'].min()
+        }).sort_values('first_rank', kind='stable')
+        category_analysis = [
+            (category, int(pattern_count), int(ticket_count))
+            for category, pattern_count, ticket_count in zip(category_counts.index, category_counts['patterns'], category_counts['tickets'])
+        ]
         
         result = []
         result.append(['Ticket Sub Category', 'Recurring Patterns', 'Total Recurring Tickets', 'Avg Tickets per Pattern'])
         
-        for category, data in sorted(category_analysis.items(), key=lambda x: x[1]['tickets'], reverse=True):
-            avg_tickets = round(data['tickets'] / data['clusters'], 1) if data['clusters'] > 0 else 0
-            result.append([category, data['clusters'], data['tickets'], avg_tickets])
+        for category, pattern_count, ticket_count in sorted(category_analysis, key=lambda x: x[2], reverse=True):
+            avg_tickets = round(ticket_count / pattern_count, 1) if pattern_count > 0 else 0
+            result.append([category, pattern_count, ticket_count, avg_tickets])
         
         final_report.extend(result)
     else:
@@ -1219,66 +2616,58 @@ def process_recurring_issues_mis(df):
         result = []
         result.append(['Engineer', 'Recurring Issues Handled', 'Unique Patterns', 'Resolution Rate', 'Avg Reopens', 'Performance Score', 'Focus Area'])
         
-        # Get all tickets in clusters
-        cluster_ticket_ids = set()
-        for cluster in clusters:
-            cluster_ticket_ids.update(cluster['tickets'])
+        # Recurring tickets with an engineer, engineers listed in the order they come up in the export
+        recurring_tickets = recurring[recurring['Select Engineer'].notna()]
+        patterns = pd.Series([cluster['pattern'] for cluster in clusters])
+        
+        # One row per (engineer, cluster_id) pair, in the order the pairs first come up
+        engineer_tickets = pd.DataFrame({
+            'engineer': recurring_tickets['Select Engineer'].astype(object),
+            'cluster_id': recurring_tickets['cluster_id'],
+            'resolved': recurring_tickets['Status (Ticket)'] == 'Closed' if 'Status (Ticket)' in df.columns else False,
+            'reopens': pd.to_numeric(recurring_tickets['Number of Reopen'], errors='coerce').fillna(0) if 'Number of Reopen' in df.columns else 0
+        })
+        engineer_clusters = engineer_tickets.groupby(['engineer', 'cluster_id'], sort=False).agg(
+            tickets=('resolved', 'size'), resolved=('resolved', 'sum'), reopens=('reopens', 'sum')
+        ).reset_index()
+        engineer_clusters['pattern'] = engineer_clusters['cluster_id'].map(patterns)
+        
+        # Rolled up per engineer; clusters sharing a pattern count as one pattern
+        by_engineer = engineer_clusters.groupby('engineer', sort=False)
+        engineer_totals = by_engineer[['tickets', 'resolved', 'reopens']].sum()
+        issues_handled = engineer_totals['tickets'].to_numpy()
+        unique_patterns = by_engineer['pattern'].nunique().to_numpy()
+        
+        if 'Status (Ticket)' in df.columns:
+            resolution_rate = np.round(engineer_totals['resolved'].to_numpy() / issues_handled * 100, 1)
+        else:
+            resolution_rate = np.zeros(len(engineer_totals), dtype=np.int64)
+        if 'Number of Reopen' in df.columns:
+            avg_reopens = np.round(engineer_totals['reopens'].to_numpy() / issues_handled, 1)
+        else:
+            avg_reopens = np.zeros(len(engineer_totals), dtype=np.int64)
         
-        recurring_tickets = df_clean.loc[list(cluster_ticket_ids)]
+        # Performance score (weighted combination)
+        performance_score = np.round(
+            (resolution_rate * 0.4) + 
+            ((100 - np.minimum(avg_reopens * 10, 100)) * 0.3) + 
+            (np.minimum(unique_patterns * 5, 50) * 0.3), 1
+        )
         
-        engineer_data = []
-        for engineer in recurring_tickets['Select Engineer'].dropna().unique():
-            engineer_tickets = recurring_tickets[recurring_tickets['Select Engineer'] == engineer]
-            
-            issues_handled = len(engineer_tickets)
-            
-            # Count unique patterns this engineer worked on
-            engineer_patterns = set()
-            for cluster in clusters:
-                cluster_tickets = df_clean.loc[cluster['tickets']]
-                if engineer in cluster_tickets['Select Engineer'].values:
-                    engineer_patterns.add(cluster['pattern'])
-            unique_patterns = len(engineer_patterns)
-            
-            # Resolution rate
-            if 'Status (Ticket)' in df.columns:
-                resolved = len(engineer_tickets[engineer_tickets['Status (Ticket)'] == 'Closed'])
-                resolution_rate = round((resolved/issues_handled)*100, 1) if issues_handled > 0 else 0
-            else:
-                resolution_rate = 0
-            
-            # Average reopens
-            if 'Number of Reopen' in df.columns:
-                avg_reopens = round(pd.to_numeric(engineer_tickets['Number of Reopen'], errors='coerce').fillna(0).mean(), 1)
-            else:
-                avg_reopens = 0
-            
-            # Performance score (weighted combination)
-            performance_score = round(
-                (resolution_rate * 0.4) + 
-                ((100 - min(avg_reopens * 10, 100)) * 0.3) + 
-                (min(unique_patterns * 5, 50) * 0.3), 1
+        # Focus area recommendation
+        focus_area = np.select(
+            [resolution_rate < 70, avg_reopens > 1.5, unique_patterns < 3],
+            ['Resolution Efficiency', 'Quality Improvement', 'Knowledge Expansion'],
+            'Mentoring Others'
+        )
+        
+        engineer_data = [
+            [engineer, handled, patterns_worked, f"{rate}%", reopens, score, area]
+            for engineer, handled, patterns_worked, rate, reopens, score, area in zip(
+                engineer_totals.index, issues_handled.tolist(), unique_patterns.tolist(), resolution_rate.tolist(),
+                avg_reopens.tolist(), performance_score.tolist(), focus_area.tolist()
             )
-            
-            # Focus area recommendation
-            if resolution_rate < 70:
-                focus_area = 'Resolution Efficiency'
-            elif avg_reopens > 1.5:
-                focus_area = 'Quality Improvement'
-            elif unique_patterns < 3:
-                focus_area = 'Knowledge Expansion'
-            else:
-                focus_area = 'Mentoring Others'
-            
-            engineer_data.append([
-                engineer, 
-                issues_handled, 
-                unique_patterns, 
-                f"{resolution_rate}%", 
-                avg_reopens, 
-                performance_score,
-                focus_area
-            ])
+        ]
         
         # Sort by performance score (descending)
         engineer_data.sort(key=lambda x: x[5], reverse=True)
@@ -1294,57 +2683,47 @@ def process_recurring_issues_mis(df):
     final_report.append(['RECURRING ISSUES MONTHLY TREND ANALYSIS'])
     final_report.append([''])
     
-    date_col = None
-    for col in ['Created Time (Ticket)', 'Created Tim']:
-        if col in df.columns:
-            date_col = col
-            break
-    
     if clusters and date_col:
         result = []
         result.append(['Month', 'New Patterns', 'Total Occurrences', 'Critical Issues', 'Resolution Rate', 'Trend'])
         
-        today = datetime.datetime.now()
-        monthly_data = []
+        # Calendar months before the current one, oldest first
+        current_month = pd.Timestamp(datetime.datetime.now()).to_period('M')
+        months = pd.period_range(end=current_month - 1, periods=trend_months, freq='M')
+        
+        # Tickets bucketed by created month, with one grouped pass over (month, cluster_id)
+        ticket_months = recurring_dates.dt.to_period('M')
+        in_window = ticket_months.isin(months).to_numpy()
+        trend_tickets = pd.DataFrame({
+            'month': ticket_months[in_window],
+            'cluster_id': recurring['cluster_id'][in_window],
+            'resolved': recurring_closed[in_window] if 'Status (Ticket)' in df.columns else False
+        })
+        per_cluster = trend_tickets.groupby(['month', 'cluster_id']).agg(
+            occurrences=('cluster_id', 'size'),
+            resolved=('resolved', 'sum')
+        )
+        critical_clusters = np.array(cluster_sizes) >= 5  # Critical threshold
+        per_cluster['critical'] = critical_clusters[per_cluster.index.get_level_values('cluster_id')]
+        per_month = per_cluster.groupby(level='month').agg(
+            patterns=('occurrences', 'size'),
+            occurrences=('occurrences', 'sum'),
+            critical=('critical', 'sum'),
+            resolved=('resolved', 'sum')
+        ).reindex(months, fill_value=0)
         
-        for i in range(6, 0, -1):  # Last 6 months
-            month_start = (today.replace(day=1) - datetime.timedelta(days=30*i)).replace(day=1)
-            month_end = (month_start + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
-            period = month_start.strftime('%Y-%m')
-            
-            # Count patterns and occurrences in this period
-            period_patterns = 0
-            period_occurrences = 0
-            period_critical = 0
-            period_resolved = 0
-            period_total = 0
-            
-            for cluster in clusters:
-                cluster_tickets = df_clean.loc[cluster['tickets']]
-                dates = pd.to_datetime(cluster_tickets[date_col], errors='coerce')
-                period_tickets = cluster_tickets[(dates >= month_start) & (dates <= month_end)]
-                
-                if not period_tickets.empty:
-                    period_patterns += 1
-                    period_occurrences += len(period_tickets)
-                    
-                    if len(cluster['tickets']) >= 5:  # Critical threshold
-                        period_critical += 1
-                    
-                    # Resolution rate for this period
-                    if 'Status (Ticket)' in df.columns:
-                        resolved = len(period_tickets[period_tickets['Status (Ticket)'] == 'Closed'])
-                        period_resolved += resolved
-                        period_total += len(period_tickets)
-            
-            resolution_rate = round((period_resolved / period_total) * 100, 1) if period_total > 0 else 0
-            
+        monthly_data = []
+        for month, patterns, occurrences, critical, resolved in zip(
+            months, per_month['patterns'], per_month['occurrences'], per_month['critical'], per_month['resolved']
+        ):
+            occurrences, resolved = int(occurrences), int(resolved)
             monthly_data.append({
-                'month': period,
-                'patterns': period_patterns,
-                'occurrences': period_occurrences,
-                'critical': period_critical,
-                'resolution_rate': resolution_rate
+                'month': month.strftime('%Y-%m'),
+                'patterns': int(patterns),
+                'occurrences': occurrences,
+                'critical': int(critical),
+                # Without a status column no ticket counts towards the rate
+                'resolution_rate': round((resolved / occurrences) * 100, 1) if occurrences > 0 and 'Status (Ticket)' in df.columns else 0
             })
         
         # Calculate trends
@@ -1379,6 +2758,7 @@ def process_recurring_issues_mis(df):
     
     return pd.DataFrame(final_report)
 
+@timed_stage
 def generate_client_closed_report(closed_tickets, program):
     """Generate closed tickets report for a specific program"""
     result = []
@@ -1389,17 +2769,15 @@ def generate_client_closed_report(closed_tickets, program):
     crossed_sla = len(closed_tickets[closed_tickets['SLA_Status'] == 'Crossed SLA'])
     total = within_sla + crossed_sla
     
-    within_pct_num = round(within_sla * 100 / total) if total > 0 else 0
-    crossed_pct_num = round(crossed_sla * 100 / total) if total > 0 else 0
-    if total > 0 and within_pct_num + crossed_pct_num != 100:
-        within_pct_num = 100 - crossed_pct_num
-    within_pct = f"{within_pct_num}%"
-    crossed_pct = f"{crossed_pct_num}%"
+    within_pct_num, crossed_pct_num = sla_percentages([within_sla], [crossed_sla])
+    within_pct = f"{within_pct_num[0]}%"
+    crossed_pct = f"{crossed_pct_num[0]}%"
     
     result.append([program, within_sla, crossed_sla, total, within_pct, crossed_pct])
     
     return pd.DataFrame(result[1:], columns=result[0])
 
+@timed_stage
 def generate_client_open_report(open_tickets, program):
     """Generate open tickets report for a specific program"""
     result = []
@@ -1410,17 +2788,15 @@ def generate_client_open_report(open_tickets, program):
     crossed_sla = len(open_tickets[open_tickets['SLA_Status'] == 'Crossed SLA'])
     total = within_sla + crossed_sla
     
-    within_pct_num = round(within_sla * 100 / total) if total > 0 else 0
-    crossed_pct_num = round(crossed_sla * 100 / total) if total > 0 else 0
-    if total > 0 and within_pct_num + crossed_pct_num != 100:
-        within_pct_num = 100 - crossed_pct_num
-    within_pct = f"{within_pct_num}%"
-    crossed_pct = f"{crossed_pct_num}%"
+    within_pct_num, crossed_pct_num = sla_percentages([within_sla], [crossed_sla])
+    within_pct = f"{within_pct_num[0]}%"
+    crossed_pct = f"{crossed_pct_num[0]}%"
     
     result.append([program, within_sla, crossed_sla, total, within_pct, crossed_pct])
     
     return pd.DataFrame(result[1:], columns=result[0])
 
+@timed_stage
 def generate_client_request_report(program_df, program):
     """Generate request tickets report for a specific program"""
     result = []
@@ -1428,7 +2804,7 @@ def generate_client_request_report(program_df, program):
     
     # Filter request tickets based on Classifications column
     if 'Classifications' in program_df.columns:
-        request_tickets = program_df[program_df['Classifications'].str.lower().str.contains('request', na=False)]
+        request_tickets = program_df[request_ticket_mask(program_df)]
     else:
         # If no Classifications column, assume all are request tickets
         request_tickets = program_df
@@ -1437,14 +2813,14 @@ def generate_client_request_report(program_df, program):
     # Exclude only 'Closed - Marked as request' status
     request_tickets_filtered = request_tickets[request_tickets['Status (Ticket)'] != 'Closed - Marked as request']
     closed_count = len(request_tickets_filtered[request_tickets_filtered['Status (Ticket)'] == 'Closed'])
-    open_statuses = ['Assigned to Engineer!', 'Reopened', 'Waiting Information From user - 1', 'Waiting Information From user - 2', 'Waiting Information From user - 3']
-    open_count = len(request_tickets_filtered[request_tickets_filtered['Status (Ticket)'].isin(open_statuses)])
+    open_count = len(request_tickets_filtered[request_tickets_filtered['Status (Ticket)'].isin(OPEN_STATUSES)])
     total = closed_count + open_count
     
     result.append([program, closed_count, open_count, total])
     
     return pd.DataFrame(result[1:], columns=result[0])
 
+@timed_stage
 def process_open_ticket_mis(df):
     """
     Process Open Ticket MIS to generate Module Lead, Client, and Engineer wise reports
@@ -1453,53 +2829,19 @@ def process_open_ticket_mis(df):
     if 'Status (Ticket)' not in df.columns:
         return pd.DataFrame({'Error': ['Status (Ticket) column not found']})
     
-    # Filter open tickets with all specified statuses
-    open_statuses = [
-        'Assigned to Engineer!',
-        'Reopened',
-        'Waiting Information From user - 1',
-        'Waiting Information From user - 2', 
-        'Waiting Information From user - 3'
-    ]
-    open_tickets = df[df['Status (Ticket)'].isin(open_statuses)].copy()
-    
-    # Only exclude tickets that are in waiting status AND classified as 'request open'
-    waiting_statuses = [
-        'Waiting Information From user - 1',
-        'Waiting Information From user - 2',
-        'Waiting Information From user - 3'
-    ]
-    
-    if 'Classifications' in open_tickets.columns:
-        # Remove tickets that are both in waiting status AND classified as request open
-        exclude_condition = (
-            open_tickets['Status (Ticket)'].isin(waiting_statuses) & 
-            (open_tickets['Classifications'].str.lower().str.contains('request open', na=False))
-        )
-        open_tickets = open_tickets[~exclude_condition]
+    # Filter open tickets, excluding waiting tickets classified as 'request open'
+    open_tickets = df[open_ticket_mask(df)].copy()
     
     if open_tickets.empty:
         return pd.DataFrame({'Error': ['No open tickets found']})
     
     # Calculate SLA status based on GitLab due date
-    import datetime
-    today_date = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    def calculate_sla_status(row):
-        if 'Gitlab Due date' in open_tickets.columns and pd.notna(row.get('Gitlab Due date')):
-            try:
-                gitlab_due = pd.to_datetime(row['Gitlab Due date'], errors='coerce')
-                if pd.notna(gitlab_due):
-                    return 'Crossed SLA' if today_date.date() > gitlab_due.date() else 'Within SLA'
-            except:
-                pass
-        # Fallback to Is Overdue if Gitlab due date not available
-        return 'Crossed SLA' if row.get('Is Overdue') == True else 'Within SLA'
-    
-    open_tickets['SLA_Status'] = open_tickets.apply(calculate_sla_status, axis=1)
+    today_date = get_today_date()
+    open_tickets['SLA_Status'] = ticket_sla_status(open_tickets, today_date, use_due_date=True)
     
     # Sort by creation date (ascending) to show oldest tickets first
     if 'Created Time (Ticket)' in open_tickets.columns:
+        # One inferred format for the column, so day-first text dates stay day-first
         open_tickets['Created_Date_Sort'] = pd.to_datetime(open_tickets['Created Time (Ticket)'], errors='coerce')
         open_tickets = open_tickets.sort_values('Created_Date_Sort', ascending=True)
         open_tickets = open_tickets.drop('Created_Date_Sort', axis=1)
@@ -1528,151 +2870,23 @@ def process_open_ticket_mis(df):
     
     return pd.DataFrame(final_report)
 
+@timed_stage
 def generate_module_lead_report(open_tickets):
     """Generate Module Lead wise report"""
-    report = open_tickets.groupby(['Module Lead', 'SLA_Status']).size().unstack(fill_value=0)
-    
-    result = []
-    result.append(['Module Lead', 'Within SLA', 'Crossed SLA', 'Grand Total', 'Within SLA%', 'Crossed SLA%'])
-    
-    total_within = 0
-    total_crossed = 0
-    data_rows = []
-    
-    for module_lead in report.index:
-        within_sla = report.loc[module_lead, 'Within SLA'] if 'Within SLA' in report.columns else 0
-        crossed_sla = report.loc[module_lead, 'Crossed SLA'] if 'Crossed SLA' in report.columns else 0
-        total = within_sla + crossed_sla
-        
-        within_pct_num = round(within_sla * 100 / total) if total > 0 else 0
-        crossed_pct_num = round(crossed_sla * 100 / total) if total > 0 else 0
-        # Ensure percentages add up to 100%
-        if total > 0 and within_pct_num + crossed_pct_num != 100:
-            within_pct_num = 100 - crossed_pct_num
-        within_pct = f"{within_pct_num}%"
-        crossed_pct = f"{crossed_pct_num}%"
-        
-        data_rows.append([module_lead, within_sla, crossed_sla, total, within_pct, crossed_pct, crossed_pct_num])
-        
-        total_within += within_sla
-        total_crossed += crossed_sla
-    
-    # Sort by crossed SLA percentage (descending)
-    data_rows.sort(key=lambda x: x[6], reverse=True)
-    
-    # Add sorted rows (without the sort key)
-    for row in data_rows:
-        result.append(row[:6])
-    
-    # Grand total
-    grand_total = total_within + total_crossed
-    within_pct_num = round(total_within * 100 / grand_total) if grand_total > 0 else 0
-    crossed_pct_num = round(total_crossed * 100 / grand_total) if grand_total > 0 else 0
-    if grand_total > 0 and within_pct_num + crossed_pct_num != 100:
-        within_pct_num = 100 - crossed_pct_num
-    within_pct = f"{within_pct_num}%"
-    crossed_pct = f"{crossed_pct_num}%"
-    result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-    
-    return pd.DataFrame(result[1:], columns=result[0])
+    return generate_sla_breakdown_report(open_tickets, 'Module Lead', 'Module Lead')
 
+@timed_stage
 def generate_client_report(open_tickets):
     """Generate Client wise report"""
     # Use Program Name as Client Name
-    report = open_tickets.groupby(['Program Name', 'SLA_Status']).size().unstack(fill_value=0)
-    
-    result = []
-    result.append(['Client Name', 'Within SLA', 'Crossed SLA', 'Grand Total', 'Within SLA%', 'Crossed SLA%'])
-    
-    total_within = 0
-    total_crossed = 0
-    data_rows = []
-    
-    for client in report.index:
-        within_sla = report.loc[client, 'Within SLA'] if 'Within SLA' in report.columns else 0
-        crossed_sla = report.loc[client, 'Crossed SLA'] if 'Crossed SLA' in report.columns else 0
-        total = within_sla + crossed_sla
-        
-        within_pct_num = round(within_sla * 100 / total) if total > 0 else 0
-        crossed_pct_num = round(crossed_sla * 100 / total) if total > 0 else 0
-        # Ensure percentages add up to 100%
-        if total > 0 and within_pct_num + crossed_pct_num != 100:
-            within_pct_num = 100 - crossed_pct_num
-        within_pct = f"{within_pct_num}%"
-        crossed_pct = f"{crossed_pct_num}%"
-        
-        data_rows.append([client, within_sla, crossed_sla, total, within_pct, crossed_pct, crossed_pct_num])
-        
-        total_within += within_sla
-        total_crossed += crossed_sla
-    
-    # Sort by crossed SLA percentage (descending)
-    data_rows.sort(key=lambda x: x[6], reverse=True)
-    
-    # Add sorted rows (without the sort key)
-    for row in data_rows:
-        result.append(row[:6])
-    
-    # Grand total
-    grand_total = total_within + total_crossed
-    within_pct_num = round(total_within * 100 / grand_total) if grand_total > 0 else 0
-    crossed_pct_num = round(total_crossed * 100 / grand_total) if grand_total > 0 else 0
-    if grand_total > 0 and within_pct_num + crossed_pct_num != 100:
-        within_pct_num = 100 - crossed_pct_num
-    within_pct = f"{within_pct_num}%"
-    crossed_pct = f"{crossed_pct_num}%"
-    result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-    
-    return pd.DataFrame(result[1:], columns=result[0])
+    return generate_sla_breakdown_report(open_tickets, 'Program Name', 'Client Name')
 
+@timed_stage
 def generate_engineer_report(open_tickets):
     """Generate Engineer wise report"""
-    report = open_tickets.groupby(['Select Engineer', 'SLA_Status']).size().unstack(fill_value=0)
-    
-    result = []
-    result.append(['Engineer', 'Within SLA', 'Crossed SLA', 'Grand Total', 'Within SLA%', 'Crossed SLA%'])
-    
-    total_within = 0
-    total_crossed = 0
-    data_rows = []
-    
-    for engineer in report.index:
-        within_sla = report.loc[engineer, 'Within SLA'] if 'Within SLA' in report.columns else 0
-        crossed_sla = report.loc[engineer, 'Crossed SLA'] if 'Crossed SLA' in report.columns else 0
-        total = within_sla + crossed_sla
-        
-        within_pct_num = round(within_sla * 100 / total) if total > 0 else 0
-        crossed_pct_num = round(crossed_sla * 100 / total) if total > 0 else 0
-        # Ensure percentages add up to 100%
-        if total > 0 and within_pct_num + crossed_pct_num != 100:
-            within_pct_num = 100 - crossed_pct_num
-        within_pct = f"{within_pct_num}%"
-        crossed_pct = f"{crossed_pct_num}%"
-        
-        data_rows.append([engineer, within_sla, crossed_sla, total, within_pct, crossed_pct, crossed_pct_num])
-        
-        total_within += within_sla
-        total_crossed += crossed_sla
-    
-    # Sort by crossed SLA percentage (descending)
-    data_rows.sort(key=lambda x: x[6], reverse=True)
-    
-    # Add sorted rows (without the sort key)
-    for row in data_rows:
-        result.append(row[:6])
-    
-    # Grand total
-    grand_total = total_within + total_crossed
-    within_pct_num = round(total_within * 100 / grand_total) if grand_total > 0 else 0
-    crossed_pct_num = round(total_crossed * 100 / grand_total) if grand_total > 0 else 0
-    if grand_total > 0 and within_pct_num + crossed_pct_num != 100:
-        within_pct_num = 100 - crossed_pct_num
-    within_pct = f"{within_pct_num}%"
-    crossed_pct = f"{crossed_pct_num}%"
-    result.append(['Grand Total', total_within, total_crossed, grand_total, within_pct, crossed_pct])
-    
-    return pd.DataFrame(result[1:], columns=result[0])
+    return generate_sla_breakdown_report(open_tickets, 'Select Engineer', 'Engineer')
 
+@timed_stage
 def process_request_ticket_open_mis(df):
     """
     Process Request Ticket Open MIS:
@@ -1680,54 +2894,20 @@ def process_request_ticket_open_mis(df):
     2. Calculate days difference between today and L1-Due Date (not GitLab due date)
     3. Generate both raw data sheet and MIS summary sheet
     """
-    import datetime
-    
     # Check required columns
-    required_cols = ['Created Time (Ticket)', 'Created Tim']
-    if not any(col in df.columns for col in required_cols):
+    if not any(col in df.columns for col in CREATED_TIME_COLUMNS):
         return pd.DataFrame({'Error': ['Created Time column not found']})
     
     # Create a copy of the dataframe and exclude only 'Closed - Marked as request' tickets
     result_df = df[df['Status (Ticket)'] != 'Closed - Marked as request'].copy()
     
     # Add today's date as datetime (matching expected format)
-    today_date = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_date = get_today_date()
     result_df['Todays Date'] = today_date
     
-    # Calculate days difference using today's date - created date
-    def calculate_days_diff(created_date):
-        try:
-            if pd.isna(created_date) or created_date == '':
-                return 0
-            
-            # Parse Created Date
-            created_dt = pd.to_datetime(created_date, errors='coerce')
-            if pd.isna(created_dt):
-                return 0
-            
-            # Calculate difference (today - created date)
-            diff = (today_date - created_dt).days
-            return max(0, diff)
-        except:
-            return 0
-    
-    # Use Created Tim column for calculation
+    # Calculate days difference (today - created date) for the whole column at once
     created_col = 'Created Tim' if 'Created Tim' in result_df.columns else 'Created Time (Ticket)'
-    result_df['No of crossed days'] = result_df[created_col].apply(calculate_days_diff)
-    
-    # Match exact column order from expected output
-    expected_columns = [
-        'Ticket Id', 'Status (Ticket)', 'Ticket Owner', 'Created Tim', 
-        'Due Date', 'Ticket Closed Time', 'Email (Contact)', 'Category Type',
-        'Priority (Ticket)', 'Severity Classification', 'Channel',
-        'Total Time Spent', 'Crossed Due Date', 'L1-Due Date', 
-        'Request Sub Category', 'Contact name', 'Category Of Issue', 
-        'Gitlab Due date', 'Gitlab Link', 'Number of Reopen',
-        'Is Overdue', 'Support Plan Category', 'Classifications', 'Ticket Group',
-        'Solutions Engineer', 'Select Engineer', 'Module Lead', 'Program Name',
-        'Department Name', 'Product OR PS Ticket', 'Subject', 
-        'Todays Date', 'No of crossed days'
-    ]
+    result_df['No of crossed days'] = days_since(ticket_dates(result_df, created_col), today_date)
     
     # Map column names from raw data to expected output format
     column_mapping = {
@@ -1741,7 +2921,7 @@ def process_request_ticket_open_mis(df):
             result_df = result_df.rename(columns={old_name: new_name})
     
     # Keep only columns that exist and match expected order
-    available_columns = [col for col in expected_columns if col in result_df.columns]
+    available_columns = [col for col in REQUEST_OPEN_COLUMNS if col in result_df.columns]
     result_df = result_df[available_columns]
     
     # Final filter to ensure no 'Closed - Marked as request' tickets remain
@@ -1752,6 +2932,7 @@ def process_request_ticket_open_mis(df):
     
     return {'raw_data': result_df, 'mis_summary': mis_summary}
 
+@timed_stage
 def generate_request_ticket_mis_summary(df):
     """
     Generate MIS summary with Program Names/Engineers in rows and No of crossed days as columns
@@ -1760,7 +2941,7 @@ def generate_request_ticket_mis_summary(df):
     
     # 1. Solutions Engineer wise report
     final_report.append(['SOLUTIONS ENGINEER WISE REPORT'])
-    se_report = df.groupby(['Solutions Engineer', 'No of crossed days']).size().unstack(fill_value=0)
+    se_report = df.groupby(['Solutions Engineer', 'No of crossed days'], observed=True).size().unstack(fill_value=0)
     se_report['Grand Total'] = se_report.sum(axis=1)
     
     # Only include columns that have non-zero values
@@ -1782,7 +2963,7 @@ def generate_request_ticket_mis_summary(df):
     
     # 2. Program Name wise report
     final_report.append(['PROGRAM NAME WISE REPORT'])
-    pn_report = df.groupby(['Program Name', 'No of crossed days']).size().unstack(fill_value=0)
+    pn_report = df.groupby(['Program Name', 'No of crossed days'], observed=True).size().unstack(fill_value=0)
     pn_report['Grand Total'] = pn_report.sum(axis=1)
     
     # Only include columns that have non-zero values
@@ -1804,7 +2985,7 @@ def generate_request_ticket_mis_summary(df):
     
     # 3. Select Engineer wise report
     final_report.append(['SELECT ENGINEER WISE REPORT'])
-    eng_report = df.groupby(['Select Engineer', 'No of crossed days']).size().unstack(fill_value=0)
+    eng_report = df.groupby(['Select Engineer', 'No of crossed days'], observed=True).size().unstack(fill_value=0)
     eng_report['Grand Total'] = eng_report.sum(axis=1)
     
     # Only include columns that have non-zero values
@@ -1825,10 +3006,126 @@ def generate_request_ticket_mis_summary(df):
     
     return pd.DataFrame(final_report)
 
+def open_snapshot_store(path):
+    """Open the SQLite store of daily SLA snapshots, creating its table if needed"""
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS sla_snapshots (
+            report_date TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            within_sla INTEGER NOT NULL,
+            crossed_sla INTEGER NOT NULL,
+            PRIMARY KEY (report_date, dimension, value)
+        )
+    """)
+    return connection
+
+def sla_snapshot(df):
+    """
+    Within/Crossed SLA counts of open tickets (SLA by GitLab due date, as in the Open Ticket MIS)
+    for each value of every snapshot dimension, as (dimension, value, within, crossed) rows.
+    """
+    if 'Status (Ticket)' not in df.columns:
+        return []
+    open_tickets = df[open_ticket_mask(df)]
+    sla_status = ticket_sla_status(open_tickets, get_today_date(), use_due_date=True)
+    open_tickets = open_tickets.assign(SLA_Status=sla_status)
+    
+    dimensions = [dimension for dimension in SNAPSHOT_DIMENSIONS if dimension in open_tickets.columns]
+    return [
+        (dimension, str(value), int(within), int(crossed))
+        for dimension, counts in count_sla_by_dimensions(open_tickets, dimensions).items()
+        for value, within, crossed in zip(counts.index, counts['Within SLA'], counts['Crossed SLA'])
+    ]
+
+@timed_stage
+def record_sla_snapshot(df, path):
+    """
+    Add today's SLA snapshot of an export to the store.
+    Earlier days are never changed; a later run on the same day replaces that day's snapshot.
+    """
+    report_date = get_today_date().date().isoformat()
+    rows = [(report_date,) + row for row in sla_snapshot(df)]
+    with closing(open_snapshot_store(path)) as connection, connection:
+        connection.execute('DELETE FROM sla_snapshots WHERE report_date = ?', (report_date,))
+        connection.executemany('INSERT INTO sla_snapshots VALUES (?, ?, ?, ?, ?)', rows)
+
+def build_sla_trend(snapshots, label):
+    """
+    Crossed SLA% of every value of one dimension on each report date, with a Grand Total row
+    and the change over the period; values are sorted by their latest Crossed SLA% (descending).
+    """
+    dates = sorted(snapshots['report_date'].unique())
+    within = snapshots.pivot_table(index='value', columns='report_date', values='within_sla', aggfunc='sum').reindex(columns=dates)
+    crossed = snapshots.pivot_table(index='value', columns='report_date', values='crossed_sla', aggfunc='sum').reindex(columns=dates)
+    has_tickets = within.notna().to_numpy()
+    within = within.fillna(0).astype(np.int64)
+    crossed = crossed.fillna(0).astype(np.int64)
+    
+    within = pd.concat([within, within.sum().to_frame('Grand Total').T])
+    crossed = pd.concat([crossed, crossed.sum().to_frame('Grand Total').T])
+    has_tickets = np.vstack([has_tickets, (within.iloc[-1] + crossed.iloc[-1] > 0).to_numpy()])
+    crossed_pct = sla_percentages(within.to_numpy().ravel(), crossed.to_numpy().ravel())[1].reshape(within.shape)
+    
+    # Values missing on the latest date sort last; Grand Total stays at the bottom
+    latest = np.where(has_tickets[:-1, -1], crossed_pct[:-1, -1], -1)
+    order = list(np.argsort(-latest, kind='stable')) + [len(within) - 1]
+    
+    rows = []
+    for position in order:
+        cells = [f"{pct}%" if present else '' for pct, present in zip(crossed_pct[position].tolist(), has_tickets[position])]
+        present = np.flatnonzero(has_tickets[position])
+        if len(present) > 1:
+            change = f"{crossed_pct[position, present[-1]] - crossed_pct[position, present[0]]:+d}%"
+        else:
+            change = ''
+        rows.append([within.index[position]] + cells + [change])
+    
+    header = [label] + [datetime.date.fromisoformat(date).strftime('%d-%b') for date in dates] + ['Change']
+    return [header] + rows
+
+@timed_stage
+def process_sla_trend_mis(snapshot_store=None, days=SLA_TREND_DAYS):
+    """
+    Process SLA Trend MIS: Crossed SLA% of open tickets per Module Lead, Program, Engineer,
+    Department and Priority over the last days, read from the daily snapshots alone.
+    """
+    snapshots = pd.DataFrame()
+    if snapshot_store and os.path.exists(snapshot_store):
+        first_date = (get_today_date() - datetime.timedelta(days=days - 1)).date().isoformat()
+        with closing(open_snapshot_store(snapshot_store)) as connection:
+            snapshots = pd.read_sql_query(
+                'SELECT * FROM sla_snapshots WHERE report_date >= ? ORDER BY report_date',
+                connection, params=(first_date,)
+            )
+    
+    if snapshots.empty:
+        return pd.DataFrame({'Error': ['No SLA snapshots recorded yet. Generate the Open Ticket MIS or Jagan\'s MIS on daily uploads to build up the trend']})
+    
+    final_report = []
+    for dimension in SNAPSHOT_DIMENSIONS:
+        dimension_snapshots = snapshots[snapshots['dimension'] == dimension]
+        if dimension_snapshots.empty:
+            continue
+        label = 'Engineer' if dimension == 'Select Engineer' else dimension.replace(' (Ticket)', '')
+        final_report.append([f"{label.upper()} WISE CROSSED SLA% TREND"])
+        final_report.extend(build_sla_trend(dimension_snapshots, label))
+        final_report.append([''])
+    
+    return pd.DataFrame(final_report[:-1])
+
 if __name__ == "__main__":
-    st.set_page_config(
-        page_title="MIS Support Bot",
-        page_icon="🤖",
-        layout="wide"
-    )
-    main()
+    if 'streamlit' in sys.modules:
+        # Started with `streamlit run mis_bot.py`
+        import streamlit as st
+        
+        st.set_page_config(
+            page_title="MIS Support Bot",
+            page_icon="🤖",
+            layout="wide"
+        )
+        main()
+    else:
+        # Started with `python mis_bot.py ...`
+        sys.exit(run_cli())
@@ -0,0 +1,80 @@
+"""
+The recurring issue cluster store: a run on an empty store gives the report of
+clustering from scratch, and only recurring clusters are kept between runs.
+"""
+import datetime
+import os
+import random
+import sqlite3
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mis_bot
+
+SUBJECTS = [
+    'Login error for user {number}', 'Payment failed ref TXN{number}', 'Report not generating for March',
+    'API timeout when syncing billing data', 'Access denied to module crm', 'Need data correction for ticket AB-{number}',
+    'Unable to upload file of size {number} MB', 'Sync failed between billing and crm'
+]
+
+def ticket_frame(rows, seed, first_id=1000):
+    rng = random.Random(seed)
+    today = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return pd.DataFrame({
+        'Ticket Id': range(first_id, first_id + rows),
+        'Subject': [rng.choice(SUBJECTS).format(number=rng.randint(1, 10 ** rng.randint(1, 8))) for _ in range(rows)],
+        'Status (Ticket)': [rng.choice(['Closed', 'Reopened', 'Assigned to Engineer!']) for _ in range(rows)],
+        'Created Time (Ticket)': [today - datetime.timedelta(days=rng.randint(0, 200)) for _ in range(rows)],
+        'Select Engineer': [rng.choice(['Engineer 1', 'Engineer 2', 'Engineer 3', None]) for _ in range(rows)],
+        'Program Name': [rng.choice(['Program 1', 'Program 2']) for _ in range(rows)],
+        'Number of Reopen': [rng.choice([0, 0, 1, 2]) for _ in range(rows)]
+    })
+
+def stored_tickets(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute('SELECT * FROM tickets ORDER BY ticket_id').fetchall()
+
+def small_clusters(path):
+    """Stored clusters with less than 2 stored tickets"""
+    with sqlite3.connect(path) as connection:
+        return connection.execute("""
+            SELECT COUNT(*) FROM clusters
+            WHERE cluster_id NOT IN (SELECT cluster_id FROM tickets GROUP BY cluster_id HAVING COUNT(*) >= 2)
+        """).fetchone()[0]
+
+def test_empty_store_and_rerun_match_clustering_from_scratch(tmp_path):
+    path = str(tmp_path / 'clusters.db')
+    df = ticket_frame(300, seed=1)
+    scratch = mis_bot.process_recurring_issues_mis(df.copy())
+    pd.testing.assert_frame_equal(mis_bot.process_recurring_issues_mis(df.copy(), path), scratch)
+    pd.testing.assert_frame_equal(mis_bot.process_recurring_issues_mis(df.copy(), path), scratch)
+
+def test_only_recurring_clusters_are_stored(tmp_path):
+    path = str(tmp_path / 'clusters.db')
+    mis_bot.process_recurring_issues_mis(ticket_frame(300, seed=2), path)
+    # Changed texts move tickets out of their clusters
+    changed = ticket_frame(300, seed=2)
+    changed.loc[::3, 'Subject'] = ticket_frame(100, seed=3)['Subject'].to_numpy()
+    mis_bot.process_recurring_issues_mis(pd.concat([changed, ticket_frame(50, seed=4, first_id=5000)]), path)
+    assert small_clusters(path) == 0
+
+def test_duplicate_ticket_id_is_stored_once_and_stays(tmp_path):
+    path = str(tmp_path / 'clusters.db')
+    df = ticket_frame(200, seed=5)
+    df.loc[10, 'Ticket Id'] = df.loc[20, 'Ticket Id']
+    df.loc[10, 'Subject'] = 'Login error for user 5'
+    df.loc[20, 'Subject'] = 'Payment failed ref TXN77'
+    mis_bot.process_recurring_issues_mis(df.copy(), path)
+    stored = stored_tickets(path)
+    mis_bot.process_recurring_issues_mis(df.copy(), path)
+    assert stored_tickets(path) == stored
+
+def test_reset_clusters_from_scratch(tmp_path):
+    path = str(tmp_path / 'clusters.db')
+    mis_bot.process_recurring_issues_mis(ticket_frame(300, seed=6), path)
+    mis_bot.reset_cluster_store(path)
+    df = ticket_frame(300, seed=7)
+    pd.testing.assert_frame_equal(mis_bot.process_recurring_issues_mis(df.copy(), path), mis_bot.process_recurring_issues_mis(df.copy()))
@@ -0,0 +1,115 @@
+"""
+Recurring issue clustering must give exactly the clusters of the plain greedy
+algorithm that compares every ticket with every other one; the candidate index
+only skips pairs that can't reach the similarity threshold.
+"""
+import os
+import random
+import sys
+from difflib import SequenceMatcher
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mis_bot
+
+VOCABULARY = ('error failed login user [reference] [number] payment report not working '
+              'unable to access the a b c server api sync timeout').split()
+
+def reference_similarity(a, b):
+    """Similarity as originally defined: 60% sequence ratio, 40% word Jaccard"""
+    seq_sim = SequenceMatcher(None, a, b).ratio()
+    words_a, words_b = set(a.split()), set(b.split())
+    if not words_a or not words_b:
+        return seq_sim
+    return seq_sim * 0.6 + len(words_a & words_b) / len(words_a | words_b) * 0.4
+
+def reference_clusters(df_clean):
+    """Clusters of 2+ tickets by comparing every unclustered pair, as (tickets, pattern)"""
+    df_sorted = df_clean.sort_values('text_length', ascending=False)
+    labels = df_sorted.index.tolist()
+    texts = df_sorted['normalized_text'].tolist()
+    clusters = []
+    processed = set()
+    for position, text in enumerate(texts):
+        if position in processed:
+            continue
+        group = [position]
+        processed.add(position)
+        threshold = 0.75 if len(text) < 50 else 0.65
+        for other, other_text in enumerate(texts):
+            if other not in processed and reference_similarity(text, other_text) >= threshold:
+                group.append(other)
+                processed.add(other)
+        if len(group) >= 2:
+            clusters.append(([labels[member] for member in group], text))
+    return clusters
+
+def clusters_from_columns(df_clean, clusters):
+    """(tickets, pattern) of clusters returned by create_advanced_clusters, tickets in rank order"""
+    members = df_clean[df_clean['cluster_id'] >= 0].sort_values('cluster_rank')
+    return [
+        (members.index[members['cluster_id'] == cluster_id].tolist(), cluster['pattern'])
+        for cluster_id, cluster in enumerate(clusters)
+    ]
+
+def random_text(rng):
+    words = rng.choice([0, 1, 2, 3, 5, 8, 12, 20, 40])
+    text = ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+    if rng.random() < 0.1:
+        text = (text + ' ') * 10
+    return text[:200].strip() if rng.random() < 0.9 else text[:200]
+
+def random_frame(seed, rows=100):
+    """Normalized texts with many near duplicates, exact copies and odd whitespace"""
+    rng = random.Random(seed)
+    common = [random_text(rng) for _ in range(30)]
+    texts = [rng.choice(common) if rng.random() < 0.5 else random_text(rng) for _ in range(rows)]
+    if seed % 3 == 0:
+        texts = [text.replace(' ', '\x1c') if rng.random() < 0.05 else text for text in texts]
+    df = pd.DataFrame({'normalized_text': texts, 'subcategory': '', 'Subject': texts})
+    df['text_length'] = df['normalized_text'].str.len()
+    return df
+
+def variant_frame(seed, rows=100):
+    """Texts over a large vocabulary with one or two words swapped or dropped, so similar pairs share only rare words"""
+    rng = random.Random(seed)
+    vocabulary = [f'w{number}' for number in range(300)]
+    sentences = [[rng.choice(vocabulary) for _ in range(rng.randint(2, 14))] for _ in range(25)]
+    texts = []
+    for _ in range(rows):
+        words = list(rng.choice(sentences))
+        for _ in range(rng.randint(0, 2)):
+            position = rng.randrange(len(words))
+            if rng.random() < 0.5 and len(words) > 1:
+                del words[position]
+            else:
+                words[position] = rng.choice(vocabulary)
+        texts.append(' '.join(words))
+    df = pd.DataFrame({'normalized_text': texts, 'subcategory': '', 'Subject': texts})
+    df['text_length'] = df['normalized_text'].str.len()
+    return df
+
+@pytest.mark.parametrize('make_frame', [random_frame, variant_frame])
+@pytest.mark.parametrize('seed', range(15))
+def test_clusters_match_brute_force(seed, make_frame):
+    df = make_frame(seed)
+    expected = reference_clusters(df)
+    clusters = mis_bot.create_advanced_clusters(df)
+    assert clusters_from_columns(df, clusters) == expected
+    assert [cluster['size'] for cluster in clusters] == [len(tickets) for tickets, _ in expected]
+
+def test_clusters_of_normalized_subjects_match_brute_force():
+    rng = random.Random(7)
+    subjects = [
+        f"{rng.choice(['Login error', 'Payment failed', 'Report not generating', 'Sync timeout'])} "
+        f"for {rng.choice(['user', 'ref', 'invoice'])} {rng.randint(1, 10 ** rng.randint(1, 9))}"
+        for _ in range(200)
+    ]
+    df = pd.DataFrame({'Subject': subjects, 'subcategory': ''})
+    df['normalized_text'] = mis_bot.normalize_texts(df['Subject'])
+    df['text_length'] = df['normalized_text'].str.len()
+    expected = reference_clusters(df)
+    assert clusters_from_columns(df, mis_bot.create_advanced_clusters(df)) == expected
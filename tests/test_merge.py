@@ -0,0 +1,73 @@
+"""
+Merging several exports (or ticket sheets) keeps one row per Ticket Id: the
+latest by modified time, else closed time, and the later chunk's on ties.
+"""
+import io
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mis_bot
+
+def chunk(rows):
+    return pd.DataFrame(rows, columns=['Ticket Id', 'Status (Ticket)', 'Modified Time (Ticket)', 'Ticket Closed Time'])
+
+def test_latest_row_per_ticket_is_kept_in_chunk_order():
+    first = chunk([
+        (1, 'Closed', '2026-03-05 10:00', None),    # newer than its copy in the second chunk
+        (2, 'Open', '2026-03-01 10:00', None),
+        (3, 'Open', '2026-03-01 10:00', None),      # tie: the later chunk wins
+        (4, 'Open', None, None),                    # unknown time loses to a known one
+        (None, 'Open', None, None)
+    ])
+    second = chunk([
+        (1, 'Open', '2026-03-01 10:00', None),
+        (2, 'Closed', '2026-03-02 10:00', None),
+        (3, 'Closed', '2026-03-01 10:00', None),
+        (4.0, 'Closed', None, '2026-02-01 09:00'),  # same ticket as 4; closed time is the fallback
+        (None, 'Closed', None, None),
+        (5, 'Open', '2026-03-03 10:00', None)
+    ])
+    merged = mis_bot.merge_ticket_frames([first, second])
+    # Rows without a Ticket Id are all kept
+    assert merged['Ticket Id'].fillna(-1).tolist() == [1, -1, 2, 3, 4, -1, 5]
+    assert merged['Status (Ticket)'].tolist() == ['Closed', 'Open', 'Closed', 'Closed', 'Closed', 'Closed', 'Open']
+
+def test_single_and_empty_chunks_are_returned_as_is():
+    only = chunk([(1, 'Open', None, None), (1, 'Closed', None, None)])
+    assert mis_bot.merge_ticket_frames([only, only.iloc[:0]]) is only
+
+def test_exports_without_ticket_id_are_concatenated():
+    first = pd.DataFrame({'Subject': ['a', 'b']})
+    second = pd.DataFrame({'Subject': ['a']})
+    assert mis_bot.merge_ticket_frames([first, second])['Subject'].tolist() == ['a', 'b', 'a']
+
+def test_load_merges_files_and_ticket_sheets():
+    older = chunk([(1, 'Open', '2026-03-01 10:00', None), (2, 'Open', '2026-03-01 10:00', None)])
+    newer = chunk([(2, 'Closed', '2026-03-04 10:00', None), (3, 'Open', '2026-03-04 10:00', None)])
+    workbook = io.BytesIO()
+    with pd.ExcelWriter(workbook, engine='openpyxl') as writer:
+        older.to_excel(writer, sheet_name='March', index=False)
+        newer.to_excel(writer, sheet_name='April', index=False)
+        pd.DataFrame({'Note': ['not tickets']}).to_excel(writer, sheet_name='Notes', index=False)
+        # A pivot sheet sharing a column with the tickets isn't a ticket sheet
+        pd.DataFrame({'Program Name': ['Program 1', 'Program 2'], 'Count': [2, 1]}).to_excel(writer, sheet_name='Pivot', index=False)
+    later = chunk([(3, 'Closed', '2026-03-05 10:00', None)]).to_csv(index=False).encode()
+
+    df = mis_bot.load_ticket_exports([(io.BytesIO(workbook.getvalue()), 'tickets.xlsx'), (io.BytesIO(later), 'later.csv')])
+    assert df['Ticket Id'].astype(int).tolist() == [1, 2, 3]
+    assert df['Status (Ticket)'].astype(str).tolist() == ['Open', 'Closed', 'Closed']
+
+def test_sheets_without_identity_columns_are_read_only_when_like_the_first():
+    tickets = pd.DataFrame({'Program Name': ['Program 1', 'Program 2'], 'Subject': ['a', 'b']})
+    workbook = io.BytesIO()
+    with pd.ExcelWriter(workbook, engine='openpyxl') as writer:
+        tickets.to_excel(writer, sheet_name='March', index=False)
+        tickets.iloc[:1].to_excel(writer, sheet_name='April', index=False)
+        pd.DataFrame({'Program Name': ['Program 1'], 'Count': [2]}).to_excel(writer, sheet_name='Pivot', index=False)
+
+    df = mis_bot.load_ticket_exports([(io.BytesIO(workbook.getvalue()), 'tickets.xlsx')])
+    assert df['Subject'].tolist() == ['a', 'b', 'a']
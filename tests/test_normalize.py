@@ -0,0 +1,74 @@
+"""
+Recurring issue text normalization must match the original per-ticket
+re.sub chain, both per text and once per distinct value of a column.
+"""
+import os
+import random
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mis_bot
+
+ERROR_PATTERNS = [
+    'error', 'failed', 'timeout', 'connection', 'unable', 'cannot',
+    'invalid', 'missing', 'not found', 'access denied', 'permission',
+    'server', 'database', 'network', 'api', 'sync', 'login', 'password'
+]
+
+TOKENS = [
+    'Login', 'ERROR', 'failed', 'not', 'found', 'Access', 'Denied', 'api', 'sync', 'version 2.1', 'Version3.10',
+    'AB-1001', 'xyz-42', 'TXN12345678', 'abcdefgh', 'a1b2c3d4e5', '9876543210', '123456789012', '1234', '99',
+    'user@example.com', 'A.B+c@mail.co.in', '01/02/2024', '1-2-24', '12/31/2023', '₹ 1500.00', '$99', '€ 5,5', '£7',
+    'café', 'ß', 'İstanbul', ' ', '\t', '\n', '  ', 'database', 'connection', 'timeout', 'password', '#', '-', '.'
+]
+
+def reference_normalize(text):
+    """Normalization as originally written, one re.sub after another"""
+    if pd.isna(text):
+        return ''
+    text = str(text).lower().strip()
+    text = re.sub(r'\b[a-z]{2,4}-\d+\b', '[ticket_id]', text)
+    text = re.sub(r'\b[a-z0-9]{8,20}\b', '[reference]', text)
+    text = re.sub(r'\b\d{10,12}\b', '[phone]', text)
+    text = re.sub(r'\b[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}\b', '[email]', text)
+    text = re.sub(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', '[date]', text)
+    text = re.sub(r'[₹$€£]\s*\d+[.,]?\d*', '[amount]', text)
+    text = re.sub(r'\b\d{4,}\b', '[number]', text)
+    text = re.sub(r'version\s*\d+\.\d+', 'version [x.x]', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    for pattern in ERROR_PATTERNS:
+        if pattern in text:
+            text = f"{pattern} {text}"
+            break
+    return text[:200]
+
+def random_texts(seed, count=500):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = [rng.choice(TOKENS) for _ in range(rng.randint(0, 60))]
+        texts.append(''.join(word + rng.choice([' ', '', ', ', '  ']) for word in words))
+    return texts
+
+@pytest.mark.parametrize('seed', range(5))
+def test_normalize_text_matches_reference(seed):
+    for text in random_texts(seed):
+        assert mis_bot.normalize_text(text) == reference_normalize(text)
+
+def test_normalize_text_of_missing_and_non_text_values():
+    for value in [None, np.nan, pd.NaT, 12345, 1.5, True, 'A' * 500]:
+        assert mis_bot.normalize_text(value) == reference_normalize(value)
+
+def test_normalize_texts_matches_per_value_normalization():
+    texts = random_texts(7, count=200)
+    values = pd.Series(texts * 3 + [None, np.nan, 1234], index=range(10, 10 + len(texts) * 3 + 3))
+    for column in (values, values.astype('category')):
+        normalized = mis_bot.normalize_texts(column)
+        assert normalized.index.equals(column.index)
+        assert normalized.tolist() == [reference_normalize(value) for value in column]
@@ -0,0 +1,49 @@
+"""
+The recurring issues monthly trend covers a configurable number of calendar
+months before the current one, and counts every clustered ticket created in them.
+"""
+import datetime
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mis_bot
+
+def month_start(months_ago):
+    return (pd.Timestamp(datetime.datetime.now()).to_period('M') - months_ago).to_timestamp()
+
+def recurring_tickets():
+    """Two tickets of the same issue in each of the 12 months before the current one"""
+    created = [month_start(months_ago) + pd.Timedelta(days=day) for months_ago in range(1, 13) for day in (1, 2)]
+    return pd.DataFrame({
+        'Ticket Id': range(len(created)),
+        'Subject': 'Login error for user',
+        'Status (Ticket)': 'Closed',
+        'Created Time (Ticket)': created,
+        'Select Engineer': 'Engineer 1',
+        'Program Name': 'Program 1'
+    })
+
+def trend_rows(report):
+    rows = report.fillna('').values.tolist()
+    start = [row[0] for row in rows].index('Month') + 1
+    end = next((position for position in range(start, len(rows)) if rows[position][0] == ''), len(rows))
+    return [row[:3] for row in rows[start:end]]
+
+def expected_rows(months):
+    return [[month_start(months_ago).strftime('%Y-%m'), 1, 2] for months_ago in range(months, 0, -1)]
+
+def test_default_window():
+    report = mis_bot.process_recurring_issues_mis(recurring_tickets())
+    assert trend_rows(report) == expected_rows(mis_bot.RECURRING_TREND_MONTHS)
+
+def test_longer_window_through_process_all_mis():
+    reports = mis_bot.process_all_mis(recurring_tickets(), ["Recurring Issues MIS"], trend_months=12)
+    assert trend_rows(reports["Recurring Issues MIS"]) == expected_rows(12)
+
+def test_shorter_window():
+    report = mis_bot.process_recurring_issues_mis(recurring_tickets(), trend_months=3)
+    assert trend_rows(report) == expected_rows(3)
@@ -0,0 +1,41 @@
+"""
+Open ticket lists are sorted oldest first by the created date column parsed
+with one inferred format, so day-first text dates keep their day-first order.
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mis_bot
+
+# 05/03 and 01/03 would come after 13/03 if read month-first
+CREATED = ['13/03/2026 10:00', '05/03/2026 10:00', '20/02/2026 10:00', '01/03/2026 10:00']
+OLDEST_FIRST = ['link 2', 'link 3', 'link 1', 'link 0']
+
+def open_tickets():
+    return pd.DataFrame({
+        'Ticket Id': range(len(CREATED)),
+        'Status (Ticket)': 'Assigned to Engineer!',
+        'Created Time (Ticket)': CREATED,
+        'Is Overdue': True,
+        'Gitlab Link': [f'link {number}' for number in range(len(CREATED))],
+        'Select Engineer': 'Engineer 1',
+        'Program Name': 'Program 1',
+        'Department Name': 'Department 1',
+        'Module Lead': 'Lead 1'
+    })
+
+def crossed_sla_links(report):
+    rows = report.fillna('').values.tolist()
+    start = [row[0] for row in rows].index('Gitlab Link') + 1
+    return [row[0] for row in rows[start:start + len(CREATED)]]
+
+def test_jagan_crossed_sla_list_keeps_day_first_order():
+    assert crossed_sla_links(mis_bot.process_jagan_mis(open_tickets())) == OLDEST_FIRST
+
+def test_prepared_frame_gives_the_same_order():
+    prepared = mis_bot.prepare_ticket_frame(open_tickets())
+    assert crossed_sla_links(mis_bot.process_jagan_mis(prepared)) == OLDEST_FIRST
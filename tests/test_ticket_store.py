@@ -0,0 +1,69 @@
+"""
+The Parquet ticket store gives back exactly the frame an export loads as,
+with only the requested columns and created months.
+"""
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mis_bot
+
+pytest.importorskip('pyarrow')
+
+def export_csv():
+    """A small export with text, categorical, numeric, boolean and date columns, blanks included"""
+    df = pd.DataFrame({
+        'Ticket Id': range(1, 9),
+        'Status (Ticket)': ['Closed', 'Reopened', 'Closed', None, 'Assigned to Engineer!', 'Closed', 'Closed', 'Reopened'],
+        'Created Time (Ticket)': ['2026-03-01 10:00', '2026-03-15 09:30', '2026-04-02 08:00', None,
+                                  '2026-04-20 17:45', '2026-05-01 00:00', '2026-05-31 23:59', 'garbage'],
+        'Program Name': ['Program 1', 'Program 2', None, 'Program 1', 'Program 3', 'Program 2', 'Program 1', 'Program 1'],
+        'Number of Reopen': [0, 2, None, 1, 0, 0, 3, 1],
+        'Is Overdue': [True, False, True, False, None, True, False, True],
+        'Subject': ['Login error', 'Payment failed', 'Login error', '', 'Report missing', None, 'Login error', 'Sync failed']
+    })
+    return df.to_csv(index=False).encode()
+
+def load_through_store(data, store, mis_types=None, months=None):
+    sources = [(io.BytesIO(data), 'export.csv')]
+    return mis_bot.load_stored_exports(sources, mis_bot.file_content_hash(data), store, mis_types, months)
+
+def test_round_trip_keeps_rows_order_and_dtypes(tmp_path):
+    data = export_csv()
+    direct = mis_bot.load_ticket_exports([(io.BytesIO(data), 'export.csv')])
+    pd.testing.assert_frame_equal(load_through_store(data, str(tmp_path)), direct)
+    assert os.path.isdir(mis_bot.ticket_store_path(str(tmp_path), mis_bot.file_content_hash(data)))
+    # Read back from Parquet this time
+    pd.testing.assert_frame_equal(load_through_store(data, str(tmp_path)), direct, check_exact=True)
+
+def test_read_back_only_requested_columns_and_months(tmp_path):
+    data = export_csv()
+    direct = mis_bot.load_ticket_exports([(io.BytesIO(data), 'export.csv')])
+    expected = mis_bot.select_created_months(direct, ['2026-03', '2026-05'])
+    assert len(expected) == 4
+    # Filtered in memory when parsed (every column is stored)
+    pd.testing.assert_frame_equal(load_through_store(data, str(tmp_path), ["Open Ticket MIS"], ['2026-03', '2026-05']), expected)
+    # Read back from the partitions of those months only, with the columns of the MIS type
+    df = load_through_store(data, str(tmp_path), ["Open Ticket MIS"], ['2026-03', '2026-05'])
+    assert set(df.columns) < set(direct.columns)
+    assert set(df.columns) <= set(mis_bot.ticket_columns(["Open Ticket MIS"]))
+    # Categories are those of the partitions read
+    pd.testing.assert_frame_equal(df, expected[list(df.columns)], check_dtype=False, check_categorical=False)
+
+def test_prune_removes_least_recently_used_exports(tmp_path):
+    store = str(tmp_path)
+    df = mis_bot.load_ticket_exports([(io.BytesIO(export_csv()), 'export.csv')])
+    paths = [mis_bot.ticket_store_path(store, f'export {number}') for number in range(3)]
+    for age, path in zip([30, 20, 10], paths):
+        assert mis_bot.write_ticket_store(df, path)
+        os.utime(path, (time.time() - age, time.time() - age))
+    size = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(paths[0]) for name in names)
+
+    mis_bot.prune_ticket_store(store, keep=paths[0], max_bytes=int(size * 2.5))
+    assert [os.path.isdir(path) for path in paths] == [True, False, True]